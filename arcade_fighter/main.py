@@ -1,14 +1,17 @@
 import arcade
 import src.constants as C
-from src.views.start_view import StartView
-# GameView and GameOverView are imported by StartView/GameView as needed
+from src.views.app_context import get_app_context
+from src.metrics import start_exporter
+# The app context builds each view on first use and keeps it
 
 def main():
     """ Main function """
-    window = arcade.Window(C.SCREEN_WIDTH, C.SCREEN_HEIGHT, C.SCREEN_TITLE)
-    start_view = StartView()
-    window.show_view(start_view)
+    window = arcade.Window(C.WINDOW_WIDTH, C.WINDOW_HEIGHT, C.SCREEN_TITLE, resizable=True)
+    exporter = start_exporter()
+    get_app_context(window).show_menu()
     arcade.run()
+    if exporter:
+        exporter.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""
+Resident asset accounting under a memory budget.
+
+Every texture or sound that stays decoded registers here with its CPU bytes
+(decoded RGBA or PCM) and GPU bytes (its copy in the texture atlas). The
+registry is the one place that knows what is resident. It drives the
+texture/audio byte gauges and keeps the total under C.ASSET_BUDGET_BYTES by
+evicting least recently used assets.
+
+Only assets that the current view hasn't touched can be evicted. A view calls
+enter_view() when shown, and everything it loads or touches from then on is
+safe until the next view. Anything else goes in LRU order, and its owner's
+release callback drops its references (Roster.unload for characters). Assets
+owned by the registry itself, from texture() and sound(), are simply
+forgotten and decoded again on the next request. Pinned assets (preloaded
+sound effects, playing music) are counted but never evicted.
+
+A debug report of the biggest consumers is available from report(). F8 prints
+it in the menu and in a match.
+"""
+from collections import OrderedDict
+from typing import Callable, List, Optional
+import arcade
+from . import constants as C
+from . import metrics
+
+KIND_TEXTURE = "texture"
+KIND_AUDIO = "audio"
+
+_MB = 1024 * 1024
+
+
+def texture_bytes(texture: arcade.Texture) -> int:
+    """Decoded RGBA size of a texture's image"""
+    return texture.width * texture.height * 4
+
+
+def sound_bytes(sound: arcade.Sound) -> int:
+    """Approximate decoded PCM size of a sound"""
+    fmt = sound.source.audio_format
+    if fmt is None:
+        return 0
+    return int(sound.get_length() * fmt.sample_rate * fmt.channels * fmt.sample_size // 8)
+
+
+class Asset:
+    """One resident asset and its cost"""
+    __slots__ = ("key", "kind", "cpu_bytes", "gpu_bytes", "release", "pinned", "last_used", "value")
+
+    def __init__(self, key: str, kind: str, cpu_bytes: int, gpu_bytes: int,
+                 release: Optional[Callable[[], None]], pinned: bool, value=None):
+        self.key = key
+        self.kind = kind
+        self.cpu_bytes = cpu_bytes
+        self.gpu_bytes = gpu_bytes
+        self.release = release
+        self.pinned = pinned
+        self.last_used = 0
+        self.value = value  # the texture/sound itself when the registry owns it
+
+    @property
+    def total_bytes(self) -> int:
+        return self.cpu_bytes + self.gpu_bytes
+
+
+class AssetRegistry:
+    """Byte accounting and LRU eviction for decoded assets"""
+
+    def __init__(self, budget: int = C.ASSET_BUDGET_BYTES):
+        self.budget = budget
+        self.assets: "OrderedDict[str, Asset]" = OrderedDict()  # least recently used first
+        self.view: Optional[str] = None
+        self.cpu_bytes = 0
+        self.gpu_bytes = 0
+        self.evictions = 0
+        self.over_budget = 0  # enforce() calls that couldn't get under the budget
+        self._uses = 0
+        self._view_started = 0  # assets last used at or before this belong to older views
+
+    @property
+    def total_bytes(self) -> int:
+        return self.cpu_bytes + self.gpu_bytes
+
+    # --- Owned elsewhere ---
+
+    def track(self, key: str, kind: str, cpu_bytes: int, gpu_bytes: int = 0,
+              release: Optional[Callable[[], None]] = None, pinned: bool = False):
+        """Register an asset, or update its size; release() is called if it is evicted"""
+        self._add(Asset(key, kind, cpu_bytes, gpu_bytes, release, pinned))
+        self.enforce()
+
+    def touch(self, key: str):
+        """Mark an asset as used now (by the current view)"""
+        asset = self.assets.get(key)
+        if asset is not None:
+            self._uses += 1
+            asset.last_used = self._uses
+            self.assets.move_to_end(key)
+
+    def forget(self, key: str) -> Optional[Asset]:
+        """The owner dropped an asset; stop counting it"""
+        asset = self.assets.pop(key, None)
+        if asset is not None:
+            self._count(asset, -1)
+        return asset
+
+    # --- Owned here ---
+
+    def texture(self, path: str) -> arcade.Texture:
+        """A decoded image, loaded on first use and kept until evicted"""
+        key = "texture:" + path
+        asset = self.assets.get(key)
+        if asset is not None:
+            metrics.ASSET_CACHE_HITS.inc()
+            self.touch(key)
+            return asset.value
+        metrics.ASSET_CACHE_MISSES.inc()
+        texture = arcade.load_texture(path)
+        size = texture_bytes(texture)
+        self._add(Asset(key, KIND_TEXTURE, size, size, None, False, texture))
+        self.enforce()
+        return texture
+
+    def sound(self, path: str) -> arcade.Sound:
+        """A fully decoded sound, loaded on first use and kept until evicted"""
+        key = "sound:" + path
+        asset = self.assets.get(key)
+        if asset is not None:
+            metrics.ASSET_CACHE_HITS.inc()
+            self.touch(key)
+            return asset.value
+        metrics.ASSET_CACHE_MISSES.inc()
+        sound = arcade.load_sound(path, streaming=False)
+        self._add(Asset(key, KIND_AUDIO, sound_bytes(sound), 0, None, False, sound))
+        self.enforce()
+        return sound
+
+    # --- Views and eviction ---
+
+    def enter_view(self, name: str, keys=()):
+        """A view was shown: assets it loads or touches from now on are kept.
+        keys are assets it already holds (touched straight away)."""
+        self.view = name
+        self._view_started = self._uses
+        for key in keys:
+            self.touch(key)
+        self.enforce()
+
+    def enforce(self):
+        """Evict least recently used assets of earlier views until under budget"""
+        if self.total_bytes <= self.budget:
+            return
+        for asset in list(self.assets.values()):
+            if asset.pinned or asset.last_used > self._view_started:
+                continue
+            self.evict(asset.key)
+            if self.total_bytes <= self.budget:
+                return
+        self.over_budget += 1
+
+    def evict(self, key: str):
+        asset = self.forget(key)
+        if asset is None:
+            return
+        self.evictions += 1
+        metrics.ASSET_EVICTIONS.inc()
+        if asset.release is not None:
+            asset.release()
+
+    # --- Reporting ---
+
+    def top(self, count: int = 10) -> List[Asset]:
+        """Biggest consumers first"""
+        return sorted(self.assets.values(), key=lambda a: a.total_bytes, reverse=True)[:count]
+
+    def describe(self) -> str:
+        """One-line summary for the debug HUD"""
+        return (f"Assets {self.total_bytes / _MB:.0f}/{self.budget / _MB:.0f} MB "
+                f"(CPU {self.cpu_bytes / _MB:.0f}, GPU {self.gpu_bytes / _MB:.0f}), "
+                f"{len(self.assets)} resident, {self.evictions} evicted")
+
+    def report(self, count: int = 10) -> str:
+        """Summary plus the top consumers, one per line"""
+        lines = [self.describe() + (f", over budget {self.over_budget}x" if self.over_budget else "")]
+        for asset in self.top(count):
+            if asset.pinned:
+                status = "pinned"
+            elif asset.last_used > self._view_started:
+                status = f"in use ({self.view})"
+            else:
+                status = "evictable"
+            lines.append(f"{asset.total_bytes / _MB:8.1f} MB  {asset.cpu_bytes / _MB:6.1f} CPU "
+                         f"{asset.gpu_bytes / _MB:6.1f} GPU  {asset.kind:<7}  {status:<16} {asset.key}")
+        return "\n".join(lines)
+
+    # --- Internals ---
+
+    def _add(self, asset: Asset):
+        old = self.assets.pop(asset.key, None)
+        if old is not None:
+            self._count(old, -1)
+            if asset.value is None:
+                asset.value = old.value
+        self.assets[asset.key] = asset
+        self._count(asset, 1)
+        self.touch(asset.key)
+
+    def _count(self, asset: Asset, sign: int):
+        self.cpu_bytes += sign * asset.cpu_bytes
+        self.gpu_bytes += sign * asset.gpu_bytes
+        gauge = metrics.TEXTURE_BYTES if asset.kind == KIND_TEXTURE else metrics.AUDIO_BYTES
+        gauge.inc(sign * asset.cpu_bytes)
+        metrics.GPU_BYTES.inc(sign * asset.gpu_bytes)
+
+
+_registry: Optional[AssetRegistry] = None
+
+
+def get_asset_registry() -> AssetRegistry:
+    """Shared registry, created on first use"""
+    global _registry
+    if _registry is None:
+        _registry = AssetRegistry()
+    return _registry
@@ -1,5 +1,6 @@
 import arcade
 from arcade import hitbox
+from operator import attrgetter
 from typing import Tuple
 
 def load_texture_pair(file_path: str) -> Tuple[arcade.Texture, arcade.Texture]:
@@ -11,50 +12,125 @@ def load_texture_pair(file_path: str) -> Tuple[arcade.Texture, arcade.Texture]:
     flipped_texture = texture.flip_horizontally()
     return texture, flipped_texture
 from . import constants as C
+from . import event_log
+from .event_log import EV_ATTACK, EV_CREATED, EV_DAMAGE, EV_DEATH, EV_JUMP, EV_SPECIAL
+from .fighter_state import FighterState, CAN_MOVE, STATE_ANIMATIONS
+from .roster import CharacterAssets, Roster, get_roster
+from .sweep import SweptBox
 
 # Import states from constants
-from .constants import (
-    RIGHT_FACING,
-    LEFT_FACING,
-    STATE_IDLE,
-    STATE_WALKING,
-    STATE_JUMPING,
-    STATE_ATTACKING,
-    STATE_HIT,
-    STATE_DEAD
-)
+from .constants import STATE_ATTACKING
 
-STATE_FALLING = "falling" # New state not in constants
+
+def _fighter_field(name: str) -> property:
+    """Expose a FighterState slot as a Character attribute"""
+    getter = attrgetter(f"fighter.{name}")
+
+    def setter(self, value):
+        setattr(self.fighter, name, value)
+
+    return property(getter, setter)
 
 
 class Character(arcade.Sprite):
     """ Base Character class for players """
+    # Gameplay state lives in self.fighter; these keep the sprite-level names working
+    hp = _fighter_field("hp")
+    max_hp = _fighter_field("max_hp")
+    state = _fighter_field("state")
+    facing_direction = _fighter_field("facing")
+    state_timer = _fighter_field("state_timer")
+    attack_cooldown = _fighter_field("attack_cooldown")
+    special_cooldown = _fighter_field("special_cooldown")
+    attack_duration = _fighter_field("attack_duration")
+    attack_index = _fighter_field("attack_index")
+    has_hit = _fighter_field("has_hit")
+    is_on_ground = _fighter_field("is_on_ground")
+
     def reload_textures(self):
         """Reload all character textures"""
-        # Cache textures if not already loaded
-        if not hasattr(self, '_textures_loaded'):
-            base_path = "arcade_fighter/assets/CHAR-ANIM/PLAYERS/EVil Wizard 2/Sprites/"
-            
-            # Load all textures
-            self.idle_texture_pair = load_texture_pair(f"{base_path}Idle.png")
-            self.walk_textures = [load_texture_pair(f"{base_path}Run.png")]
-            self.jump_texture_pair = load_texture_pair(f"{base_path}Jump.png")
-            self.fall_texture_pair = load_texture_pair(f"{base_path}Fall.png")
-            self.attack_textures = [
-                load_texture_pair(f"{base_path}Attack1.png"),
-                load_texture_pair(f"{base_path}Attack2.png")
-            ]
-            self.hit_texture_pair = load_texture_pair(f"{base_path}Take hit.png")
-            self.death_texture_pair = load_texture_pair(f"{base_path}Death.png")
-            
-            self._textures_loaded = True
-        
+        self.assets = self.roster.reload(self.character_id)
+        self.apply_assets(self.assets)
+
+    def apply_assets(self, assets: CharacterAssets):
+        """Bind decoded animation frames and frame data from a character manifest"""
+        self.assets = assets
+        self._bind_frame_data()
+
         # Reset current texture
-        self.texture = self.idle_texture_pair[self.facing_direction]
-        
-    def __init__(self, player_num: int, scale: float = None):
+        self.anim_name = "idle"
+        self.anim_time = 0.0
+        self._frame_key = None
+        self.set_frame("idle", 0)
+
+    def set_character(self, character_id: str):
+        """Become another roster character in place (decoded only if not cached)"""
+        assets = self.roster.load(character_id)  # a cache hit also marks it in use
+        if assets is self.assets:
+            return
+        self.character_id = character_id
+        self.scale = self.base_scale * assets.manifest.scale
+        self.apply_assets(assets)
+
+    def refresh_assets(self):
+        """
+        Pick up a hot reload of this character's assets mid-match: rebind the
+        frame data and re-show the current frame, keeping the animation position.
+        """
+        self._bind_frame_data()
+        anim_name = self.anim_name if self.anim_name in self.animations else "idle"
+        frame = self._frame_key[1] if self._frame_key else 0
+        if self.fighter.attack_index >= len(self.attack_animations):
+            self.fighter.attack_index = 0
+        self.anim_name = anim_name
+        self._frame_key = None
+        self.set_frame(anim_name, min(frame, len(self.animations[anim_name]) - 1))
+
+    def _bind_frame_data(self):
+        manifest = self.assets.manifest
+        self.animations = self.assets.animations
+        self.hitboxes = self.assets.hitboxes
+        self.attack_animations = manifest.attacks or ["idle"]
+        self.fighter.attack_count = len(self.attack_animations)
+        self.attack_damage = manifest.attack_damage
+        # Attack hitbox definition (width, height, offset_x, offset_y)
+        self.attack_hitbox = dict(manifest.attack_hitbox)
+        # Body box for fighter-fighter and wall collisions (unscaled width, height)
+        self.body = dict(manifest.body)
+
+    @property
+    def feet(self) -> float:
+        """ World y of the current hurtbox's bottom, the edge physics rests on the floor """
+        return self.center_y + self.frame_aabb[1] * self.scale_y
+
+    def body_sweep(self, start_x: float, start_feet: float) -> SweptBox:
+        """ Body box swept from a start (center_x, feet) to where the sprite is now """
+        return SweptBox(start_x, start_feet, self.center_x, self.feet,
+                        self.body["width"] * self.scale_x / 2, self.body["height"] * self.scale_y)
+
+    def set_frame(self, anim_name: str, frame: int):
+        """
+        Show an animation frame and swap in its precomputed hurtbox.
+        Only does work when the frame or facing actually changes.
+        """
+        facing = self.fighter.facing
+        key = (anim_name, frame, facing)
+        if key == self._frame_key:
+            return
+        self._frame_key = key
+        self.texture = self.animations[anim_name][frame][facing]
+        points, aabb = self.hitboxes[anim_name][frame]
+        # Local (unscaled) hurtbox AABB: left, bottom, right, top
+        self.frame_aabb = aabb[facing]
+        self.hit_box = hitbox.RotatableHitBox(
+            points[facing], position=self.position, angle=self.angle, scale=self.scale
+        )
+
+    def __init__(self, player_num: int, scale: float = None,
+                 character_id: str = None, roster: Roster = None):
         """Initialize character with optional scale.
-        If scale is None, will calculate based on resolution."""
+        If scale is None, will calculate based on resolution.
+        The character's frames come from its roster manifest (default: C.DEFAULT_CHARACTER)."""
         if scale is None:
             # Base scale on resolution - smaller screens get larger characters
             if C.SCREEN_WIDTH <= 800:  # SD
@@ -63,179 +139,105 @@ class Character(arcade.Sprite):
                 scale = 1.0
             else:  # FHD+
                 scale = 0.8
-        super().__init__(scale=scale)
+        self.roster = roster or get_roster()
+        self.character_id = character_id or C.DEFAULT_CHARACTER
+        self.base_scale = scale
+        assets = self.roster.load(self.character_id)
+        super().__init__(scale=scale * assets.manifest.scale)
 
         # --- Player Identity ---
         self.player_num = player_num
 
-        # --- Health ---
-        self.max_hp = C.PLAYER_START_HP
-        self.hp = C.PLAYER_START_HP
-
-        # --- State and Animation ---
-        self.state = STATE_IDLE
-        self.facing_direction = RIGHT_FACING
-        
-        # Load Evil Wizard 2 textures
-        base_path = "arcade_fighter/assets/CHAR-ANIM/PLAYERS/EVil Wizard 2/Sprites/"
-        
-        # Idle animation
-        self.idle_texture_pair = load_texture_pair(f"{base_path}Idle.png")
-        
-        # Walk animation
-        self.walk_textures = []
-        self.walk_textures.append(load_texture_pair(f"{base_path}Run.png"))
-        
-        # Jump animation
-        self.jump_texture_pair = load_texture_pair(f"{base_path}Jump.png")
-        
-        # Fall animation
-        self.fall_texture_pair = load_texture_pair(f"{base_path}Fall.png")
-        
-        # Attack animations
-        self.attack_textures = []
-        self.attack_textures.append(load_texture_pair(f"{base_path}Attack1.png"))
-        self.attack_textures.append(load_texture_pair(f"{base_path}Attack2.png"))
-        
-        # Hit animation
-        self.hit_texture_pair = load_texture_pair(f"{base_path}Take hit.png")
-        
-        # Death animation
-        self.death_texture_pair = load_texture_pair(f"{base_path}Death.png")
-        
-        # Set initial texture
-        self.texture = self.idle_texture_pair[self.facing_direction]
-        
-        # Set hit box (adjust as needed)
-        self.hit_box = hitbox.HitBox(self.texture.hit_box_points)
+        # --- Gameplay State (health, state machine, timers) ---
+        self.fighter = FighterState(player_num, len(assets.manifest.attacks))
+
+        # Load shared animation frames and per-frame hurtboxes from the roster
+        self.apply_assets(assets)
 
         # --- Physics / Movement ---
-        # self.change_x and self.change_y are inherited from Sprite
-        self.is_on_ground = False # Will be updated by physics engine checks
-
-        # --- Combat ---
-        self.has_hit = False # Tracks if attack has already hit
-        self.attack_cooldown = 0.0
-        self.attack_duration = 0.5 # How long attack state lasts
-        self.attack_damage = 10
-        # Attack hitbox definition (width, height, offset_x, offset_y)
-        self.attack_hitbox = {
-            'width': 60,
-            'height': 100,
-            'offset_x': 40,
-            'offset_y': 0
-        }
+        # self.change_x and self.change_y are inherited from Sprite;
+        # fighter.is_on_ground is updated by physics engine checks
 
-        # --- Timers ---
-        self.state_timer = 0.0 # Generic timer for states like 'hit' or 'attacking'
+        event_log.emit(EV_CREATED, player_num)
 
-        if C.DEBUG_MODE:
-            print(f"Character {player_num} created.")
+    @property
+    def current_frame(self) -> int:
+        """Index of the animation frame being shown"""
+        return self._frame_key[1]
+
+    def current_mask(self):
+        """Packed alpha mask of the frame being shown, at the sprite's scale"""
+        masks = self.assets.pixel_masks(self.scale_x)
+        anim_name, frame, facing = self._frame_key
+        return masks[anim_name][frame][facing]
 
     def update_animation(self, delta_time: float = 1/60):
         """
         Logic for selecting the proper texture to use.
         Also flips textures based on facing direction.
         """
-        # Flip texture if direction changed
-        if self.change_x < 0 and self.facing_direction == RIGHT_FACING:
-            self.facing_direction = LEFT_FACING
-        elif self.change_x > 0 and self.facing_direction == LEFT_FACING:
-            self.facing_direction = RIGHT_FACING
-
-        # Update texture based on state
-        if self.state == STATE_IDLE:
-            self.texture = self.idle_texture_pair[self.facing_direction]
-        elif self.state == STATE_WALKING:
-            self.texture = self.walk_textures[0][self.facing_direction]
-        elif self.state == STATE_JUMPING:
-            self.texture = self.jump_texture_pair[self.facing_direction]
-        elif self.state == STATE_FALLING:
-            self.texture = self.fall_texture_pair[self.facing_direction]
-        elif self.state == STATE_ATTACKING:
-            # Cycle through attack textures
-            attack_frame = int(self.state_timer / self.attack_duration * len(self.attack_textures))
-            attack_frame = min(attack_frame, len(self.attack_textures) - 1)
-            self.texture = self.attack_textures[attack_frame][self.facing_direction]
-        elif self.state == STATE_HIT:
-            self.texture = self.hit_texture_pair[self.facing_direction]
-        elif self.state == STATE_DEAD:
-            self.texture = self.death_texture_pair[self.facing_direction]
+        fighter = self.fighter
+        fighter.face(self.change_x)
+
+        # Pick the animation for the current state
+        anim_name = STATE_ANIMATIONS[fighter.state]
+        if anim_name is None:
+            anim_name = self.attack_animations[fighter.attack_index]
+
+        if anim_name != self.anim_name:
+            self.anim_name = anim_name
+            self.anim_time = 0.0
+        else:
+            self.anim_time += delta_time
+
+        frames = self.animations[anim_name]
+        if fighter.state == STATE_ATTACKING:
+            # Spread the attack animation across the attack duration
+            progress = 1 - fighter.state_timer / fighter.attack_duration
+            frame = int(progress * len(frames))
+        else:
+            spec = self.assets.manifest.animations[anim_name]
+            frame = int(self.anim_time * spec["fps"])
+            if spec["loop"]:
+                frame %= len(frames)
+        frame = max(0, min(frame, len(frames) - 1))
+        self.set_frame(anim_name, frame)
 
     def on_update(self, delta_time: float = 1/60):
-        """ Called by the arcade engine to update sprite state """
-
-        # Update timers
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= delta_time
-        if self.state_timer > 0:
-            self.state_timer -= delta_time
-            if self.state_timer <= 0:
-                # Reset state if timer runs out (e.g., after being hit or attacking)
-                if self.state == STATE_HIT or self.state == STATE_ATTACKING:
-                    self.state = STATE_IDLE # Or STATE_FALLING if in air
-
-        # State transition logic
-        if not self.is_on_ground and self.state not in (STATE_JUMPING, STATE_FALLING, STATE_ATTACKING, STATE_HIT, STATE_DEAD):
-            self.state = STATE_FALLING
-        elif self.is_on_ground and self.state == STATE_FALLING and self.change_y == 0:
-            self.state = STATE_IDLE
-
-        # Check if dead
-        if self.hp <= 0 and self.state != STATE_DEAD:
-            self.state = STATE_DEAD
+        """ Advance the fighter state machine by one tick """
+        if self.fighter.tick(delta_time, self.change_x, self.change_y):
             self.change_x = 0
             # Maybe change texture to a "defeated" pose
-            if C.DEBUG_MODE:
-                print(f"Player {self.player_num} is DEAD")
+            event_log.emit(EV_DEATH, self.player_num)
 
     def move(self, direction: int):
         """ Set horizontal movement speed based on direction (-1 left, 1 right) """
-        if self.state != STATE_HIT and self.state != STATE_DEAD: # Can't move when hit or dead
+        if CAN_MOVE[self.fighter.state]: # Can't move when hit or dead
             self.change_x = C.PLAYER_MOVEMENT_SPEED * direction
-            # TODO: Set state to WALKING if on ground?
 
     def stop_moving(self):
         """ Stop horizontal movement """
         self.change_x = 0
-        # TODO: Set state to IDLE if on ground?
 
     def jump(self):
         """ Initiate a jump if on the ground """
-        # TODO: Check if on ground using physics engine info
-        # if self.physics_engine.can_jump(): # Requires passing engine or checking flag
-        if self.is_on_ground and self.state != STATE_HIT and self.state != STATE_DEAD:
-             self.change_y = C.PLAYER_JUMP_SPEED
-             self.state = STATE_JUMPING
-             self.is_on_ground = False # Assume we left the ground
-             if C.DEBUG_MODE:
-                 print(f"Player {self.player_num} JUMP!")
+        if self.fighter.start_jump():
+            self.change_y = C.PLAYER_JUMP_SPEED
+            event_log.emit(EV_JUMP, self.player_num)
 
     def attack(self):
         """ Initiate an attack """
-        if self.attack_cooldown <= 0 and self.state not in [STATE_ATTACKING, STATE_HIT, STATE_DEAD]:
-            if C.DEBUG_MODE:
-                print(f"Player {self.player_num} ATTACK!")
-            self.has_hit = False # Reset hit flag for new attack
-            self.state = STATE_ATTACKING
-            self.attack_cooldown = 1.0 # Example: 1 second cooldown
-            self.state_timer = self.attack_duration # Attack state lasts for this duration
-            # Stop horizontal movement during attack? Optional.
-            # self.change_x = 0
-            # TODO: Create/position the attack hitbox in GameView's update
+        if self.fighter.start_attack():
+            event_log.emit(EV_ATTACK, self.player_num, self.fighter.attack_index)
+
+    def special(self) -> bool:
+        """ Start a special move. Returns True if a projectile volley should be fired """
+        if self.fighter.start_special():
+            event_log.emit(EV_SPECIAL, self.player_num)
+            return True
+        return False
 
     def take_damage(self, amount: int):
         """ Take damage, update health, and change state """
-        if self.state != STATE_DEAD: # Can't take damage if already dead
-            self.hp -= amount
-            if C.DEBUG_MODE:
-                print(f"Player {self.player_num} takes {amount} damage. HP: {self.hp}/{self.max_hp}")
-            if self.hp <= 0:
-                self.hp = 0
-                self.state = STATE_DEAD
-                # Potentially trigger death animation/sound
-            else:
-                self.state = STATE_HIT
-                self.state_timer = 0.3 # Example: Stunned/hit for 0.3 seconds
-                # Optional: Add knockback effect
-                # self.change_x = -self.facing_direction * 5 # Knockback example
\ No newline at end of file
+        if self.fighter.apply_damage(amount):
+            event_log.emit(EV_DAMAGE, self.player_num, amount, self.fighter.hp)
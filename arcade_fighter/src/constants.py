@@ -4,7 +4,7 @@ import os
 # Screen Constants
 SCREEN_TITLE = "Arcade Fighter"
 
-# Resolution Options
+# Resolution Options (window sizes; the SD/HD/FHD menu buttons pick one)
 RESOLUTIONS = {
     "SD": (800, 600),
     "HD": (1280, 720),
@@ -13,16 +13,21 @@ RESOLUTIONS = {
 
 # Current resolution tracking
 _CURRENT_RESOLUTION = "HD"  # Default to HD
-SCREEN_WIDTH, SCREEN_HEIGHT = RESOLUTIONS[_CURRENT_RESOLUTION]
+WINDOW_WIDTH, WINDOW_HEIGHT = RESOLUTIONS[_CURRENT_RESOLUTION]
+
+# Virtual canvas every view lays out and draws in (ARCADE_PROFILE=SD|HD|FHD).
+# Fixed for the run: windows of any size get it upscaled in one pass
+RESOLUTION_PROFILE = os.getenv('ARCADE_PROFILE', 'HD').upper()
+SCREEN_WIDTH, SCREEN_HEIGHT = RESOLUTIONS.get(RESOLUTION_PROFILE, RESOLUTIONS["HD"])
+RENDER_SCALE_MIN = 0.25  # lowest internal render resolution, relative to the canvas
+LETTERBOX_COLOR = (0, 0, 0)
 
 def set_resolution(res_key: str):
-    """Set the current resolution and update constants"""
-    global SCREEN_WIDTH, SCREEN_HEIGHT, _CURRENT_RESOLUTION
+    """Set the window resolution; the virtual canvas (SCREEN_*) stays as it is"""
+    global WINDOW_WIDTH, WINDOW_HEIGHT, _CURRENT_RESOLUTION
     if res_key in RESOLUTIONS:
         _CURRENT_RESOLUTION = res_key
-        SCREEN_WIDTH, SCREEN_HEIGHT = RESOLUTIONS[res_key]
-        # Update dependent constants
-        HEALTHBAR_PLAYER2_X = SCREEN_WIDTH - 50 - HEALTHBAR_WIDTH
+        WINDOW_WIDTH, WINDOW_HEIGHT = RESOLUTIONS[res_key]
 
 # Menu States
 MENU_MAIN = "main"
@@ -30,6 +35,7 @@ MENU_OPTIONS = "options"
 MENU_VIDEO = "video"
 MENU_AUDIO = "audio"
 MENU_MUSIC = "music"
+MENU_MODE_SELECT = "mode_select"
 
 # Audio Constants
 DEFAULT_VOLUME = 0.5
@@ -42,11 +48,46 @@ MUSIC_FILES = [
     "arcade_fighter/assets/MUSIC/22 - DavidKBD - Purgatory Pack - MiniLoop 14.ogg"
 ]
 
+MUSIC_PLAYLISTS = {
+    "menu": MUSIC_FILES[:3],
+    "fight": MUSIC_FILES[3:],
+}
+MUSIC_CROSSFADE = 2.0  # seconds both tracks overlap at a change
+MUSIC_UPDATE_INTERVAL = 1 / 30  # seconds between director updates (fade steps)
+
 BACKGROUND_IMAGES = [
     "arcade_fighter/assets/images/STATIC/khaaaarl_black_grey_white_noise_textur_--v_5.2_abf518d5-1518-4fec-937f-dc4a1811b272_0.png",
     "arcade_fighter/assets/images/STATIC/khaaaarl_giant_bat_spread_wings_screaming_sonic_wawwes_by_jun_b5f9261a-da76-43a2-b967-78bbf0a0dd63_1.png",
     "arcade_fighter/assets/images/STATIC/khaaaarl_giant_bat_spread_wings_screaming_sonic_wawwes_by_jun_33df75ef-efbc-4a90-8a6f-8a656c8f9431_3.png"
 ]
+OCCULT_SYMBOL_IMAGE = "arcade_fighter/assets/images/STATIC/OCCULT/image-from-rawpixel-id-6332972-png.png"
+
+# Parallax stage layers, back to front: (file, drift in px/s, priority).
+# Lower quality levels keep only the layers with the lowest priority numbers
+PARALLAX_DIR = "arcade_fighter/assets/LEVELS/Glacial-mountains/Layers/"
+PARALLAX_LAYERS = (
+    ("sky.png", 0, 0),
+    ("clouds_bg.png", 4, 2),
+    ("glacial_mountains.png", 0, 1),
+    ("clouds_mg_3.png", 8, 4),
+    ("clouds_mg_2.png", 12, 5),
+    ("clouds_mg_1.png", 18, 3),
+    ("cloud_lonely.png", 24, 6),
+)
+
+# Sound Effects (decoded at match start, played through a fixed voice pool)
+SFX_VOLUME = 0.6
+SFX_VOICES = 12
+SFX_SOUNDS = {
+    # name: (file, max simultaneous voices, ducks music)
+    "hit": (":resources:sounds/hit3.wav", 4, False),
+    "jump": (":resources:sounds/jump1.wav", 2, False),
+    "land": (":resources:sounds/rockHit2.wav", 2, False),
+    "special": (":resources:sounds/laser2.wav", 3, False),
+    "ko": (":resources:sounds/explosion2.wav", 1, True),
+}
+SFX_DUCK_GAIN = 0.35  # music volume multiplier while a ducking effect plays
+SFX_DUCK_RELEASE = 0.4  # seconds for the music to come back to full volume
 
 # Fullscreen state
 FULLSCREEN = False
@@ -55,11 +96,14 @@ FULLSCREEN = False
 BUTTON_WIDTH = 200
 BUTTON_HEIGHT = 50
 BUTTON_SPACING = 20
+MENU_HIT_CELL = 32  # menu hit-test grid cell size (pixels)
 HEALTHBAR_WIDTH = 200
 HEALTHBAR_HEIGHT = 20
 HEALTHBAR_OFFSET_Y = 30
 HEALTHBAR_PLAYER1_X = 50
 HEALTHBAR_PLAYER2_X = SCREEN_WIDTH - 50 - HEALTHBAR_WIDTH
+HEALTH_COLOR = (136, 8, 8)  # blood red
+HEALTH_BACKGROUND_COLOR = (30, 30, 30)  # ash gray
 UI_FONT_SIZE = 18
 
 # UI Colors
@@ -73,6 +117,7 @@ RUST = (180, 65, 21)
 BUTTON_BORDER = 3
 FLICKER_INTERVAL = 2.0  # seconds
 OCCULT_SYMBOL_SCALE = 0.15
+MENU_VIGNETTE_ALPHA = 30  # darkening drawn over the menu while the symbol shows
 
 # Font Settings
 FONT_PRIMARY = ":resources:fonts/Blackmetal.ttf"
@@ -90,17 +135,120 @@ PLAYER_MOVEMENT_SPEED = 5
 PLAYER_JUMP_SPEED = 20
 
 # Character Constants
+CHARACTER_ROOT = "arcade_fighter/assets/CHAR-ANIM/PLAYERS"
+CHARACTER_MANIFEST = "manifest.json"
+HITBOX_CACHE_FILE = "arcade_fighter/.cache/hitboxes.bin"
+DEFAULT_CHARACTER = "evil_wizard"
 CHARACTER_SCALING = 1
 TILE_SCALING = 0.5
 PLAYER_START_HP = 100
+SPECIAL_COOLDOWN = 1.5  # seconds between projectile volleys
+
+# Projectile Constants
+ARROW_MOVE_TEXTURE = "arcade_fighter/assets/CHAR-ANIM/PLAYERS/Huntress 2/Sprites/Arrow/Move.png"
+ARROW_FRAME_WIDTH = 24
+ARROW_FRAME_HEIGHT = 5
+ARROW_FRAME_COUNT = 2
+ARROW_ANIM_TICKS = 6  # frames per arrow animation step
+PROJECTILE_POOL_SIZE = 512
+PROJECTILE_SCALING = 2
+PROJECTILE_SPEED = 12
+PROJECTILE_LIFETIME = 120  # frames
+PROJECTILE_DAMAGE = 2
+PROJECTILE_VOLLEY_SIZE = 12
+PROJECTILE_SPREAD = 0.5  # vertical speed step between volley arrows
+PROJECTILE_MUZZLE_OFFSET = 40
+PROJECTILE_CULL_MARGIN = 50
+
+# Stages (Tiled maps in STAGE_DIR, .tmj/.json/.tmx; ARCADE_STAGE picks one by name)
+STAGE_DIR = "arcade_fighter/assets/STAGES"
+STAGE_NAME = os.getenv('ARCADE_STAGE', 'arena')
+STAGE_SIM_NAME = "flat"  # deterministic mode: the simulation's floor-only arena (FLOOR_TOP)
+STAGE_CACHE_DIR = "arcade_fighter/.cache/stages"  # merged geometry, keyed by map file hash
+STAGE_SOLID_COLOR = arcade.color.DARK_SPRING_GREEN  # tiles without a "color" property
+STAGE_LEDGE_COLOR = (139, 94, 60, 255)
+STAGE_SCENERY_COLOR = (60, 70, 90, 255)
+LEDGE_TOLERANCE = 8  # px a fighter standing on a ledge may dip below its top (hurtbox changes) and stay on it
 
 # Game States
-STATE_IDLE = "idle"
-STATE_WALKING = "walking"
-STATE_JUMPING = "jumping"
-STATE_ATTACKING = "attacking"
-STATE_HIT = "hit"
-STATE_DEAD = "dead"
+# Small integers so state machine tables can be indexed directly (see fighter_state.py)
+STATE_IDLE = 0
+STATE_WALKING = 1
+STATE_JUMPING = 2
+STATE_FALLING = 3
+STATE_ATTACKING = 4
+STATE_HIT = 5
+STATE_DEAD = 6
+STATE_NAMES = ("idle", "walking", "jumping", "falling", "attacking", "hit", "dead")
+
+# Combat Timing (seconds)
+ATTACK_DURATION = 0.5
+ATTACK_COOLDOWN = 1.0
+HIT_STUN_DURATION = 0.3
+
+# Hit Detection
+# When True, attacks confirm against the defender's alpha mask instead of the hurtbox polygon
+HIT_PRECISION_PIXEL = False
+PIXEL_MASK_ALPHA_THRESHOLD = 128
+ATTACK_ACTIVE_WINDOW = 0.1  # seconds at the start of an attack that can hit
+
+# Deterministic Simulation (integer physics for lockstep; ARCADE_DETERMINISTIC=1)
+DETERMINISTIC_MODE = os.getenv('ARCADE_DETERMINISTIC', 'False').lower() in ('true', '1', 't')
+SIM_TICK_RATE = 60  # ticks per second; timers above are converted to whole ticks
+SUBPIXEL = 256  # positions and velocities are stored in 1/256 pixel units
+SIM_STAGE_WIDTH = 1280  # fixed stage width so every machine simulates the same arena
+FLOOR_TOP = 64
+FIGHTER_BODY_WIDTH = 60  # default hurtbox when a manifest has no "body" entry
+FIGHTER_BODY_HEIGHT = 110
+PROJECTILE_JITTER = 16  # max random vertical speed added per arrow, in subpixels/tick
+
+# Lockstep Netplay
+NETPLAY_PORT = 7000
+NETPLAY_INPUT_DELAY = 3  # ticks between pressing a key and it taking effect
+NETPLAY_REDUNDANCY = 8  # unacknowledged inputs repeated in every packet (max 15)
+NETPLAY_CHECKSUM_INTERVAL = 30  # ticks between state checksum exchanges
+NETPLAY_CHECKSUM_REPEAT = 3  # packets that carry each checksum, to survive loss
+
+# Spectator Streaming (ARCADE_SPECTATE=1 to serve the running match)
+SPECTATOR_ENABLED = os.getenv('ARCADE_SPECTATE', 'False').lower() in ('true', '1', 't')
+SPECTATOR_PORT = 7200
+SPECTATOR_MAX_CLIENTS = 500
+SPECTATOR_HIGH_WATER = 64 * 1024  # bytes queued before a slow client is skipped
+
+# Replays (ARCADE_RECORD=1 saves each match's spectator stream to REPLAY_DIR)
+REPLAY_ENABLED = os.getenv('ARCADE_RECORD', 'False').lower() in ('true', '1', 't')
+REPLAY_DIR = "arcade_fighter/replays"
+
+# Frame Export (replay to PNG sequence: python -m src.frame_export <replay>)
+EXPORT_DIR = "arcade_fighter/exports"
+EXPORT_PBO_RING = 3  # pixel-pack buffers in flight; readback trails rendering by this many frames
+EXPORT_PIXEL_BUFFERS = 8  # preallocated CPU frames shared between the GL thread and encoders
+EXPORT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+EXPORT_PNG_COMPRESSION = 1  # zlib level; fast encoding, slightly larger files
+
+# Scenario Traces (python -m src.scenario; scripted views, per-frame timings vs a baseline)
+SCENARIO_DIR = "arcade_fighter/scenarios"
+TRACE_DIR = "arcade_fighter/traces"
+SCENARIO_BASELINE = os.path.join(TRACE_DIR, "baseline.json")  # machine-specific, not committed
+SCENARIO_TOLERANCE = 0.15  # fraction a statistic may grow before it counts as a regression
+SCENARIO_NOISE_MS = 0.5  # smaller changes are ignored whatever the ratio
+
+# Dedicated Server (worker i listens on SERVER_PORT + i)
+SERVER_PORT = 7300
+SERVER_WORKERS = os.cpu_count() or 1
+SERVER_MAX_MATCHES = 500  # per worker
+SERVER_MIN_HEADROOM = 0.2  # fraction of the tick period that must stay free to admit a match
+SERVER_IDLE_TIMEOUT = 10.0  # seconds without input before a match is dropped
+SERVER_MAX_CATCHUP = 5  # ticks simulated in one batch when the loop falls behind
+SERVER_SNAPSHOT_INTERVAL = 3  # ticks between state packets (20 Hz at 60 ticks)
+
+# Soak Testing (python -m src.soak; random/adversarial inputs through MatchSimulation)
+SOAK_DIR = "arcade_fighter/soak"  # shrunk failing input logs
+SOAK_WORKERS = os.cpu_count() or 1
+SOAK_MATCH_TICKS = 3 * 60 * 60  # a match still running after this many ticks is restarted
+SOAK_TICK_BUDGET_US = 500  # p99 of the per-tick step time must stay under this
+SOAK_MEMORY_BLOCKS = 20000  # allowed growth in allocated blocks after the first match
+SOAK_SHRINK_RUNS = 2000  # replays spent shrinking one failing log
 
 # Character Directions
 RIGHT_FACING = 0
@@ -117,6 +265,7 @@ KEY_LEFT_P1 = arcade.key.A
 KEY_RIGHT_P1 = arcade.key.D
 KEY_JUMP_P1 = arcade.key.SPACE
 KEY_ATTACK_P1 = arcade.key.F
+KEY_SPECIAL_P1 = arcade.key.G
 
 # Player 2
 KEY_UP_P2 = arcade.key.UP
@@ -125,6 +274,7 @@ KEY_LEFT_P2 = arcade.key.LEFT
 KEY_RIGHT_P2 = arcade.key.RIGHT
 KEY_JUMP_P2 = arcade.key.ENTER
 KEY_ATTACK_P2 = arcade.key.RCTRL
+KEY_SPECIAL_P2 = arcade.key.RSHIFT
 
 # Debug Settings
 # Debug settings - default to False in production
@@ -133,9 +283,50 @@ DEBUG_SHOW_HITBOXES = DEBUG_MODE
 DEBUG_SHOW_VECTORS = DEBUG_MODE
 DEBUG_SHOW_ANIM_STATES = DEBUG_MODE
 
+# Hot Reload (watch character packs; on in debug mode or with ARCADE_HOT_RELOAD=1)
+HOT_RELOAD_ENABLED = DEBUG_MODE or os.getenv('ARCADE_HOT_RELOAD', 'False').lower() in ('true', '1', 't')
+HOT_RELOAD_POLL_INTERVAL = 0.25  # seconds between watcher checks on the worker thread
+
+# Event Log (binary ring buffer flushed by a background thread)
+EVENT_LOG_FILE = "arcade_fighter/logs/events.bin"
+EVENT_LOG_CAPACITY = 4096  # records
+EVENT_LOG_MAX_BYTES = 1024 * 1024
+EVENT_LOG_BACKUPS = 3
+EVENT_LOG_FLUSH_INTERVAL = 0.5  # seconds
+
+# Metrics (Prometheus text; ARCADE_METRICS=file|http to publish)
+METRICS_MODE = os.getenv('ARCADE_METRICS', 'off').lower()
+METRICS_PREFIX = "arcade_fighter"
+METRICS_FILE = "arcade_fighter/logs/metrics.prom"
+METRICS_PORT = int(os.getenv('ARCADE_METRICS_PORT', '9108'))  # bound to localhost only
+METRICS_INTERVAL = 5.0  # seconds between file writes
+FRAME_TIME_BUCKETS = (0.008, 0.012, 0.0167, 0.02, 0.025, 0.0334, 0.05, 0.1, 0.25)
+
+# Adaptive Quality (ARCADE_QUALITY=low|medium|high pins a level and disables the governor)
+QUALITY_LEVELS = (
+    # name, menu particles, parallax layers, SFX voices, HUD refresh (s), render scale
+    ("low", 10, 2, 4, 0.25, 0.5),
+    ("medium", 20, 4, 8, 0.1, 0.75),
+    ("high", 30, 7, 12, 0.0, 1.0),
+)
+QUALITY_PINNED = os.getenv('ARCADE_QUALITY', '').lower()
+QUALITY_TARGET_FPS = 60
+QUALITY_WINDOW = 60  # frames in the sliding window the percentile is taken over
+QUALITY_PERCENTILE = 0.9
+QUALITY_DOWNGRADE_RATIO = 1.15  # step down when the p90 frame time exceeds budget * this
+QUALITY_UPGRADE_RATIO = 0.75  # step up when it stays under budget * this ...
+QUALITY_UPGRADE_HOLD = 5.0  # ... for this many seconds
+QUALITY_COOLDOWN = 2.0  # seconds after any change before the next decision
+
+# Asset Budget (CPU + GPU bytes of decoded textures/audio; 2 GB cabinets leave ~512 MB for assets)
+ASSET_BUDGET_BYTES = int(os.getenv('ARCADE_ASSET_BUDGET_MB', '512')) * 1024 * 1024
+
 # Debug Controls
 KEY_TOGGLE_DEBUG = arcade.key.F1
 KEY_RELOAD_ASSETS = arcade.key.F5
 KEY_TOGGLE_HITBOXES = arcade.key.F2
 KEY_TOGGLE_VECTORS = arcade.key.F3
-KEY_TOGGLE_ANIM_DEBUG = arcade.key.F4
\ No newline at end of file
+KEY_TOGGLE_ANIM_DEBUG = arcade.key.F4
+KEY_TOGGLE_PIXEL_HITS = arcade.key.F6
+KEY_TOGGLE_QUALITY_HUD = arcade.key.F7
+KEY_ASSET_REPORT = arcade.key.F8
@@ -0,0 +1,226 @@
+"""
+Binary event log for gameplay events.
+
+The game thread packs fixed-size records into a preallocated ring buffer and
+never touches the file system; a background thread flushes batches to a
+rotating file. Decode a log from the repository root with:
+    PYTHONPATH=arcade_fighter python -m src.event_log arcade_fighter/logs/events.bin
+"""
+import atexit
+import os
+import struct
+import sys
+import threading
+from typing import Iterator, Optional, Tuple
+from . import constants as C
+
+# Event types
+EV_SETUP = 1
+EV_CREATED = 2
+EV_JUMP = 3
+EV_ATTACK = 4
+EV_SPECIAL = 5
+EV_HIT = 6        # player: attacker, a: defender, b: damage
+EV_DAMAGE = 7     # player: defender, a: amount, b: hp left
+EV_DEATH = 8
+EV_ROUND_END = 9  # player: round winner, a: round number
+EV_ROUND_RESET = 10  # a: round number
+EV_MATCH_END = 11  # player: match winner
+EV_RELOAD = 12
+EV_QUALITY = 13  # a: new quality level, b: frame-time percentile in microseconds
+
+EVENT_NAMES = {
+    EV_SETUP: "setup",
+    EV_CREATED: "created",
+    EV_JUMP: "jump",
+    EV_ATTACK: "attack",
+    EV_SPECIAL: "special",
+    EV_HIT: "hit",
+    EV_DAMAGE: "damage",
+    EV_DEATH: "death",
+    EV_ROUND_END: "round_end",
+    EV_ROUND_RESET: "round_reset",
+    EV_MATCH_END: "match_end",
+    EV_RELOAD: "reload",
+    EV_QUALITY: "quality",
+}
+
+RECORD = struct.Struct("<IBBxxii")  # tick, player, event, a, b -> 16 bytes
+FILE_HEADER = struct.Struct("<4sHH")  # magic, version, record size
+_MAGIC = b"AFEV"
+_VERSION = 1
+
+Event = Tuple[int, int, int, int, int]
+
+
+def format_event(event: Event) -> str:
+    """Human-readable form of a decoded record"""
+    tick, player, kind, a, b = event
+    name = EVENT_NAMES.get(kind, f"event{kind}")
+    return f"[{tick:>8}] P{player} {name} {a} {b}"
+
+
+class RotatingEventFile:
+    """Append-only record file that rolls over to numbered backups"""
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(_MAGIC, _VERSION, RECORD.size))
+
+    def _rotate(self):
+        self._file.close()
+        for n in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{n}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{n + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def write(self, data: bytes):
+        """Append whole records, rotating first if the file would grow too large"""
+        if self._file is None:
+            self._open()
+        if self._file.tell() + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class EventLog:
+    """
+    Single-producer ring buffer of fixed-size event records.
+
+    emit() is called from the game thread only; it packs into a preallocated
+    buffer and never blocks. If the flusher falls a full buffer behind, new
+    events are dropped and counted rather than stalling the frame.
+    """
+
+    def __init__(self, path: str = C.EVENT_LOG_FILE,
+                 capacity: int = C.EVENT_LOG_CAPACITY,
+                 echo: Optional[bool] = None):
+        self.capacity = capacity
+        self._buffer = bytearray(capacity * RECORD.size)
+        self._view = memoryview(self._buffer)
+        self._written = 0  # total records emitted (producer only)
+        self._flushed = 0  # total records flushed (consumer only)
+        self.dropped = 0
+        self.tick = 0
+        self.echo = echo  # None: follow C.DEBUG_MODE
+        self._sink = RotatingEventFile(path, C.EVENT_LOG_MAX_BYTES, C.EVENT_LOG_BACKUPS)
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def emit(self, event: int, player: int = 0, a: int = 0, b: int = 0):
+        """Record an event at the current tick"""
+        written = self._written
+        if written - self._flushed >= self.capacity:
+            self.dropped += 1
+            return
+        RECORD.pack_into(self._buffer, (written % self.capacity) * RECORD.size,
+                         self.tick, player, event, int(a), int(b))
+        self._written = written + 1
+
+    def start(self):
+        """Start the background flusher"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self._running:
+            self._wake.wait(C.EVENT_LOG_FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Copy every pending record out of the ring and write it to the sink"""
+        end = self._written
+        start = self._flushed
+        if end == start:
+            return
+        size = RECORD.size
+        first = start % self.capacity
+        last = end % self.capacity
+        if first < last:
+            chunk = bytes(self._view[first * size:last * size])
+        else:
+            chunk = bytes(self._view[first * size:]) + bytes(self._view[:last * size])
+        self._flushed = end
+        self._sink.write(chunk)
+        echo = C.DEBUG_MODE if self.echo is None else self.echo
+        if echo:
+            for event in RECORD.iter_unpack(chunk):
+                print(format_event(event))
+
+    def close(self):
+        """Stop the flusher and write anything still buffered"""
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.flush()
+        self._sink.close()
+
+
+def read_events(path: str) -> Iterator[Event]:
+    """Decode every record in an event log file"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < FILE_HEADER.size:
+        return
+    magic, version, record_size = FILE_HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or record_size != RECORD.size:
+        raise ValueError(f"{path} is not an event log")
+    body = data[FILE_HEADER.size:]
+    body = body[:len(body) - len(body) % RECORD.size]
+    yield from RECORD.iter_unpack(body)
+
+
+_log: Optional[EventLog] = None
+
+
+def get_event_log() -> EventLog:
+    """Shared event log; the flusher starts on first use and stops at exit"""
+    global _log
+    if _log is None:
+        _log = EventLog()
+        _log.start()
+        atexit.register(_log.close)
+    return _log
+
+
+def emit(event: int, player: int = 0, a: int = 0, b: int = 0):
+    """Record an event on the shared log"""
+    (_log or get_event_log()).emit(event, player, a, b)
+
+
+def main(argv=None):
+    """Print the events of one or more log files"""
+    paths = (argv if argv is not None else sys.argv[1:]) or [C.EVENT_LOG_FILE]
+    for path in paths:
+        for event in read_events(path):
+            print(format_event(event))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+from . import constants as C
+from .constants import (
+    RIGHT_FACING,
+    LEFT_FACING,
+    STATE_IDLE,
+    STATE_WALKING,
+    STATE_JUMPING,
+    STATE_FALLING,
+    STATE_ATTACKING,
+    STATE_HIT,
+    STATE_DEAD
+)
+
+# --- Transition tables ---
+# Rows are indexed by movement context, columns by the current state.
+# Column order: IDLE, WALKING, JUMPING, FALLING, ATTACKING, HIT, DEAD
+CTX_GROUND_STILL = 0
+CTX_GROUND_MOVING = 1
+CTX_AIR_RISING = 2
+CTX_AIR_FALLING = 3
+
+_I, _W, _J, _F = STATE_IDLE, STATE_WALKING, STATE_JUMPING, STATE_FALLING
+_A, _H, _D = STATE_ATTACKING, STATE_HIT, STATE_DEAD
+
+TRANSITIONS = (
+    (_I, _I, _I, _I, _A, _H, _D),  # CTX_GROUND_STILL
+    (_W, _W, _W, _W, _A, _H, _D),  # CTX_GROUND_MOVING
+    (_F, _F, _J, _F, _A, _H, _D),  # CTX_AIR_RISING
+    (_F, _F, _F, _F, _A, _H, _D),  # CTX_AIR_FALLING
+)
+
+# State to return to when state_timer runs out (-1: timer has no effect)
+ON_TIMER_EXPIRE = (-1, -1, -1, -1, _I, _I, -1)
+
+# Action permissions per state
+CAN_MOVE = (True, True, True, True, True, False, False)
+CAN_JUMP = (True, True, True, True, True, False, False)
+CAN_ATTACK = (True, True, True, True, False, False, False)
+CAN_SPECIAL = (True, True, True, True, True, False, False)
+
+# Animation per state; None means "use the current attack animation"
+STATE_ANIMATIONS = ("idle", "walk", "jump", "fall", None, "hit", "death")
+
+
+class FighterState:
+    """
+    Compact gameplay state for one fighter, kept apart from the sprite.
+
+    All fields are slots and states are small integers, so the per-tick step is
+    a few table lookups. Headless code can simulate a fighter with only this record.
+    Timers count down in whatever unit tick() is given: seconds by default, or
+    whole frames when the durations are set in frames (deterministic mode).
+    """
+    __slots__ = (
+        "player_num", "max_hp", "hp", "state", "facing", "state_timer",
+        "attack_cooldown", "special_cooldown", "attack_duration",
+        "attack_cooldown_time", "special_cooldown_time", "hit_stun_time",
+        "attack_index", "attack_count", "has_hit", "is_on_ground"
+    )
+
+    def __init__(self, player_num: int, attack_count: int = 1):
+        self.player_num = player_num
+        self.max_hp = C.PLAYER_START_HP
+        self.attack_duration = C.ATTACK_DURATION
+        self.attack_cooldown_time = C.ATTACK_COOLDOWN
+        self.special_cooldown_time = C.SPECIAL_COOLDOWN
+        self.hit_stun_time = C.HIT_STUN_DURATION
+        self.attack_count = max(1, attack_count)
+        self.reset()
+
+    def reset(self):
+        """Return to the start-of-round state"""
+        self.hp = self.max_hp
+        self.state = STATE_IDLE
+        self.facing = RIGHT_FACING
+        self.state_timer = 0
+        self.attack_cooldown = 0
+        self.special_cooldown = 0
+        self.attack_index = 0
+        self.has_hit = False
+        self.is_on_ground = False
+
+    def face(self, change_x: float):
+        """Turn toward the direction of horizontal movement"""
+        if change_x < 0:
+            self.facing = LEFT_FACING
+        elif change_x > 0:
+            self.facing = RIGHT_FACING
+
+    def tick(self, delta_time: float, change_x: float, change_y: float) -> bool:
+        """
+        Advance timers and apply the transition tables.
+        Returns True on the tick the fighter dies.
+        """
+        if self.attack_cooldown > 0:
+            self.attack_cooldown -= delta_time
+        if self.special_cooldown > 0:
+            self.special_cooldown -= delta_time
+        if self.state_timer > 0:
+            self.state_timer -= delta_time
+            if self.state_timer <= 0:
+                expired = ON_TIMER_EXPIRE[self.state]
+                if expired >= 0:
+                    self.state = expired
+
+        if self.is_on_ground and change_y == 0:
+            ctx = CTX_GROUND_MOVING if change_x else CTX_GROUND_STILL
+        else:
+            ctx = CTX_AIR_RISING if change_y > 0 else CTX_AIR_FALLING
+        self.state = TRANSITIONS[ctx][self.state]
+
+        if self.hp <= 0 and self.state != STATE_DEAD:
+            self.state = STATE_DEAD
+            return True
+        return False
+
+    def start_jump(self) -> bool:
+        """Enter the jump state if allowed"""
+        if self.is_on_ground and CAN_JUMP[self.state]:
+            self.state = STATE_JUMPING
+            self.is_on_ground = False # Assume we left the ground
+            return True
+        return False
+
+    def start_attack(self) -> bool:
+        """Enter the attack state if allowed"""
+        if self.attack_cooldown <= 0 and CAN_ATTACK[self.state]:
+            self.has_hit = False # Reset hit flag for new attack
+            self.attack_index = (self.attack_index + 1) % self.attack_count
+            self.state = STATE_ATTACKING
+            self.attack_cooldown = self.attack_cooldown_time
+            self.state_timer = self.attack_duration # Attack state lasts for this duration
+            return True
+        return False
+
+    def start_special(self) -> bool:
+        """Start a special move if allowed"""
+        if self.special_cooldown <= 0 and CAN_SPECIAL[self.state]:
+            self.special_cooldown = self.special_cooldown_time
+            return True
+        return False
+
+    def apply_damage(self, amount: int) -> bool:
+        """Take damage. Returns False if the fighter was already dead."""
+        if self.state == STATE_DEAD: # Can't take damage if already dead
+            return False
+        self.hp -= amount
+        if self.hp <= 0:
+            self.hp = 0
+            self.state = STATE_DEAD
+        else:
+            self.state = STATE_HIT
+            self.state_timer = self.hit_stun_time
+        return True
@@ -0,0 +1,187 @@
+"""
+Replay to PNG image sequence, for highlight reels.
+
+The match is played back offscreen as fast as it renders. Frames are handed
+off in three stages so the GL thread never waits on compression or disk:
+
+1. GL thread: draw the tick into the virtual canvas and start an asynchronous
+   glReadPixels into the next pixel-pack buffer (PBO) of a small ring. The
+   call returns at once, and the copy runs while the next frames draw.
+2. GL thread, EXPORT_PBO_RING frames later: that copy has long finished, so
+   mapping the PBO doesn't stall. Copy it into a preallocated CPU frame and
+   queue the frame on the encoder pool.
+3. Worker threads: flip the frame into a PIL image, which returns the CPU
+   frame to the free list, then PNG-encode and write it. Pillow releases the
+   GIL while compressing.
+
+The GL thread waits only when all EXPORT_PIXEL_BUFFERS frames are queued
+behind the encoders. That is backpressure, counted in `stalls`; nothing is
+dropped.
+
+Export a replay from the repository root with:
+    PYTHONPATH=arcade_fighter python -m src.frame_export arcade_fighter/replays/<name>.replay
+"""
+import argparse
+import ctypes
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, List, Optional, Tuple
+from PIL import Image
+from pyglet import gl
+from . import constants as C
+
+
+def encode_png(pixels: bytearray, size: Tuple[int, int], path: str, compression: int,
+               release: Callable[[bytearray], None]):
+    """Worker: bottom-up RGBA frame to a PNG file"""
+    try:
+        image = Image.frombuffer("RGBA", size, pixels, "raw", "RGBA", 0, 1)
+        image = image.transpose(Image.Transpose.FLIP_TOP_BOTTOM)  # copies the pixels
+    finally:
+        release(pixels)
+    image.save(path, compress_level=compression)
+
+
+class FrameExporter:
+    """Asynchronous framebuffer readback feeding a PNG encoder pool"""
+
+    def __init__(self, ctx, size: Tuple[int, int], directory: str,
+                 ring: int = C.EXPORT_PBO_RING, pixel_buffers: int = C.EXPORT_PIXEL_BUFFERS,
+                 workers: int = C.EXPORT_WORKERS, compression: int = C.EXPORT_PNG_COMPRESSION,
+                 clock=time.perf_counter):
+        self.ctx = ctx
+        self.size = size
+        self.directory = directory
+        self.compression = compression
+        self.clock = clock
+        self.frame_bytes = size[0] * size[1] * 4
+        os.makedirs(directory, exist_ok=True)
+
+        self.pbos = [ctx.buffer(reserve=self.frame_bytes, usage="stream") for _ in range(max(1, ring))]
+        self._pending: Deque[Tuple[int, int]] = deque()  # (pbo index, frame number), oldest first
+        self._next_pbo = 0
+        self._free: "queue.Queue[bytearray]" = queue.Queue()
+        for _ in range(max(1, pixel_buffers)):
+            self._free.put(bytearray(self.frame_bytes))
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="png")
+        self._lock = threading.Lock()
+        self.errors: List[BaseException] = []
+
+        self.frames_captured = 0
+        self.frames_written = 0
+        self.stalls = 0  # times the GL thread waited for a free CPU frame
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    # --- GL thread ---
+
+    def capture(self, fbo):
+        """Queue an asynchronous readback of the framebuffer's first attachment"""
+        if self.started is None:
+            self.started = self.clock()
+        if len(self._pending) == len(self.pbos):
+            self._collect()
+        index = self._next_pbo
+        self._next_pbo = (index + 1) % len(self.pbos)
+        width, height = self.size
+        with fbo.activate():
+            gl.glReadBuffer(gl.GL_COLOR_ATTACHMENT0)
+            gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbos[index].glo)
+            gl.glReadPixels(0, 0, width, height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, 0)
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        self._pending.append((index, self.frames_captured))
+        self.frames_captured += 1
+
+    def finish(self) -> float:
+        """Drain the ring, wait for the encoders; returns frames written per second"""
+        while self._pending:
+            self._collect()
+        self._pool.shutdown(wait=True)
+        self.finished = self.clock()
+        if self.errors:
+            raise self.errors[0]
+        return self.throughput()
+
+    def throughput(self) -> float:
+        """Frames written per second since the first capture"""
+        if self.started is None:
+            return 0.0
+        elapsed = (self.finished or self.clock()) - self.started
+        return self.frames_written / elapsed if elapsed > 0 else 0.0
+
+    def _collect(self):
+        """Copy the oldest readback into a free CPU frame and hand it to the pool"""
+        index, frame = self._pending.popleft()
+        try:
+            pixels = self._free.get_nowait()
+        except queue.Empty:
+            self.stalls += 1
+            pixels = self._free.get()
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbos[index].glo)
+        pointer = gl.glMapBufferRange(gl.GL_PIXEL_PACK_BUFFER, 0, self.frame_bytes, gl.GL_MAP_READ_BIT)
+        ctypes.memmove((ctypes.c_char * self.frame_bytes).from_buffer(pixels), pointer, self.frame_bytes)
+        gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        path = os.path.join(self.directory, f"{frame:06d}.png")
+        future = self._pool.submit(encode_png, pixels, self.size, path,
+                                   self.compression, self._free.put)
+        future.add_done_callback(self._done)
+
+    # --- Worker threads ---
+
+    def _done(self, future):
+        error = future.exception()
+        with self._lock:
+            if error is None:
+                self.frames_written += 1
+            else:
+                self.errors.append(error)
+
+
+def export_replay(path: str, directory: str, **options) -> FrameExporter:
+    """Render every tick of a replay offscreen and write it as PNG frames"""
+    import arcade
+    from .replay import ReplayReader
+    from .views.spectator_view import SpectatorView
+
+    reader = ReplayReader(path)
+    window = arcade.Window(C.SCREEN_WIDTH, C.SCREEN_HEIGHT, f"{C.SCREEN_TITLE} - Export", visible=False)
+    try:
+        view = SpectatorView(reader)
+        window.show_view(view)
+        screen = view.screen
+        exporter = FrameExporter(window.ctx, screen.get_framebuffer_size(), directory, **options)
+        while reader.advance():
+            view.on_update(1 / C.SIM_TICK_RATE)
+            with screen.activate():
+                view.draw_scene()
+            exporter.capture(screen.fbo)
+        exporter.finish()
+    finally:
+        window.close()
+    return exporter
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a replay as a PNG sequence")
+    parser.add_argument("replay", help="file recorded with ARCADE_RECORD=1")
+    parser.add_argument("--out", help=f"output directory (default {C.EXPORT_DIR}/<replay name>)")
+    parser.add_argument("--workers", type=int, default=C.EXPORT_WORKERS)
+    parser.add_argument("--compression", type=int, default=C.EXPORT_PNG_COMPRESSION, help="zlib level 0-9")
+    args = parser.parse_args(argv)
+
+    name = os.path.splitext(os.path.basename(args.replay))[0]
+    directory = args.out or os.path.join(C.EXPORT_DIR, name)
+    exporter = export_replay(args.replay, directory, workers=args.workers, compression=args.compression)
+    elapsed = exporter.finished - exporter.started if exporter.started else 0.0
+    print(f"{exporter.frames_written} frames to {directory} in {elapsed:.2f}s: "
+          f"{exporter.throughput():.1f} frames/s, {exporter.stalls} stalls")
+
+
+if __name__ == "__main__":
+    main()
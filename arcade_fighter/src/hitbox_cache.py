@@ -0,0 +1,159 @@
+"""
+Per-frame hurtbox polygons cached on disk, keyed by strip content hash.
+Precompute from the repository root with:
+    PYTHONPATH=arcade_fighter python -m src.hitbox_cache
+"""
+import hashlib
+import os
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+import arcade
+from arcade import hitbox
+from . import constants as C
+
+Points = Tuple[Tuple[float, float], ...]
+AABB = Tuple[float, float, float, float]  # left, bottom, right, top
+# One frame: (points, aabb) for each facing, indexed by RIGHT_FACING / LEFT_FACING
+FrameHitbox = Tuple[Tuple[Points, Points], Tuple[AABB, AABB]]
+
+_MAGIC = b"AFHB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHI")      # magic, version, entry count
+_ENTRY = struct.Struct("<20sHHH")     # sha1, frame width, frame height, frame count
+_FRAME = struct.Struct("<hhhhH")      # aabb (l, b, r, t), point count
+_POINT = struct.Struct("<hh")
+
+
+def file_digest(file_path: str) -> bytes:
+    """SHA-1 of a file's contents"""
+    with open(file_path, "rb") as f:
+        return hashlib.sha1(f.read()).digest()
+
+
+def compute_frame(texture: arcade.Texture) -> Tuple[Points, AABB]:
+    """Trace a simplified polygon and AABB from a frame's alpha channel"""
+    points = hitbox.algo_simple.calculate(texture.image)
+    points = tuple((int(round(x)), int(round(y))) for x, y in points)
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return points, (min(xs), min(ys), max(xs), max(ys))
+
+
+def mirror(points: Points, aabb: AABB) -> Tuple[Points, AABB]:
+    """Mirror a polygon and AABB around the frame's vertical center line"""
+    flipped = tuple((-x, y) for x, y in reversed(points))
+    left, bottom, right, top = aabb
+    return flipped, (-right, bottom, -left, top)
+
+
+class HitboxCache:
+    """In-memory view of the hitbox cache file"""
+
+    def __init__(self, path: str = C.HITBOX_CACHE_FILE):
+        self.path = path
+        # digest -> (frame_width, frame_height, [(points, aabb), ...])
+        self.entries: Dict[bytes, Tuple[int, int, List[Tuple[Points, AABB]]]] = {}
+        self.dirty = False
+        self._lock = threading.Lock()  # hot reload computes frames on a worker thread
+        self.load()
+
+    def load(self):
+        """Read the cache file if it exists and is valid"""
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        try:
+            magic, version, count = _HEADER.unpack_from(data, 0)
+            if magic != _MAGIC or version != _VERSION:
+                return
+            offset = _HEADER.size
+            for _ in range(count):
+                digest, width, height, frame_count = _ENTRY.unpack_from(data, offset)
+                offset += _ENTRY.size
+                frames = []
+                for _ in range(frame_count):
+                    left, bottom, right, top, n = _FRAME.unpack_from(data, offset)
+                    offset += _FRAME.size
+                    points = tuple(_POINT.unpack_from(data, offset + k * _POINT.size) for k in range(n))
+                    offset += n * _POINT.size
+                    frames.append((points, (left, bottom, right, top)))
+                self.entries[digest] = (width, height, frames)
+        except struct.error:
+            # Truncated or corrupt file: start over
+            self.entries.clear()
+
+    def save(self):
+        """Write every entry back to disk"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            chunks = [_HEADER.pack(_MAGIC, _VERSION, len(self.entries))]
+            for digest, (width, height, frames) in self.entries.items():
+                chunks.append(_ENTRY.pack(digest, width, height, len(frames)))
+                for points, aabb in frames:
+                    chunks.append(_FRAME.pack(*aabb, len(points)))
+                    chunks.extend(_POINT.pack(x, y) for x, y in points)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(chunks))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def save_if_dirty(self):
+        """Write the file only when new frames were computed"""
+        if self.dirty:
+            self.save()
+
+    def frames_for(self, file_path: str, frame_width: int, frame_height: int,
+                   textures: Sequence[Tuple[arcade.Texture, arcade.Texture]],
+                   digest: Optional[bytes] = None) -> List[FrameHitbox]:
+        """
+        Hitboxes for every frame of a strip, computing and caching any that
+        are missing. `textures` are the strip's (right, left) frame pairs.
+        Pass `digest` if the caller already hashed the file.
+        """
+        digest = digest or file_digest(file_path)
+        entry = self.entries.get(digest)
+        if entry is None or entry[:2] != (frame_width, frame_height) or len(entry[2]) != len(textures):
+            frames = [compute_frame(pair[C.RIGHT_FACING]) for pair in textures]
+            with self._lock:
+                self.entries[digest] = (frame_width, frame_height, frames)
+                self.dirty = True
+        else:
+            frames = entry[2]
+
+        # RIGHT_FACING is index 0 and LEFT_FACING index 1, as with texture pairs
+        result = []
+        for points, aabb in frames:
+            flipped_points, flipped_aabb = mirror(points, aabb)
+            result.append(((points, flipped_points), (aabb, flipped_aabb)))
+        return result
+
+
+_cache: Optional[HitboxCache] = None
+
+
+def get_hitbox_cache() -> HitboxCache:
+    """Shared hitbox cache, loaded on first use"""
+    global _cache
+    if _cache is None:
+        _cache = HitboxCache()
+    return _cache
+
+
+def main():
+    """Precompute hitboxes for every frame of every roster character"""
+    from .roster import Roster
+    roster = Roster()
+    for char_id in roster.ids:
+        assets = roster.load(char_id)
+        frame_total = sum(len(frames) for frames in assets.hitboxes.values())
+        print(f"{char_id}: {frame_total} frames")
+        roster.unload(char_id)
+    get_hitbox_cache().save()
+    print(f"Hitbox cache written to {get_hitbox_cache().path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Incremental asset hot reload.
+
+A watcher reports files under the roster root that were written: inotify on
+Linux (through ctypes, no extra dependency), mtime polling elsewhere. A worker
+thread compares each file's content hash with the one its assets were decoded
+from, so saving an unchanged file does nothing. It then re-decodes only the
+strips that really changed. An edited manifest.json is re-read as well. Only
+strips whose file or frame layout changed get decoded again; frame data such
+as damage, hitboxes and fps just take the new values.
+
+The game thread calls poll() once per update. It installs finished results
+into the shared CharacterAssets and returns which characters changed, so the
+view can refresh its sprites in place without restarting the match.
+"""
+import ctypes
+import ctypes.util
+import os
+import queue
+import struct
+import sys
+import threading
+from typing import Dict, Iterable, Optional, Set, Tuple
+from . import constants as C
+from .hitbox_cache import file_digest
+from .roster import CharacterManifest, DecodedAnimation, Roster, get_roster
+
+# A reload ready for the game thread: new manifest plus re-decoded strips
+Patch = Tuple[CharacterManifest, Dict[str, DecodedAnimation]]
+
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+class InotifyWatcher:
+    """Linux inotify on every directory under a root, read without blocking"""
+
+    def __init__(self, root: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories: Dict[int, str] = {}
+        for directory, _, _ in os.walk(root):
+            # Editors that save by rename produce MOVED_TO instead of CLOSE_WRITE
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO)
+            if wd >= 0:
+                self.directories[wd] = directory
+
+    def changes(self) -> Set[str]:
+        paths = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except (BlockingIOError, InterruptedError):
+                break
+            pos = 0
+            while pos < len(data):
+                wd, _, _, length = _IN_EVENT.unpack_from(data, pos)
+                pos += _IN_EVENT.size
+                name = data[pos:pos + length].rstrip(b"\0")
+                pos += length
+                directory = self.directories.get(wd)
+                if directory and name:
+                    paths.add(os.path.join(directory, os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback: compare (mtime, size) of every file under a root"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.files = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        files = {}
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files[path] = (st.st_mtime_ns, st.st_size)
+        return files
+
+    def changes(self) -> Set[str]:
+        files = self._snapshot()
+        paths = {path for path, stamp in files.items() if self.files.get(path) != stamp}
+        self.files = files
+        return paths
+
+    def close(self):
+        pass
+
+
+def create_watcher(root: str):
+    """inotify where available, polling otherwise"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass  # no inotify symbols or out of watches
+    return PollingWatcher(root)
+
+
+class HotReloader:
+    """Background change detection and decoding for one roster"""
+
+    def __init__(self, roster: Roster, watch: bool = True,
+                 interval: float = C.HOT_RELOAD_POLL_INTERVAL):
+        self.roster = roster
+        self.interval = interval
+        self.watcher = create_watcher(roster.root) if watch else None
+        self.reloads = 0  # patches installed
+        self.unchanged = 0  # written files whose content hash had not changed
+        self.last_error: Optional[str] = None
+        self._requests: "queue.SimpleQueue[Set[str]]" = queue.SimpleQueue()
+        self._results: "queue.SimpleQueue[Patch]" = queue.SimpleQueue()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="hot-reload", daemon=True)
+        self._thread.start()
+
+    # Game thread
+
+    def rescan(self, char_ids: Iterable[str]):
+        """Check every file of some characters now (the F5 key), watched or not"""
+        paths = set()
+        for char_id in char_ids:
+            manifest = self.roster.manifest(char_id)
+            paths.add(manifest.path)
+            paths.update(manifest.animation_path(name) for name in manifest.animations)
+        self._requests.put(paths)
+
+    def poll(self) -> Set[str]:
+        """Install finished reloads; returns the ids of characters that changed"""
+        changed = set()
+        while True:
+            try:
+                manifest, decoded = self._results.get_nowait()
+            except queue.Empty:
+                return changed
+            self.roster.apply_reload(manifest, decoded)
+            self.reloads += 1
+            changed.add(manifest.char_id)
+
+    def stop(self):
+        self._running = False
+        self._requests.put(set())
+        self._thread.join(timeout=2.0)
+        if self.watcher:
+            self.watcher.close()
+
+    # Worker thread
+
+    def _run(self):
+        while self._running:
+            try:
+                paths = self._requests.get(timeout=self.interval)
+            except queue.Empty:
+                paths = set()
+            if self.watcher:
+                paths |= self.watcher.changes()
+            if paths and self._running:
+                self._check({os.path.abspath(p) for p in paths})
+
+    def _check(self, paths: Set[str]):
+        for manifest in list(self.roster.manifests.values()):
+            try:
+                patch = self._diff(manifest, paths)
+            except (OSError, ValueError, KeyError) as e:
+                # Usually a file caught half-written; the next write retries it
+                self.last_error = f"{manifest.char_id}: {e}"
+                continue
+            if patch:
+                self._results.put(patch)
+
+    def _diff(self, manifest: CharacterManifest, paths: Set[str]) -> Optional[Patch]:
+        """What has to be reloaded for one character, given the written paths"""
+        new = manifest
+        if os.path.abspath(manifest.path) in paths:
+            if file_digest(manifest.path) == manifest.digest:
+                self.unchanged += 1
+            else:
+                new = CharacterManifest.from_file(manifest.path)
+
+        assets = self.roster.assets(manifest.char_id)
+        if assets is None:
+            # Not decoded: only the manifest matters, strips are read on load
+            return (new, {}) if new is not manifest else None
+
+        layout = (new.sprite_dir, new.frame_width, new.frame_height)
+        old_layout = (manifest.sprite_dir, manifest.frame_width, manifest.frame_height)
+        decoded = {}
+        for name, spec in new.animations.items():
+            path = new.animation_path(name)
+            # Only the strip file and frame count shape the decode; fps and loop
+            # come along with the new manifest
+            old_spec = manifest.animations.get(name)
+            strip = (spec["file"], spec["frames"])
+            if layout != old_layout or old_spec is None or strip != (old_spec["file"], old_spec["frames"]):
+                decoded[name] = new.decode_animation(name)
+            elif os.path.abspath(path) in paths:
+                if file_digest(path) == assets.digests.get(name):
+                    self.unchanged += 1
+                else:
+                    decoded[name] = new.decode_animation(name)
+        if new is manifest and not decoded:
+            return None
+        return new, decoded
+
+
+_reloader: Optional[HotReloader] = None
+
+
+def get_hot_reloader() -> HotReloader:
+    """Shared reloader for the roster; watches files if C.HOT_RELOAD_ENABLED"""
+    global _reloader
+    if _reloader is None:
+        _reloader = HotReloader(get_roster(), watch=C.HOT_RELOAD_ENABLED)
+    return _reloader
@@ -0,0 +1,238 @@
+"""
+Counters, gauges and histograms for scraping cabinets.
+
+Every metric is written by the game thread only, as plain attribute and list
+updates with no locks. A background exporter thread reads them and publishes
+Prometheus text, either to a file (for node_exporter's textfile collector) or on
+a localhost HTTP endpoint. Pick the mode with ARCADE_METRICS=file|http.
+"""
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Union
+from . import constants as C
+
+
+class Counter:
+    """Monotonic count"""
+    __slots__ = ("name", "help", "value")
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+    def samples(self):
+        yield self.name, self.value
+
+
+class Gauge:
+    """Value that can go up and down"""
+    __slots__ = ("name", "help", "value")
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def samples(self):
+        yield self.name, self.value
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. observe() bumps one slot of a preallocated list;
+    cumulative bucket counts are only computed when exporting.
+    """
+    __slots__ = ("name", "help", "bounds", "counts", "sum")
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, bounds: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def samples(self):
+        counts = list(self.counts)  # snapshot so buckets and count agree
+        total = 0
+        for bound, count in zip(self.bounds, counts):
+            total += count
+            yield f'{self.name}_bucket{{le="{bound:g}"}}', total
+        total += counts[-1]
+        yield f'{self.name}_bucket{{le="+Inf"}}', total
+        yield f"{self.name}_sum", self.sum
+        yield f"{self.name}_count", total
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """Named metrics, created on first use and rendered as Prometheus text"""
+
+    def __init__(self, prefix: str = C.METRICS_PREFIX):
+        self.prefix = prefix
+        self._metrics: Dict[str, Metric] = {}
+
+    def _get(self, cls, name: str, help: str, *args) -> Metric:
+        full = f"{self.prefix}_{name}" if self.prefix else name
+        metric = self._metrics.get(full)
+        if metric is None:
+            metric = cls(full, help, *args)
+            self._metrics[full] = metric
+        elif not isinstance(metric, cls):
+            raise ValueError(f"{full} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "",
+                  bounds: Sequence[float] = C.FRAME_TIME_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, bounds)
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, value in metric.samples():
+                lines.append(f"{name} {value:g}" if isinstance(value, float) else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Background publisher for a registry"""
+
+    def __init__(self, registry: MetricsRegistry, mode: str = C.METRICS_MODE,
+                 path: str = C.METRICS_FILE, port: int = C.METRICS_PORT,
+                 interval: float = C.METRICS_INTERVAL):
+        self.registry = registry
+        self.mode = mode
+        self.path = path
+        self.port = port
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        if self.mode == "http":
+            self._server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+            self._server.daemon_threads = True
+            target = self._server.serve_forever
+        elif self.mode == "file":
+            target = self._run_file
+        else:
+            raise ValueError(f"Unknown metrics mode: {self.mode}")
+        self._thread = threading.Thread(target=target, name="metrics", daemon=True)
+        self._thread.start()
+
+    def _handler(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the console
+
+        return Handler
+
+    def write_file(self):
+        """Write the current values atomically so scrapers never see half a file"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.registry.render())
+        os.replace(tmp, self.path)
+
+    def _run_file(self):
+        while not self._stop.wait(self.interval):
+            self.write_file()
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        elif self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self.write_file()
+        self._thread = None
+
+
+_registry: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Shared registry, created on first use"""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
+
+
+def start_exporter() -> Optional[MetricsExporter]:
+    """Start publishing the shared registry if C.METRICS_MODE asks for it"""
+    if C.METRICS_MODE not in ("file", "http"):
+        return None
+    exporter = MetricsExporter(get_metrics())
+    exporter.start()
+    return exporter
+
+
+# Metrics used across the game, registered up front so a scrape always lists them
+_m = get_metrics()
+FRAMES_RENDERED = _m.counter("frames_rendered_total", "Frames drawn by the game view")
+FRAME_TIME = _m.histogram("frame_time_seconds", "Time between game updates")
+TICKS_SIMULATED = _m.counter("ticks_simulated_total", "Game logic updates run")
+HITS_LANDED = _m.counter("hits_landed_total", "Melee and projectile hits")
+ROUNDS_COMPLETED = _m.counter("rounds_completed_total", "Rounds won by either player")
+MATCHES_COMPLETED = _m.counter("matches_completed_total", "Matches played to the end")
+ASSET_CACHE_HITS = _m.counter("asset_cache_hits_total", "Asset requests served from memory")
+ASSET_CACHE_MISSES = _m.counter("asset_cache_misses_total", "Asset requests that had to decode")
+TEXTURE_BYTES = _m.gauge("texture_bytes_resident", "Decoded RGBA texture bytes held in memory")
+AUDIO_BYTES = _m.gauge("audio_bytes_resident", "Decoded PCM audio bytes held in memory")
+GPU_BYTES = _m.gauge("gpu_bytes_resident", "Texture bytes uploaded to the GPU atlas")
+ASSET_EVICTIONS = _m.counter("asset_evictions_total", "Assets dropped to stay under the memory budget")
+QUALITY_LEVEL = _m.gauge("quality_level", "Current adaptive quality level (0 = lowest)")
+del _m
@@ -0,0 +1,262 @@
+"""
+Music director: playlists with background prefetch and gapless crossfades.
+
+While a track plays, a worker thread decodes the next one from the active
+playlist. MUSIC_CROSSFADE seconds before the current track ends, the prefetched
+track starts on the second player and the two volumes swap along equal-power
+curves. Switching playlists (menu <-> fight) crossfades as soon as the new
+playlist's first track is decoded, and the game thread never waits on a
+decoder.
+
+At most two tracks are resident. Nothing is prefetched during a fade. The
+outgoing track is released when its fade ends, and only then is the one after
+it requested. A prefetch made for a playlist that is no longer active is
+dropped when it arrives.
+"""
+import itertools
+import math
+import queue
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import arcade
+import pyglet.media
+from . import constants as C
+from .assets import KIND_AUDIO, get_asset_registry, sound_bytes
+
+
+class Track:
+    """A fully decoded track"""
+    __slots__ = ("path", "sound", "length", "nbytes", "key")
+    _serials = itertools.count(1)
+
+    def __init__(self, path: str, sound: arcade.Sound):
+        self.path = path
+        self.sound = sound
+        self.length = sound.get_length()
+        self.nbytes = sound_bytes(sound)
+        # Registry key; a one-track playlist can hold the same file twice while crossfading
+        self.key = f"music:{path}#{next(self._serials)}"
+
+
+class MusicDirector:
+    """Two crossfading players fed by a prefetch thread"""
+
+    def __init__(self, playlists: Dict[str, List[str]] = C.MUSIC_PLAYLISTS,
+                 crossfade: float = C.MUSIC_CROSSFADE, volume: float = C.DEFAULT_VOLUME,
+                 seed: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self.playlists = playlists
+        self.crossfade = crossfade
+        self.volume = volume
+        self.duck_gain = 1.0  # set by the SFX mixer's on_duck hook
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.players = [pyglet.media.Player(), pyglet.media.Player()]
+        for player in self.players:
+            player.loop = True  # a lone or late track repeats instead of going silent
+        self.playlist: Optional[str] = None
+        self.current: Optional[Track] = None
+        self.fading: Optional[Track] = None  # outgoing track during a crossfade
+        self.next: Optional[Track] = None  # prefetched, not yet playing
+        self.active = 0  # index of the player holding self.current
+        self.started = 0.0  # clock time the current track (re)started
+        self.fade_started = 0.0
+        self.switch_now = False  # crossfade as soon as self.next is ready
+        self.paused_at: Optional[float] = None
+        self.failed = set()  # paths that could not be decoded
+        self.last_error: Optional[str] = None
+        self._generation = 0  # bumped on playlist change; stale prefetches are dropped
+        self._pending: Optional[str] = None
+        self._requests: "queue.SimpleQueue[Optional[Tuple[int, str]]]" = queue.SimpleQueue()
+        self._results: "queue.SimpleQueue[Tuple[int, str, object]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="music-prefetch", daemon=True)
+        self._thread.start()
+        self._scheduled = False
+
+    # --- Control ---
+
+    def schedule(self):
+        """Drive update() from the arcade clock so fades continue across views"""
+        if not self._scheduled:
+            arcade.schedule(self.update, C.MUSIC_UPDATE_INTERVAL)
+            self._scheduled = True
+
+    def play(self, playlist: str):
+        """Switch to a playlist (no-op if it is already the active one)"""
+        if playlist == self.playlist:
+            return
+        self.playlist = playlist
+        self._generation += 1
+        self._release_next()
+        if self.fading:
+            self._finish_fade()
+        self.switch_now = True
+        self._pending = None  # anything in flight belongs to the old playlist
+        self._prefetch()
+
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = self.clock()
+            for player in self.players:
+                player.pause()
+
+    def resume(self):
+        if self.paused_at is not None:
+            paused_for = self.clock() - self.paused_at
+            self.started += paused_for
+            self.fade_started += paused_for
+            self.paused_at = None
+            self.players[self.active].play()
+            if self.fading:
+                self.players[1 - self.active].play()
+
+    def set_volume(self, volume: float):
+        self.volume = max(0.0, min(1.0, volume))
+        self._apply_volumes()
+
+    def duck(self, gain: float):
+        """SfxMixer.on_duck hook"""
+        self.duck_gain = gain
+        self._apply_volumes()
+
+    @property
+    def current_track(self) -> Optional[str]:
+        return self.current.path if self.current else None
+
+    @property
+    def resident(self) -> int:
+        """Decoded tracks held in memory"""
+        return sum(1 for track in (self.current, self.fading, self.next) if track)
+
+    def stop(self):
+        self._requests.put(None)
+        if self._scheduled:
+            arcade.unschedule(self.update)
+            self._scheduled = False
+        for player in self.players:
+            player.pause()
+
+    # --- Per frame ---
+
+    def update(self, delta_time: float = 0.0):
+        if self.paused_at is not None:
+            return
+        self._collect()
+        now = self.clock()
+        if self.fading:
+            if now - self.fade_started >= self.crossfade:
+                self._finish_fade()
+        elif self.next:
+            if self.current is None:
+                self._start(self.next, fade=False)
+            elif self.switch_now or now - self.started >= self.current.length - self.crossfade:
+                self._start(self.next, fade=True)
+        self._apply_volumes()
+        if not self.fading and not self.next:
+            self._prefetch()
+
+    # --- Internals (game thread) ---
+
+    def _collect(self):
+        while True:
+            try:
+                generation, path, result = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if generation != self._generation or path != self._pending:
+                continue  # playlist changed while decoding: drop it
+            self._pending = None
+            if isinstance(result, Exception):
+                self.failed.add(path)
+                self.last_error = f"{path}: {result}"
+                continue
+            self.next = Track(path, result)
+            # Pinned: the director frees tracks itself as soon as they stop
+            get_asset_registry().track(self.next.key, KIND_AUDIO, self.next.nbytes, pinned=True)
+
+    def _prefetch(self):
+        """Ask the worker for the next track, if one is due and none is in flight"""
+        if self._pending or self.playlist is None:
+            return
+        tracks = [p for p in self.playlists.get(self.playlist, []) if p not in self.failed]
+        if self.current and self.current.path in tracks:
+            if len(tracks) == 1:
+                self.switch_now = False
+                return  # a one-track playlist just loops
+            tracks.remove(self.current.path)
+        if not tracks:
+            return
+        self._pending = self.rng.choice(tracks)
+        self._requests.put((self._generation, self._pending))
+
+    def _start(self, track: Track, fade: bool):
+        """Begin `track` on the idle player, fading the current one out if asked"""
+        self.next = None
+        self.switch_now = False
+        now = self.clock()
+        if fade and self.current:
+            self.fading = self.current
+            self.fade_started = now
+            self.active = 1 - self.active
+        elif self.current:
+            self._release(self.players[self.active], self.current)
+        player = self.players[self.active]
+        player.queue(track.sound.source)  # idle players hold no source (see _release)
+        self.current = track
+        self.started = now
+        self._apply_volumes()
+        player.play()
+
+    def _finish_fade(self):
+        self._release(self.players[1 - self.active], self.fading)
+        self.fading = None
+
+    def _release(self, player, track: Track):
+        """Stop a player and drop its source so the decoded track can be freed"""
+        player.pause()
+        if player.source is not None:
+            player.next_source()  # queue is empty, so this clears the source
+        get_asset_registry().forget(track.key)
+
+    def _release_next(self):
+        if self.next:
+            get_asset_registry().forget(self.next.key)
+            self.next = None
+
+    def _apply_volumes(self):
+        base = self.volume * self.duck_gain
+        if self.fading:
+            t = min(1.0, max(0.0, (self.clock() - self.fade_started) / self.crossfade))
+            self.players[self.active].volume = base * math.sin(t * math.pi / 2)
+            self.players[1 - self.active].volume = base * math.cos(t * math.pi / 2)
+        else:
+            self.players[self.active].volume = base
+
+    # --- Worker thread ---
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            generation, path = request
+            if generation != self._generation:
+                continue  # superseded before we got to it
+            try:
+                result = arcade.load_sound(path, streaming=False)
+            except Exception as e:  # missing file or no decoder for the format
+                result = e
+            self._results.put((generation, path, result))
+
+
+_director: Optional[MusicDirector] = None
+
+
+def get_music_director() -> MusicDirector:
+    """Shared director, driven by the arcade clock from first use"""
+    global _director
+    if _director is None:
+        _director = MusicDirector()
+        _director.schedule()
+    return _director
@@ -0,0 +1,152 @@
+"""
+Load generator for the dedicated server.
+
+Opens matches between local bot clients, adding a few per second, until the
+server starts rejecting them or the target count is reached. It prints each
+worker's match count and tick headroom as it goes. The final line gives matches
+per worker, which is matches per core since every worker is one process.
+Run from the repository root (the roster path is relative to it):
+    PYTHONPATH=arcade_fighter python -m src.net.loadgen --spawn-server --workers 1 --matches 300
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List
+from .. import constants as C
+from ..roster import get_roster
+from ..simulation import INPUT_ATTACK, INPUT_JUMP, INPUT_LEFT, INPUT_RIGHT, INPUT_SPECIAL
+from .lockstep import parse_address
+from .server import (
+    INPUT, PKT_INPUT, PKT_REJECT, PKT_STATE, PKT_STATS, DedicatedServer, encode_join, shard_for
+)
+
+BOT_MOVES = (0, INPUT_LEFT, INPUT_RIGHT, INPUT_LEFT | INPUT_ATTACK, INPUT_RIGHT | INPUT_ATTACK,
+             INPUT_JUMP, INPUT_SPECIAL)
+
+
+class BotMatch(asyncio.DatagramProtocol):
+    """Both players of one match on a single socket, pressing random buttons"""
+
+    def __init__(self, match_id: int, rng: random.Random, characters: List[str]):
+        self.match_id = match_id
+        self.characters = characters
+        self.rng = rng
+        self.inputs = [0, 0]
+        self.transport = None
+        self.states = 0
+        self.rejected = False
+        self.finished = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        for player in (1, 2):
+            transport.sendto(encode_join(self.match_id, player, self.rng.choice(self.characters)))
+
+    def datagram_received(self, data, addr):
+        if data[0] == PKT_STATE:
+            self.states += 1
+            if data[-1]:  # match winner set
+                self.finished = True
+        elif data[0] == PKT_REJECT:
+            self.rejected = True
+
+    def step(self, keepalive: bool):
+        """Change buttons now and then; inputs are sent on change or as a keepalive"""
+        for n in range(2):
+            changed = self.rng.random() < 0.1
+            if changed:
+                self.inputs[n] = self.rng.choice(BOT_MOVES)
+            if changed or keepalive:
+                self.transport.sendto(INPUT.pack(PKT_INPUT, self.match_id, n + 1, self.inputs[n]))
+
+
+class StatsProbe(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.replies: Dict[int, dict] = {}
+
+    def datagram_received(self, data, addr):
+        if data[0] == PKT_STATS:
+            stats = json.loads(data[1:].decode("utf-8"))
+            self.replies[stats["worker"]] = stats
+
+
+async def run_load(host: str, port: int, workers: int, matches: int, rate: float,
+                   duration: float, seed: int = 0) -> List[dict]:
+    loop = asyncio.get_running_loop()
+    rng = random.Random(seed)
+    characters = get_roster().ids
+    probe = StatsProbe()
+    probe_transport, _ = await loop.create_datagram_endpoint(lambda: probe, local_addr=("127.0.0.1", 0))
+    bots: List[BotMatch] = []
+    next_id = 1
+    start = last_report = time.monotonic()
+    period = 1.0 / C.SIM_TICK_RATE
+    stop_adding = False
+    frame = 0
+
+    while time.monotonic() - start < duration:
+        now = time.monotonic()
+        # Ramp up
+        wanted = min(matches, int((now - start) * rate) + 1)
+        while not stop_adding and len(bots) < wanted:
+            bot = BotMatch(next_id, rng, characters)
+            worker = shard_for(next_id, workers)
+            await loop.create_datagram_endpoint(lambda: bot, remote_addr=(host, port + worker))
+            bots.append(bot)
+            next_id += 1
+        frame += 1
+        keepalive = frame % C.SIM_TICK_RATE == 0
+        for bot in bots:
+            if not bot.rejected and not bot.finished:
+                bot.step(keepalive)
+        if any(bot.rejected for bot in bots):
+            stop_adding = True  # a worker is out of headroom
+
+        if now - last_report >= 1.0:
+            last_report = now
+            for worker in range(workers):
+                probe_transport.sendto(bytes((PKT_STATS,)), (host, port + worker))
+            await asyncio.sleep(0.05)
+            for worker, stats in sorted(probe.replies.items()):
+                print(f"[{now - start:5.1f}s] worker {worker}: {stats['matches']} matches, "
+                      f"tick {stats['tick_ms']:.3f} ms, headroom {stats['headroom']:.0%}, "
+                      f"rejected {stats['rejected']}")
+        await asyncio.sleep(period)
+
+    for bot in bots:
+        bot.transport.close()
+    probe_transport.close()
+    return [probe.replies[w] for w in sorted(probe.replies)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bot load generator for the dedicated server")
+    parser.add_argument("--server", type=parse_address, default=("127.0.0.1", C.SERVER_PORT))
+    parser.add_argument("--workers", type=int, default=1, help="worker count of the server")
+    parser.add_argument("--matches", type=int, default=200, help="target concurrent matches")
+    parser.add_argument("--rate", type=float, default=20, help="new matches per second")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--spawn-server", action="store_true", help="start a local server first")
+    args = parser.parse_args(argv)
+
+    host, port = args.server
+    server = None
+    if args.spawn_server:
+        server = DedicatedServer(args.workers, "127.0.0.1", port)
+        server.start()
+        time.sleep(2.0)  # let the workers import and bind
+    try:
+        final = asyncio.run(run_load(host, port, args.workers, args.matches, args.rate, args.duration))
+    finally:
+        if server:
+            server.stop()
+    if final:
+        per_worker = sum(s["matches"] for s in final) / len(final)
+        headroom = min(s["headroom"] for s in final)
+        print(f"{per_worker:.0f} matches per core at {headroom:.0%} minimum headroom")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Delay-based lockstep netplay over UDP.
+
+Both peers run the same MatchSimulation. A tick is only simulated once both
+players' inputs for it are known; local inputs are scheduled `input_delay`
+ticks ahead so they usually arrive in time. Every packet carries the oldest
+unacknowledged inputs (up to `redundancy` of them), so a lost packet is covered
+by the next one without any resend logic. Every `checksum_interval` ticks the
+peers swap state checksums to detect desyncs.
+
+Wire format (little endian, about 10 bytes per packet at 60 packets/s):
+    byte 0     bits 0-3 input count, bit 4 checksum attached, bits 5-7 type
+    u16        tick of the first input (low 16 bits)
+    u16        newest tick received contiguously from the peer (ack)
+    n * 5 bits input bytes, packed LSB first
+    [u16 tick, u32 crc]  when bit 4 is set
+
+Run a peer from the repository root with:
+    PYTHONPATH=arcade_fighter python -m src.net.lockstep --player 1 --port 7000 --peer 127.0.0.1:7001
+"""
+import argparse
+import socket
+import struct
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from .. import constants as C
+from ..simulation import INPUT_BITS, MatchSimulation
+
+PKT_INPUT = 1
+
+_HEADER = struct.Struct("<BHH")
+_CHECKSUM = struct.Struct("<HI")
+_FLAG_CHECKSUM = 0x10
+_COUNT_MASK = 0x0F
+_TYPE_SHIFT = 5
+
+Address = Tuple[str, int]
+
+
+def pack_inputs(inputs: List[int], bits: int = INPUT_BITS) -> bytes:
+    """Pack small input values into a byte string, `bits` each, LSB first"""
+    acc = 0
+    for n, value in enumerate(inputs):
+        acc |= (value & ((1 << bits) - 1)) << (n * bits)
+    return acc.to_bytes((len(inputs) * bits + 7) // 8, "little")
+
+
+def unpack_inputs(data: bytes, count: int, bits: int = INPUT_BITS) -> List[int]:
+    """Inverse of pack_inputs"""
+    acc = int.from_bytes(data, "little")
+    mask = (1 << bits) - 1
+    return [(acc >> (n * bits)) & mask for n in range(count)]
+
+
+def unwrap_tick(tick16: int, reference: int) -> int:
+    """Expand a 16-bit tick to the full tick nearest to `reference`"""
+    delta = (tick16 - reference) & 0xFFFF
+    if delta >= 0x8000:
+        delta -= 0x10000
+    return reference + delta
+
+
+def encode_packet(first_tick: int, ack: int, inputs: List[int],
+                  checksum: Optional[Tuple[int, int]] = None) -> bytes:
+    """Build an input packet"""
+    head = (PKT_INPUT << _TYPE_SHIFT) | len(inputs)
+    if checksum is not None:
+        head |= _FLAG_CHECKSUM
+    data = _HEADER.pack(head, first_tick & 0xFFFF, ack & 0xFFFF) + pack_inputs(inputs)
+    if checksum is not None:
+        data += _CHECKSUM.pack(checksum[0] & 0xFFFF, checksum[1])
+    return data
+
+
+def decode_packet(data: bytes, reference: int):
+    """
+    Parse an input packet. Ticks are unwrapped around `reference`.
+    Returns (first_tick, ack, inputs, checksum or None), or None if malformed.
+    """
+    if len(data) < _HEADER.size:
+        return None
+    head, first16, ack16 = _HEADER.unpack_from(data)
+    if head >> _TYPE_SHIFT != PKT_INPUT:
+        return None
+    count = head & _COUNT_MASK
+    offset = _HEADER.size
+    size = (count * INPUT_BITS + 7) // 8
+    if len(data) < offset + size:
+        return None
+    inputs = unpack_inputs(data[offset:offset + size], count)
+    offset += size
+    checksum = None
+    if head & _FLAG_CHECKSUM:
+        if len(data) < offset + _CHECKSUM.size:
+            return None
+        tick16, crc = _CHECKSUM.unpack_from(data, offset)
+        checksum = (unwrap_tick(tick16, reference), crc)
+    return unwrap_tick(first16, reference), unwrap_tick(ack16, reference), inputs, checksum
+
+
+class LockstepSession:
+    """
+    One peer of a two-player lockstep match.
+
+    Call update(local_bits) once per frame to receive, schedule this frame's
+    input and send; then advance() to run every tick whose inputs are complete.
+    """
+
+    def __init__(self, sim: MatchSimulation, local_player: int, sock: socket.socket,
+                 peer: Address, input_delay: int = C.NETPLAY_INPUT_DELAY,
+                 redundancy: int = C.NETPLAY_REDUNDANCY,
+                 checksum_interval: int = C.NETPLAY_CHECKSUM_INTERVAL):
+        if not 1 <= redundancy <= _COUNT_MASK:
+            raise ValueError(f"redundancy must be 1-{_COUNT_MASK}")
+        self.sim = sim
+        self.local_player = local_player
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.peer = peer
+        self.input_delay = input_delay
+        self.redundancy = redundancy
+        self.checksum_interval = checksum_interval
+
+        # The first `input_delay` ticks have no real input on either side
+        self.local_inputs: Dict[int, int] = {t: 0 for t in range(1, input_delay + 1)}
+        self.remote_inputs: Dict[int, int] = dict(self.local_inputs)
+        self.local_until = input_delay  # newest tick with a local input
+        self.remote_until = input_delay  # newest tick with every remote input before it
+        self.peer_ack = 0  # newest local tick the peer has confirmed
+
+        self.local_checksums: Dict[int, int] = {}
+        self.remote_checksums: Dict[int, int] = {}
+        self._checksum_out: Optional[Tuple[int, int]] = None
+        self._checksum_sends = 0
+        self.desync_tick: Optional[int] = None
+
+        self.bytes_sent = 0
+        self.packets_sent = 0
+        self.packets_received = 0
+        self.last_receive = time.monotonic()
+
+    @property
+    def stalled(self) -> bool:
+        """True while the next tick is waiting on the peer"""
+        return self.sim.frame + 1 > self.remote_until
+
+    def update(self, local_bits: int):
+        """Receive, schedule the local input for frame + delay, and send"""
+        self.poll()
+        target = self.sim.frame + 1 + self.input_delay
+        if self.local_until < target:
+            self.local_until += 1
+            self.local_inputs[self.local_until] = local_bits
+        self.send()
+
+    def poll(self):
+        """Drain every packet waiting on the socket"""
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(512)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionError:
+                # ICMP port unreachable from a peer that is not up yet
+                continue
+            self.receive(data)
+
+    def receive(self, data: bytes):
+        """Merge one packet's inputs, ack and checksum"""
+        packet = decode_packet(data, self.remote_until)
+        if packet is None:
+            return
+        first, ack, inputs, checksum = packet
+        self.packets_received += 1
+        self.last_receive = time.monotonic()
+        for n, bits in enumerate(inputs):
+            tick = first + n
+            if tick > self.sim.frame:
+                self.remote_inputs.setdefault(tick, bits)
+        while self.remote_until + 1 in self.remote_inputs:
+            self.remote_until += 1
+        if ack > self.peer_ack:
+            self.peer_ack = ack
+            for tick in [t for t in self.local_inputs if t <= min(ack, self.sim.frame)]:
+                del self.local_inputs[tick]
+        if checksum is not None:
+            tick, crc = checksum
+            self.remote_checksums[tick] = crc
+            self._compare(tick)
+
+    def send(self):
+        """Send the oldest unacknowledged local inputs (the redundancy window)"""
+        first = self.peer_ack + 1
+        last = min(self.local_until, first + self.redundancy - 1)
+        inputs = [self.local_inputs[t] for t in range(first, last + 1)]
+        checksum = None
+        if self._checksum_out is not None and self._checksum_sends > 0:
+            checksum = self._checksum_out
+            self._checksum_sends -= 1
+        data = encode_packet(first, self.remote_until, inputs, checksum)
+        try:
+            self.sock.sendto(data, self.peer)
+        except OSError:
+            return
+        self.bytes_sent += len(data)
+        self.packets_sent += 1
+
+    def advance(self, on_step: Optional[Callable[[MatchSimulation], None]] = None) -> int:
+        """Simulate every tick whose inputs are complete. Returns ticks run."""
+        sim = self.sim
+        ran = 0
+        while sim.frame + 1 <= min(self.remote_until, self.local_until):
+            tick = sim.frame + 1
+            local = self.local_inputs[tick]
+            remote = self.remote_inputs.pop(tick)
+            inputs = (local, remote) if self.local_player == 1 else (remote, local)
+            sim.step(inputs)
+            ran += 1
+            if tick <= self.peer_ack:
+                del self.local_inputs[tick]
+            if tick % self.checksum_interval == 0:
+                self.local_checksums[tick] = sim.checksum()
+                self._checksum_out = (tick, self.local_checksums[tick])
+                self._checksum_sends = C.NETPLAY_CHECKSUM_REPEAT
+                self._compare(tick)
+            if on_step is not None:
+                on_step(sim)
+        return ran
+
+    def _compare(self, tick: int):
+        local = self.local_checksums.get(tick)
+        remote = self.remote_checksums.get(tick)
+        if local is None or remote is None:
+            return
+        del self.local_checksums[tick]
+        del self.remote_checksums[tick]
+        if local != remote and self.desync_tick is None:
+            self.desync_tick = tick
+
+    def close(self):
+        self.sock.close()
+
+
+def open_socket(port: int, host: str = "0.0.0.0") -> socket.socket:
+    """Bound non-blocking UDP socket"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    sock.setblocking(False)
+    return sock
+
+
+def parse_address(text: str) -> Address:
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def main(argv=None):
+    """Play one side of a lockstep match in a window"""
+    import arcade
+    from ..views.game_view import GameView
+
+    parser = argparse.ArgumentParser(description="Lockstep netplay peer")
+    parser.add_argument("--player", type=int, choices=(1, 2), required=True)
+    parser.add_argument("--port", type=int, default=C.NETPLAY_PORT)
+    parser.add_argument("--peer", type=parse_address, required=True, help="host:port")
+    parser.add_argument("--seed", type=int, default=0, help="must match on both peers")
+    parser.add_argument("--delay", type=int, default=C.NETPLAY_INPUT_DELAY)
+    parser.add_argument("--p1", default=C.DEFAULT_CHARACTER)
+    parser.add_argument("--p2", default=C.DEFAULT_CHARACTER)
+    args = parser.parse_args(argv)
+
+    window = arcade.Window(C.WINDOW_WIDTH, C.WINDOW_HEIGHT, f"{C.SCREEN_TITLE} - P{args.player}")
+    sim = MatchSimulation(args.p1, args.p2, seed=args.seed)
+    session = LockstepSession(sim, args.player, open_socket(args.port), args.peer,
+                              input_delay=args.delay)
+    view = GameView(args.p1, args.p2, netplay=session)
+    window.show_view(view)
+    view.setup()
+    arcade.run()
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Local UDP relay that simulates a bad network between two netplay peers.
+
+Each peer sends to its own relay port; the relay forwards to the other peer
+after a latency plus random jitter, dropping a fraction of packets. Point peer 1
+at --left-port and peer 2 at --right-port:
+    PYTHONPATH=arcade_fighter python -m src.net.relay --left-port 7100 --left-peer 127.0.0.1:7000 \\
+        --right-port 7101 --right-peer 127.0.0.1:7001 --latency 40 --jitter 10 --loss 0.05
+"""
+import argparse
+import heapq
+import random
+import select
+import socket
+import threading
+import time
+from typing import List, Optional, Tuple
+from .lockstep import Address, parse_address
+
+
+class LinkConditioner:
+    """Latency, jitter and loss settings with their own seeded RNG"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0,
+                 seed: Optional[int] = None):
+        self.latency = latency  # seconds, one way
+        self.jitter = jitter  # seconds, uniform +/-
+        self.loss = loss  # 0..1 chance to drop each packet
+        self._rng = random.Random(seed)
+
+    def delay(self) -> Optional[float]:
+        """Seconds to hold a packet, or None to drop it"""
+        if self.loss and self._rng.random() < self.loss:
+            return None
+        return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+
+class UdpRelay:
+    """
+    Two relay sockets: packets arriving on the left socket go to the right peer
+    (sent from the right socket) and the other way round.
+    """
+
+    def __init__(self, left_port: int, left_peer: Address,
+                 right_port: int, right_peer: Address,
+                 conditioner: Optional[LinkConditioner] = None, host: str = "127.0.0.1"):
+        self.conditioner = conditioner or LinkConditioner()
+        self.left = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.left.bind((host, left_port))
+        self.right = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.right.bind((host, right_port))
+        self.left_peer = left_peer
+        self.right_peer = right_peer
+        # (release time, sequence, data, socket to send from, destination)
+        self._queue: List[Tuple[float, int, bytes, socket.socket, Address]] = []
+        self._seq = 0
+        self.forwarded = 0
+        self.dropped = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ports(self) -> Tuple[int, int]:
+        return self.left.getsockname()[1], self.right.getsockname()[1]
+
+    def start(self):
+        """Relay on a background thread"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="udp-relay", daemon=True)
+        self._thread.start()
+
+    def run_forever(self):
+        """Relay on the calling thread until stop() or Ctrl+C"""
+        self._running = True
+        self._run()
+
+    def _run(self):
+        routes = {self.left: (self.right, self.right_peer), self.right: (self.left, self.left_peer)}
+        while self._running:
+            now = time.monotonic()
+            while self._queue and self._queue[0][0] <= now:
+                _, _, data, sock, dest = heapq.heappop(self._queue)
+                try:
+                    sock.sendto(data, dest)
+                    self.forwarded += 1
+                except OSError:
+                    self.dropped += 1
+            timeout = 0.05
+            if self._queue:
+                timeout = max(0.0, min(timeout, self._queue[0][0] - now))
+            readable, _, _ = select.select(list(routes), [], [], timeout)
+            for sock in readable:
+                try:
+                    data, _ = sock.recvfrom(2048)
+                except OSError:
+                    continue
+                delay = self.conditioner.delay()
+                if delay is None:
+                    self.dropped += 1
+                    continue
+                out, dest = routes[sock]
+                self._seq += 1
+                heapq.heappush(self._queue, (time.monotonic() + delay, self._seq, data, out, dest))
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.left.close()
+        self.right.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lossy UDP relay for netplay testing")
+    parser.add_argument("--left-port", type=int, required=True)
+    parser.add_argument("--left-peer", type=parse_address, required=True)
+    parser.add_argument("--right-port", type=int, required=True)
+    parser.add_argument("--right-peer", type=parse_address, required=True)
+    parser.add_argument("--latency", type=float, default=30, help="one-way ms")
+    parser.add_argument("--jitter", type=float, default=0, help="+/- ms")
+    parser.add_argument("--loss", type=float, default=0, help="drop chance 0..1")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    conditioner = LinkConditioner(args.latency / 1000, args.jitter / 1000, args.loss, args.seed)
+    relay = UdpRelay(args.left_port, args.left_peer, args.right_port, args.right_peer, conditioner)
+    print(f"Relaying {relay.ports[0]} -> {args.right_peer}, {relay.ports[1]} -> {args.left_peer}")
+    try:
+        relay.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        relay.stop()
+        print(f"forwarded {relay.forwarded}, dropped {relay.dropped}")
+
+
+if __name__ == "__main__":
+    main()
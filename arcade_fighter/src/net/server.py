@@ -0,0 +1,294 @@
+"""
+Headless dedicated match server.
+
+Each worker process runs one asyncio loop that hosts many MatchSimulations
+and ticks all of them together once per loop iteration (catching up by a few
+ticks if the loop fell behind). Matches are sharded by id: match m lives on
+worker m % workers, which listens on base port + worker index, so clients find
+their worker without a routing hop. New matches are only admitted while the
+worker's measured tick headroom stays above SERVER_MIN_HEADROOM. Snapshots
+go out every SERVER_SNAPSHOT_INTERVAL ticks rather than every tick, since a
+sendto per player costs more than simulating the match.
+
+Packets (little endian UDP):
+    client -> server  JOIN  u8 type, u32 match, u8 player, u8 length, character id
+                      INPUT u8 type, u32 match, u8 player, u8 input bits
+                      LEAVE u8 type, u32 match, u8 player
+                      STATS u8 type
+    server -> client  STATE u8 type, u32 match, u32 tick, u32 crc,
+                            i16 x1, y1, x2, y2, hp1, hp2, u8 state1, state2, winner
+                      REJECT u8 type, u32 match (worker full, or unknown character)
+                      STATS u8 type, json
+
+Start a server from the repository root with:
+    PYTHONPATH=arcade_fighter python -m src.net.server --workers 4 --port 7300
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+from .. import constants as C
+from ..roster import get_roster
+from ..simulation import MatchSimulation
+
+PKT_JOIN = 1
+PKT_INPUT = 2
+PKT_LEAVE = 3
+PKT_STATS = 4
+PKT_STATE = 5
+PKT_REJECT = 6
+
+JOIN = struct.Struct("<BIBB")
+INPUT = struct.Struct("<BIBB")
+LEAVE = struct.Struct("<BIB")
+STATE = struct.Struct("<BIIIhhhhhhBBB")
+REJECT = struct.Struct("<BI")
+
+Address = Tuple[str, int]
+
+
+def shard_for(match_id: int, workers: int) -> int:
+    """Worker index that owns a match"""
+    return match_id % workers
+
+
+def encode_join(match_id: int, player: int, character_id: str) -> bytes:
+    name = character_id.encode("utf-8")
+    return JOIN.pack(PKT_JOIN, match_id, player, len(name)) + name
+
+
+class HostedMatch:
+    """One match on a worker: its simulation, latest inputs and player addresses"""
+    __slots__ = ("match_id", "sim", "inputs", "addresses", "characters", "last_seen")
+
+    def __init__(self, match_id: int):
+        self.match_id = match_id
+        self.sim: Optional[MatchSimulation] = None  # created once both players joined
+        self.inputs = [0, 0]
+        self.addresses: List[Optional[Address]] = [None, None]
+        self.characters: List[Optional[str]] = [None, None]
+        self.last_seen = time.monotonic()
+
+    def state_packet(self) -> bytes:
+        sim = self.sim
+        f1, f2 = sim.fighters
+        sub = C.SUBPIXEL
+        return STATE.pack(PKT_STATE, self.match_id, sim.frame, sim.checksum(),
+                          f1.x // sub, f1.y // sub, f2.x // sub, f2.y // sub,
+                          f1.hp, f2.hp, f1.state, f2.state, sim.match_winner)
+
+
+class MatchWorker(asyncio.DatagramProtocol):
+    """All matches of one shard, ticked in a batch on one asyncio loop"""
+
+    def __init__(self, index: int = 0, workers: int = 1,
+                 max_matches: int = C.SERVER_MAX_MATCHES,
+                 min_headroom: float = C.SERVER_MIN_HEADROOM,
+                 tick_rate: int = C.SIM_TICK_RATE,
+                 snapshot_interval: int = C.SERVER_SNAPSHOT_INTERVAL):
+        self.index = index
+        self.workers = workers
+        self.max_matches = max_matches
+        self.min_headroom = min_headroom
+        self.period = 1.0 / tick_rate
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.matches: Dict[int, HostedMatch] = {}
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.busy = 0.0  # smoothed seconds spent per tick batch
+        self.ticks = 0
+        self.rejected = 0
+        self.late_ticks = 0
+        self._running = False
+
+    @property
+    def headroom(self) -> float:
+        """Fraction of the tick period left after simulating every match"""
+        return max(0.0, 1.0 - self.busy / self.period)
+
+    def admits(self) -> bool:
+        """Admission control for a new match"""
+        return len(self.matches) < self.max_matches and self.headroom >= self.min_headroom
+
+    # --- Network ---
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Address):
+        if not data:
+            return
+        kind = data[0]
+        if kind == PKT_INPUT and len(data) >= INPUT.size:
+            _, match_id, player, bits = INPUT.unpack_from(data)
+            match = self.matches.get(match_id)
+            if match is not None and player in (1, 2):
+                match.inputs[player - 1] = bits
+                match.last_seen = time.monotonic()
+        elif kind == PKT_JOIN and len(data) >= JOIN.size:
+            _, match_id, player, length = JOIN.unpack_from(data)
+            name = data[JOIN.size:JOIN.size + length].decode("utf-8", "replace")
+            self.join(match_id, player, name or C.DEFAULT_CHARACTER, addr)
+        elif kind == PKT_LEAVE and len(data) >= LEAVE.size:
+            _, match_id, _ = LEAVE.unpack_from(data)
+            self.matches.pop(match_id, None)
+        elif kind == PKT_STATS:
+            self.transport.sendto(bytes((PKT_STATS,)) + json.dumps(self.stats()).encode("utf-8"), addr)
+
+    def join(self, match_id: int, player: int, character_id: str, addr: Address):
+        if player not in (1, 2) or shard_for(match_id, self.workers) != self.index:
+            return
+        if character_id not in get_roster().manifests:
+            # The name comes off the wire; an unknown one would fail MatchSimulation
+            self.transport.sendto(REJECT.pack(PKT_REJECT, match_id), addr)
+            return
+        match = self.matches.get(match_id)
+        if match is None:
+            if not self.admits():
+                self.rejected += 1
+                self.transport.sendto(REJECT.pack(PKT_REJECT, match_id), addr)
+                return
+            match = HostedMatch(match_id)
+            self.matches[match_id] = match
+        match.addresses[player - 1] = addr
+        match.characters[player - 1] = character_id
+        match.last_seen = time.monotonic()
+        if match.sim is None and all(match.addresses):
+            seed = int.from_bytes(os.urandom(4), "little")
+            match.sim = MatchSimulation(match.characters[0], match.characters[1], seed=seed)
+
+    def stats(self) -> dict:
+        return {
+            "worker": self.index,
+            "matches": len(self.matches),
+            "headroom": round(self.headroom, 3),
+            "tick_ms": round(self.busy * 1000, 3),
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+            "rejected": self.rejected,
+        }
+
+    # --- Ticking ---
+
+    def tick_batch(self, ticks: int = 1):
+        """Advance every running match `ticks` times; send snapshots when one is due"""
+        interval = self.snapshot_interval
+        snapshot = (self.ticks + ticks) // interval != self.ticks // interval
+        sendto = self.transport.sendto if self.transport else None
+        now = time.monotonic()
+        finished = []
+        for match in self.matches.values():
+            sim = match.sim
+            if sim is None:
+                if now - match.last_seen > C.SERVER_IDLE_TIMEOUT:
+                    finished.append(match.match_id)
+                continue
+            for _ in range(ticks):
+                sim.step(match.inputs)
+            over = sim.match_winner or now - match.last_seen > C.SERVER_IDLE_TIMEOUT
+            if sendto is not None and (snapshot or over):
+                packet = match.state_packet()  # the final state is always sent
+                for addr in match.addresses:
+                    sendto(packet, addr)
+            if over:
+                finished.append(match.match_id)
+        for match_id in finished:
+            del self.matches[match_id]
+        self.ticks += ticks
+
+    async def run(self):
+        """Tick at the simulation rate until stop()"""
+        self._running = True
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while self._running:
+            now = loop.time()
+            due = int((now - next_tick) / self.period) + 1
+            if due > 1:
+                self.late_ticks += due - 1
+            due = min(due, C.SERVER_MAX_CATCHUP)
+            start = time.perf_counter()
+            self.tick_batch(due)
+            elapsed = (time.perf_counter() - start) / due
+            self.busy += (elapsed - self.busy) * 0.1
+            next_tick = max(next_tick + due * self.period, now - self.period)
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def stop(self):
+        self._running = False
+
+
+async def serve_worker(index: int, workers: int, host: str, port: int, **options):
+    """Bind a worker's shard port and tick forever"""
+    loop = asyncio.get_running_loop()
+    worker = MatchWorker(index, workers, **options)
+    transport, _ = await loop.create_datagram_endpoint(lambda: worker, local_addr=(host, port + index))
+    try:
+        await worker.run()
+    finally:
+        transport.close()
+
+
+def _worker_process(index: int, workers: int, host: str, port: int, options: dict):
+    try:
+        asyncio.run(serve_worker(index, workers, host, port, **options))
+    except KeyboardInterrupt:
+        pass
+
+
+class DedicatedServer:
+    """Parent process: starts one worker process per shard"""
+
+    def __init__(self, workers: int = C.SERVER_WORKERS, host: str = "0.0.0.0",
+                 port: int = C.SERVER_PORT, **options):
+        self.workers = max(1, workers)
+        self.host = host
+        self.port = port
+        self.options = options
+        self.processes: List[multiprocessing.Process] = []
+
+    def start(self):
+        for index in range(self.workers):
+            process = multiprocessing.Process(
+                target=_worker_process, name=f"match-worker-{index}",
+                args=(index, self.workers, self.host, self.port, self.options), daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+
+    def join(self):
+        for process in self.processes:
+            process.join()
+
+    def stop(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(timeout=2.0)
+        self.processes = []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless dedicated match server")
+    parser.add_argument("--workers", type=int, default=C.SERVER_WORKERS)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=C.SERVER_PORT, help="worker i listens on port + i")
+    parser.add_argument("--max-matches", type=int, default=C.SERVER_MAX_MATCHES, help="per worker")
+    parser.add_argument("--min-headroom", type=float, default=C.SERVER_MIN_HEADROOM)
+    args = parser.parse_args(argv)
+
+    server = DedicatedServer(args.workers, args.host, args.port,
+                             max_matches=args.max_matches, min_headroom=args.min_headroom)
+    server.start()
+    print(f"{server.workers} workers on ports {args.port}-{args.port + server.workers - 1}")
+    try:
+        server.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Live match streaming to spectator terminals.
+
+The game thread hands SpectatorServer a flat list of ints describing the match
+each tick (capture_state). The server's asyncio loop, running on its own
+thread, encodes that once as a delta against the previous tick and writes the
+same bytes to every client. A client whose socket buffer is over the
+high-water mark is skipped and marked stale; when it drains it gets a keyframe
+(also encoded at most once per tick) and resumes on deltas.
+
+Messages are length-prefixed (u16):
+    HELLO  json match info (characters, arena width)
+    KEY    varint count, zigzag varint values
+    DELTA  varint count, changed-field bitmap, zigzag varint deltas
+
+Watch a match from the repository root with:
+    PYTHONPATH=arcade_fighter python -m src.net.spectator --connect 127.0.0.1:7200
+"""
+import argparse
+import asyncio
+import json
+import struct
+import threading
+from typing import Dict, List, Optional, Set
+from .. import constants as C
+
+MSG_HELLO = 1
+MSG_KEY = 2
+MSG_DELTA = 3
+
+_LENGTH = struct.Struct("<H")
+
+# capture_state layout
+HEADER_FIELDS = 4  # tick, round number, p1 rounds won, p2 rounds won
+FIGHTER_FIELDS = 7  # x, bottom, hp, state, facing, attack index, animation frame
+PROJECTILE_FIELDS = 3  # x, y, facing
+
+
+# --- Encoding ---
+
+def _put_varint(out: bytearray, value: int):
+    """Zigzag + LEB128, so small negative deltas stay one byte"""
+    value = (value << 1) ^ (value >> 63)
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data: bytes, pos: int):
+    shift = result = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return (result >> 1) ^ -(result & 1), pos
+
+
+def encode_key(values: List[int]) -> bytes:
+    out = bytearray((MSG_KEY,))
+    _put_varint(out, len(values))
+    for value in values:
+        _put_varint(out, value)
+    return bytes(out)
+
+
+def encode_delta(previous: List[int], values: List[int]) -> bytes:
+    """Only fields that changed since `previous` (missing fields count as 0)"""
+    count = len(values)
+    out = bytearray((MSG_DELTA,))
+    _put_varint(out, count)
+    bitmap_at = len(out)
+    out.extend(bytes((count + 7) // 8))
+    known = len(previous)
+    for i, value in enumerate(values):
+        diff = value - (previous[i] if i < known else 0)
+        if diff:
+            out[bitmap_at + (i >> 3)] |= 1 << (i & 7)
+            _put_varint(out, diff)
+    return bytes(out)
+
+
+def apply_message(values: Optional[List[int]], data: bytes) -> Optional[List[int]]:
+    """Decode a KEY or DELTA message on top of the last known values"""
+    kind = data[0]
+    count, pos = _get_varint(data, 1)
+    if kind == MSG_KEY:
+        result = []
+        for _ in range(count):
+            value, pos = _get_varint(data, pos)
+            result.append(value)
+        return result
+    if kind != MSG_DELTA or values is None:
+        return values  # a delta before any keyframe can't be applied
+    bitmap = data[pos:pos + (count + 7) // 8]
+    pos += len(bitmap)
+    result = values[:count] + [0] * (count - len(values))
+    for i in range(count):
+        if bitmap[i >> 3] & (1 << (i & 7)):
+            diff, pos = _get_varint(data, pos)
+            result[i] += diff
+    return result
+
+
+def frame_message(payload: bytes) -> bytes:
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def capture_state(view) -> List[int]:
+    """Flatten a GameView into the spectator layout"""
+    values = [view.tick, view.round_number, view.player1_rounds_won, view.player2_rounds_won]
+    for player in (view.player1_sprite, view.player2_sprite):
+        values += (round(player.center_x), round(player.bottom), player.hp, player.state,
+                   player.facing_direction, player.attack_index, player.current_frame)
+    projectiles = list(view.projectiles.positions()) if view.projectiles else []
+    values.append(len(projectiles))
+    for x, y, facing in projectiles:
+        values += (round(x), round(y), facing)
+    return values
+
+
+# --- Server ---
+
+class _Spectator:
+    __slots__ = ("writer", "stale")
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.stale = True  # needs a keyframe before deltas make sense
+
+
+class SpectatorServer:
+    """asyncio broadcast server on a background thread"""
+
+    def __init__(self, host: str = "0.0.0.0", port: int = C.SPECTATOR_PORT,
+                 max_clients: int = C.SPECTATOR_MAX_CLIENTS,
+                 high_water: int = C.SPECTATOR_HIGH_WATER):
+        self.host = host
+        self.port = port
+        self.max_clients = max_clients
+        self.high_water = high_water
+        self.clients: Set[_Spectator] = set()
+        self.match_info: Dict = {}
+        self._hello = frame_message(bytes((MSG_HELLO,)) + b"{}")
+        self._previous: List[int] = []
+        self._key: Optional[bytes] = None  # keyframe for the current tick, built on demand
+        self.frames_encoded = 0
+        self.frames_skipped = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    # Called from the game thread
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="spectators", daemon=True)
+        self._thread.start()
+        self._ready.wait(5.0)
+
+    def set_match(self, info: Dict):
+        """Describe the match (characters etc.); sent to every client on join"""
+        self._call(self._set_match, dict(info))
+
+    def publish(self, values: List[int]):
+        """Queue one tick of state for broadcast"""
+        self._call(self._broadcast, values)
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _call(self, callback, *args):
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    # Loop thread
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._server = loop.run_until_complete(
+            asyncio.start_server(self._on_client, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._loop = loop
+        loop.call_soon(self._ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            for client in list(self.clients):
+                client.writer.close()
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+    def _set_match(self, info: Dict):
+        self.match_info = info
+        self._hello = frame_message(bytes((MSG_HELLO,)) + json.dumps(info).encode("utf-8"))
+        self._previous = []
+        for client in self.clients:
+            client.writer.write(self._hello)
+            client.stale = True
+
+    def _broadcast(self, values: List[int]):
+        delta = frame_message(encode_delta(self._previous, values))
+        self._previous = values
+        self._key = None
+        self.frames_encoded += 1
+        for client in self.clients:
+            transport = client.writer.transport
+            if transport.get_write_buffer_size() > self.high_water:
+                client.stale = True
+                self.frames_skipped += 1
+                continue
+            if client.stale:
+                if self._key is None:
+                    self._key = frame_message(encode_key(values))
+                client.writer.write(self._key)
+                client.stale = False
+            else:
+                client.writer.write(delta)
+
+    async def _on_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if len(self.clients) >= self.max_clients:
+            writer.close()
+            return
+        client = _Spectator(writer)
+        writer.transport.set_write_buffer_limits(high=self.high_water)
+        writer.write(self._hello)
+        self.clients.add(client)
+        try:
+            # Spectators never send anything; EOF means they left
+            while await reader.read(256):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            writer.close()
+
+
+_server: Optional[SpectatorServer] = None
+
+
+def get_spectator_server() -> Optional[SpectatorServer]:
+    """Shared server if C.SPECTATOR_ENABLED, started on first use"""
+    global _server
+    if _server is None and C.SPECTATOR_ENABLED:
+        _server = SpectatorServer()
+        _server.start()
+    return _server
+
+
+# --- Client ---
+
+class SpectatorClient:
+    """Receives the stream on a background thread; state is read by the view"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.match_info: Optional[Dict] = None
+        self.values: Optional[List[int]] = None
+        self.messages = 0
+        self.connected = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()),
+                                        name="spectator-client", daemon=True)
+        self._thread.start()
+
+    async def run(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self.connected = True
+        try:
+            while True:
+                header = await reader.readexactly(_LENGTH.size)
+                payload = await reader.readexactly(_LENGTH.unpack(header)[0])
+                self.feed(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connected = False
+            writer.close()
+
+    def feed(self, payload: bytes):
+        """Apply one message"""
+        self.messages += 1
+        if payload[0] == MSG_HELLO:
+            self.match_info = json.loads(payload[1:].decode("utf-8"))
+            self.values = None
+        else:
+            self.values = apply_message(self.values, payload)
+
+
+def main(argv=None):
+    """Open a window that renders a remote match"""
+    import arcade
+    from ..views.spectator_view import SpectatorView
+    from .lockstep import parse_address
+
+    parser = argparse.ArgumentParser(description="Spectate a match")
+    parser.add_argument("--connect", type=parse_address,
+                        default=("127.0.0.1", C.SPECTATOR_PORT), help="host:port")
+    args = parser.parse_args(argv)
+
+    client = SpectatorClient(*args.connect)
+    client.start()
+    window = arcade.Window(C.WINDOW_WIDTH, C.WINDOW_HEIGHT, f"{C.SCREEN_TITLE} - Spectator")
+    window.show_view(SpectatorView(client))
+    arcade.run()
+
+
+if __name__ == "__main__":
+    main()
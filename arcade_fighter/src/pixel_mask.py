@@ -0,0 +1,105 @@
+import arcade
+from PIL import Image
+from typing import List, Optional, Tuple
+from . import constants as C
+
+Rect = Tuple[int, int, int, int]  # left, bottom, right, top (world pixels)
+
+
+class PixelMask:
+    """
+    Packed 1-bit alpha mask of a frame.
+
+    Each row is one Python int used as an arbitrary-width bit word: the
+    leftmost pixel is the highest bit. Rows run top to bottom. Testing two masks
+    is a shift and an AND per overlapping row.
+    """
+    __slots__ = ("width", "height", "rows")
+
+    def __init__(self, width: int, height: int, rows: List[int]):
+        self.width = width
+        self.height = height
+        self.rows = rows
+
+    @classmethod
+    def from_image(cls, image: Image.Image, scale: float = 1.0,
+                   threshold: int = C.PIXEL_MASK_ALPHA_THRESHOLD) -> "PixelMask":
+        """Build a mask from an RGBA image's alpha channel at the given scale"""
+        alpha = image.getchannel("A")
+        if scale != 1.0:
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            alpha = alpha.resize(size, Image.NEAREST)
+        width, height = alpha.size
+        bits = alpha.point(lambda a: 255 if a >= threshold else 0).convert("1")
+        data = bits.tobytes()
+        stride = (width + 7) // 8
+        pad = stride * 8 - width
+        rows = [
+            int.from_bytes(data[r * stride:(r + 1) * stride], "big") >> pad
+            for r in range(height)
+        ]
+        return cls(width, height, rows)
+
+    def mirrored(self) -> "PixelMask":
+        """Horizontally flipped copy"""
+        width = self.width
+        rows = [int(format(row, f"0{width}b")[::-1], 2) if row else 0 for row in self.rows]
+        return PixelMask(width, self.height, rows)
+
+
+def masks_overlap(a: PixelMask, a_left: int, a_top: int,
+                  b: PixelMask, b_left: int, b_top: int,
+                  window: Optional[Rect] = None) -> bool:
+    """
+    Pixel-exact overlap test between two placed masks (top-left corners in world
+    pixels, y up). Rejects on AABB first, then ANDs the rows of the overlap,
+    optionally clipped to a window such as an attack hitbox.
+    """
+    a_right = a_left + a.width
+    b_right = b_left + b.width
+    a_bottom = a_top - a.height
+    b_bottom = b_top - b.height
+
+    left = max(a_left, b_left)
+    right = min(a_right, b_right)
+    bottom = max(a_bottom, b_bottom)
+    top = min(a_top, b_top)
+    if window is not None:
+        left = max(left, window[0])
+        bottom = max(bottom, window[1])
+        right = min(right, window[2])
+        top = min(top, window[3])
+    if left >= right or bottom >= top:
+        return False
+
+    # Align both masks so bit 0 is the column at `ref` - 1
+    ref = max(a_right, b_right)
+    shift_a = ref - a_right
+    shift_b = ref - b_right
+    span = ((1 << (right - left)) - 1) << (ref - right)
+
+    a_rows, b_rows = a.rows, b.rows
+    a_row = a_top - top
+    b_row = b_top - top
+    for k in range(top - bottom):
+        if (a_rows[a_row + k] << shift_a) & (b_rows[b_row + k] << shift_b) & span:
+            return True
+    return False
+
+
+def build_masks(animations, scale: float):
+    """Masks for every frame of every animation, as (right, left) pairs"""
+    masks = {}
+    for name, frames in animations.items():
+        pairs = []
+        for pair in frames:
+            mask = PixelMask.from_image(pair[C.RIGHT_FACING].image, scale)
+            pairs.append((mask, mask.mirrored()))
+        masks[name] = pairs
+    return masks
+
+
+def sprite_mask_origin(sprite: arcade.Sprite, mask: PixelMask) -> Tuple[int, int]:
+    """World position of a mask's top-left corner for a sprite's current frame"""
+    return (round(sprite.center_x - mask.width / 2),
+            round(sprite.center_y + mask.height / 2))
@@ -0,0 +1,187 @@
+import arcade
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Sequence, Tuple
+from . import constants as C
+from .constants import RIGHT_FACING, LEFT_FACING
+from .roster import load_strip
+
+
+class ProjectilePool:
+    """
+    Fixed-size pool of projectiles drawn from a single SpriteList.
+
+    Every slot owns one preallocated sprite. Per-slot simulation data lives in
+    parallel lists so the per-tick step never allocates. Inactive sprites stay
+    in the list but are hidden, which keeps drawing to one batched call.
+    """
+
+    def __init__(self, capacity: int = C.PROJECTILE_POOL_SIZE,
+                 scale: float = C.PROJECTILE_SCALING):
+        self.capacity = capacity
+        self.stage_width = C.SCREEN_WIDTH  # projectiles past either stage edge are culled
+        self._frames = load_strip(
+            C.ARROW_MOVE_TEXTURE, C.ARROW_FRAME_WIDTH, C.ARROW_FRAME_HEIGHT, C.ARROW_FRAME_COUNT
+        )
+        first = self._frames[0][RIGHT_FACING]
+        self._half_w = first.width * scale / 2
+        self._half_h = first.height * scale / 2
+
+        # Per-slot data
+        self._x = [0.0] * capacity
+        self._y = [0.0] * capacity
+        self._vx = [0.0] * capacity
+        self._vy = [0.0] * capacity
+        self._ttl = [0] * capacity
+        self._owner = [0] * capacity
+        self._damage = [0] * capacity
+        self._facing = [RIGHT_FACING] * capacity
+
+        # Free slots are a stack; active slots are kept sorted by x for the broadphase
+        self._free = list(range(capacity - 1, -1, -1))
+        self._active: List[int] = []
+        self._anim_frame = 0
+        self._anim_ticks = 0
+
+        self.sprite_list = arcade.SpriteList(capacity=capacity)
+        self._sprites = []
+        for _ in range(capacity):
+            sprite = arcade.Sprite(first, scale=scale)
+            sprite.visible = False
+            self._sprites.append(sprite)
+            self.sprite_list.append(sprite)
+
+    @property
+    def active_count(self) -> int:
+        """Number of live projectiles"""
+        return len(self._active)
+
+    def spawn(self, x: float, y: float, vx: float, vy: float, owner: int,
+              damage: int = C.PROJECTILE_DAMAGE,
+              lifetime: int = C.PROJECTILE_LIFETIME) -> int:
+        """
+        Activate a projectile. Returns the slot index, or -1 when the pool is
+        exhausted (the shot is dropped rather than allocating).
+        """
+        if not self._free:
+            return -1
+        i = self._free.pop()
+        self._x[i] = x
+        self._y[i] = y
+        self._vx[i] = vx
+        self._vy[i] = vy
+        self._ttl[i] = lifetime
+        self._owner[i] = owner
+        self._damage[i] = damage
+        facing = LEFT_FACING if vx < 0 else RIGHT_FACING
+        self._facing[i] = facing
+
+        sprite = self._sprites[i]
+        sprite.texture = self._frames[self._anim_frame][facing]
+        sprite.position = (x, y)
+        sprite.visible = True
+        self._active.append(i)
+        return i
+
+    def update(self):
+        """Advance every live projectile by one frame and retire expired ones"""
+        xs, ys, vxs, vys, ttl = self._x, self._y, self._vx, self._vy, self._ttl
+        sprites = self._sprites
+        min_x = -C.PROJECTILE_CULL_MARGIN
+        max_x = self.stage_width + C.PROJECTILE_CULL_MARGIN
+
+        advance_frame = self._step_animation()
+        frame = self._frames[self._anim_frame]
+
+        still_active = []
+        for i in self._active:
+            life = ttl[i] - 1
+            x = xs[i] + vxs[i]
+            if life <= 0 or x < min_x or x > max_x:
+                self._release(i)
+                continue
+            ttl[i] = life
+            y = ys[i] + vys[i]
+            xs[i] = x
+            ys[i] = y
+            sprite = sprites[i]
+            sprite.position = (x, y)
+            if advance_frame:
+                sprite.texture = frame[self._facing[i]]
+            still_active.append(i)
+        self._active = still_active
+
+    def positions(self) -> Iterator[Tuple[float, float, int]]:
+        """(x, y, facing) of every live projectile"""
+        for i in self._active:
+            if self._ttl[i] > 0:
+                yield self._x[i], self._y[i], self._facing[i]
+
+    def show(self, positions: Iterable[Tuple[float, float, int]]):
+        """
+        Display projectiles simulated elsewhere (deterministic mode) from
+        (x, y, facing) tuples. Slots are only used for drawing; nothing is stepped.
+        """
+        self.clear()
+        self._step_animation()
+        for x, y, facing in positions:
+            if self.spawn(x, y, -1 if facing == LEFT_FACING else 1, 0, 0) < 0:
+                break
+
+    def _step_animation(self) -> bool:
+        """Advance the shared arrow animation; True when the frame changed"""
+        self._anim_ticks += 1
+        if self._anim_ticks < C.ARROW_ANIM_TICKS:
+            return False
+        self._anim_ticks = 0
+        self._anim_frame = (self._anim_frame + 1) % len(self._frames)
+        return True
+
+    def collide(self, fighters: Sequence[arcade.Sprite]) -> List[Tuple[arcade.Sprite, int]]:
+        """
+        Find projectiles overlapping fighter hurtboxes using a sorted-axis
+        (sweep-and-prune) broadphase on x. Hit projectiles are retired.
+        Returns a list of (fighter, damage) pairs.
+        """
+        active = self._active
+        if not active or not fighters:
+            return []
+
+        xs, ys, ttl, owner = self._x, self._y, self._ttl, self._owner
+        # Slots barely move between ticks, so this sort is close to linear
+        active.sort(key=xs.__getitem__)
+        keys = [xs[i] for i in active]
+        hw, hh = self._half_w, self._half_h
+
+        hits = []
+        for fighter in fighters:
+            bottom, top = fighter.bottom, fighter.top
+            lo = bisect_left(keys, fighter.left - hw)
+            hi = bisect_right(keys, fighter.right + hw)
+            for k in range(lo, hi):
+                i = active[k]
+                if ttl[i] <= 0 or owner[i] == fighter.player_num:
+                    continue
+                y = ys[i]
+                if y + hh < bottom or y - hh > top:
+                    continue
+                ttl[i] = 0  # Retired on the next update
+                self._sprites[i].visible = False
+                hits.append((fighter, self._damage[i]))
+        return hits
+
+    def clear(self):
+        """Retire every live projectile"""
+        for i in self._active:
+            self._release(i)
+        self._active = []
+
+    def draw(self):
+        """Draw all projectiles in one batched call"""
+        if self._active:
+            self.sprite_list.draw()
+
+    def _release(self, i: int):
+        """Return a slot to the free stack"""
+        self._ttl[i] = 0
+        self._sprites[i].visible = False
+        self._free.append(i)
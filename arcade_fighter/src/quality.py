@@ -0,0 +1,128 @@
+"""
+Adaptive quality: hold the frame-time budget by stepping detail up or down.
+
+Views feed every frame's delta time to observe(). The governor keeps the last
+QUALITY_WINDOW frame times and, once the window is full, compares their
+QUALITY_PERCENTILE to the frame budget (1 / QUALITY_TARGET_FPS):
+- above budget * QUALITY_DOWNGRADE_RATIO steps down at once
+- under budget * QUALITY_UPGRADE_RATIO for QUALITY_UPGRADE_HOLD seconds steps up
+
+After any change the window is cleared, and nothing moves again for
+QUALITY_COOLDOWN seconds. A box hovering around the budget therefore doesn't
+flap between two levels. Each change is written to the event log (EV_QUALITY)
+and to the quality_level gauge, and listeners registered with on_change()
+resize their particle counts, layer counts and pools.
+
+Setting ARCADE_QUALITY pins a level and turns the governor off.
+"""
+import time
+from collections import deque
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+from . import constants as C
+from . import event_log
+from . import metrics
+from .event_log import EV_QUALITY
+
+
+class QualityLevel(NamedTuple):
+    name: str
+    particles: int  # StartView background particles
+    parallax_layers: int  # stage layers drawn, by priority
+    sfx_voices: int  # voices the SFX mixer may use
+    hud_refresh: float  # seconds between HUD text updates (0: every frame)
+    render_scale: float  # internal render resolution relative to the window
+
+
+LEVELS: Tuple[QualityLevel, ...] = tuple(QualityLevel(*level) for level in C.QUALITY_LEVELS)
+
+
+class QualityGovernor:
+    """Steps through quality levels to keep frame times under budget"""
+
+    def __init__(self, levels: Sequence[QualityLevel] = LEVELS,
+                 target_fps: float = C.QUALITY_TARGET_FPS, start: Optional[int] = None,
+                 adaptive: bool = True, clock: Callable[[], float] = time.monotonic):
+        self.levels = tuple(levels)
+        self.budget = 1.0 / target_fps
+        self.index = len(self.levels) - 1 if start is None else start
+        self.adaptive = adaptive
+        self.clock = clock
+        self.frames: "deque[float]" = deque(maxlen=C.QUALITY_WINDOW)
+        self.changes = 0
+        self.last_frame_time = 0.0  # percentile at the last decision, for the HUD
+        self._listeners: List[Callable[[QualityLevel], None]] = []
+        self._hold_until = clock() + C.QUALITY_COOLDOWN  # let loading hitches pass
+        self._good_since: Optional[float] = None
+        metrics.QUALITY_LEVEL.set(self.index)
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.index]
+
+    def on_change(self, listener: Callable[[QualityLevel], None]):
+        """Call listener(level) now and after every change"""
+        self._listeners.append(listener)
+        listener(self.level)
+
+    def remove_listener(self, listener: Callable[[QualityLevel], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def observe(self, frame_time: float):
+        """Record one frame and step the level if the window calls for it"""
+        if not self.adaptive:
+            return
+        self.frames.append(frame_time)
+        now = self.clock()
+        if now < self._hold_until or len(self.frames) < self.frames.maxlen:
+            return
+        ordered = sorted(self.frames)
+        self.last_frame_time = ordered[int(C.QUALITY_PERCENTILE * (len(ordered) - 1))]
+        if self.last_frame_time > self.budget * C.QUALITY_DOWNGRADE_RATIO:
+            self._good_since = None
+            if self.index > 0:
+                self.set_level(self.index - 1)
+        elif self.last_frame_time < self.budget * C.QUALITY_UPGRADE_RATIO:
+            if self._good_since is None:
+                self._good_since = now
+            elif now - self._good_since >= C.QUALITY_UPGRADE_HOLD and self.index < len(self.levels) - 1:
+                self.set_level(self.index + 1)
+        else:
+            self._good_since = None
+
+    def set_level(self, index: int):
+        """Switch level (also used to pin one by hand) and notify listeners"""
+        index = max(0, min(len(self.levels) - 1, index))
+        if index == self.index:
+            return
+        self.index = index
+        self.changes += 1
+        self.frames.clear()
+        self._good_since = None
+        self._hold_until = self.clock() + C.QUALITY_COOLDOWN
+        event_log.emit(EV_QUALITY, 0, index, int(self.last_frame_time * 1e6))
+        metrics.QUALITY_LEVEL.set(index)
+        for listener in list(self._listeners):
+            listener(self.level)
+
+    def describe(self) -> str:
+        """One line for the quality HUD"""
+        mode = "auto" if self.adaptive else "pinned"
+        return (f"Quality: {self.level.name} ({mode})  "
+                f"p{int(C.QUALITY_PERCENTILE * 100)} {self.last_frame_time * 1000:.1f} ms / "
+                f"{self.budget * 1000:.1f} ms  changes: {self.changes}")
+
+
+_governor: Optional[QualityGovernor] = None
+
+
+def get_quality_governor() -> QualityGovernor:
+    """Shared governor; ARCADE_QUALITY=<level name> pins it"""
+    global _governor
+    if _governor is None:
+        names = [level.name for level in LEVELS]
+        if C.QUALITY_PINNED in names:
+            _governor = QualityGovernor(start=names.index(C.QUALITY_PINNED), adaptive=False)
+        else:
+            _governor = QualityGovernor()
+    return _governor
@@ -0,0 +1,115 @@
+"""
+Match recordings.
+
+A replay is the spectator stream written to a file: the HELLO match info, one
+keyframe, then one delta per tick (see net/spectator.py for the encoding). It
+holds everything SpectatorView needs to pose a frame, so it can be played back
+without the simulation, e.g. by frame_export.py. A minute of play is a few
+tens of KB.
+
+File layout:
+    header  b"VFRP", u16 version
+    message u16 length + payload, repeated
+"""
+import json
+import os
+import struct
+import time
+from typing import Dict, List, Optional
+from . import constants as C
+from .net.spectator import (
+    MSG_HELLO, _LENGTH, apply_message, encode_delta, encode_key, frame_message
+)
+
+_MAGIC = b"VFRP"
+_VERSION = 1
+FILE_HEADER = struct.Struct("<4sH")
+
+
+class ReplayRecorder:
+    """Encodes ticks into memory; save() writes the match out in one go"""
+
+    def __init__(self, directory: str = C.REPLAY_DIR):
+        self.directory = directory
+        self.frames = 0
+        self._data = bytearray()
+        self._previous: Optional[List[int]] = None
+
+    def start_match(self, info: Dict):
+        """Begin a new recording (an unsaved one is dropped)"""
+        self._data = bytearray(FILE_HEADER.pack(_MAGIC, _VERSION))
+        self._data += frame_message(bytes((MSG_HELLO,)) + json.dumps(info).encode("utf-8"))
+        self._previous = None
+        self.frames = 0
+
+    def record(self, values: List[int]):
+        """Append one tick of capture_state() values"""
+        if not self._data:
+            return
+        if self._previous is None:
+            self._data += frame_message(encode_key(values))
+        else:
+            self._data += frame_message(encode_delta(self._previous, values))
+        self._previous = values
+        self.frames += 1
+
+    def save(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the recording, by default to a timestamped file; None if empty"""
+        if not self.frames:
+            return None
+        if path is None:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, time.strftime("%Y%m%d-%H%M%S") + ".replay")
+        with open(path, "wb") as f:
+            f.write(self._data)
+        self._data = bytearray()
+        self.frames = 0
+        return path
+
+
+class ReplayReader:
+    """
+    Plays a replay file back one tick per advance().
+    Has the same match_info/values attributes as SpectatorClient, so
+    SpectatorView renders it unchanged.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version = FILE_HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a replay file")
+        self._data = data
+        self._pos = FILE_HEADER.size
+        self.match_info: Optional[Dict] = None
+        self.values: Optional[List[int]] = None
+        self.frame = 0
+
+    def advance(self) -> bool:
+        """Apply messages up to and including the next tick; False at the end"""
+        data = self._data
+        while self._pos < len(data):
+            size = _LENGTH.unpack_from(data, self._pos)[0]
+            start = self._pos + _LENGTH.size
+            payload = data[start:start + size]
+            self._pos = start + size
+            if payload[0] == MSG_HELLO:
+                self.match_info = json.loads(payload[1:].decode("utf-8"))
+                self.values = None
+                continue
+            self.values = apply_message(self.values, payload)
+            self.frame += 1
+            return True
+        return False
+
+
+_recorder: Optional[ReplayRecorder] = None
+
+
+def get_replay_recorder() -> Optional[ReplayRecorder]:
+    """Shared recorder if C.REPLAY_ENABLED"""
+    global _recorder
+    if _recorder is None and C.REPLAY_ENABLED:
+        _recorder = ReplayRecorder()
+    return _recorder
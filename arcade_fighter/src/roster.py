@@ -0,0 +1,236 @@
+import arcade
+import hashlib
+import json
+import os
+from arcade import hitbox
+from typing import Dict, List, Optional, Tuple
+from . import constants as C
+from . import metrics
+from .assets import KIND_TEXTURE, AssetRegistry, get_asset_registry
+from .hitbox_cache import FrameHitbox, file_digest, get_hitbox_cache
+from .pixel_mask import build_masks
+
+TexturePair = Tuple[arcade.Texture, arcade.Texture]
+
+
+def load_strip(file_path: str, frame_width: int, frame_height: int,
+               frame_count: int) -> List[TexturePair]:
+    """
+    Slice a horizontal animation strip into frames.
+    Each frame is returned as a (right facing, left facing) texture pair.
+    Textures get a plain bounding box; real hurtboxes come from the hitbox cache.
+    """
+    sheet = arcade.load_spritesheet(file_path)
+    frames = sheet.get_texture_grid(
+        size=(frame_width, frame_height),
+        columns=frame_count,
+        count=frame_count,
+        hit_box_algorithm=hitbox.algo_bounding_box
+    )
+    return [(frame, frame.flip_horizontally()) for frame in frames]
+
+
+# One decoded animation: frames, hurtboxes and the strip's content digest
+DecodedAnimation = Tuple[List[TexturePair], List[FrameHitbox], bytes]
+
+
+class CharacterManifest:
+    """Frame data for one character pack, read from its manifest.json"""
+
+    def __init__(self, data: dict, pack_dir: str, digest: bytes = b""):
+        self.char_id = data["id"]
+        self.digest = digest  # content hash of the manifest file
+        self.name = data.get("name", self.char_id)
+        self.pack_dir = pack_dir
+        self.sprite_dir = os.path.join(pack_dir, data.get("sprite_dir", "Sprites"))
+        self.frame_width = data["frame_width"]
+        self.frame_height = data["frame_height"]
+        self.scale = data.get("scale", 1.0)
+        self.animations: Dict[str, dict] = data["animations"]
+        self.attacks: List[str] = data.get("attacks", [])
+        self.attack_damage = data.get("attack_damage", 10)
+        self.attack_hitbox = data.get("attack_hitbox", {
+            'width': 60,
+            'height': 100,
+            'offset_x': 40,
+            'offset_y': 0
+        })
+        self.body = data.get("body", {
+            'width': C.FIGHTER_BODY_WIDTH,
+            'height': C.FIGHTER_BODY_HEIGHT
+        })
+
+    @classmethod
+    def from_file(cls, path: str) -> "CharacterManifest":
+        """Parse a manifest file"""
+        with open(path, "rb") as f:
+            raw = f.read()
+        return cls(json.loads(raw.decode("utf-8")), os.path.dirname(path), hashlib.sha1(raw).digest())
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.pack_dir, C.CHARACTER_MANIFEST)
+
+    def animation_path(self, name: str) -> str:
+        """Full path of the strip backing an animation"""
+        return os.path.join(self.sprite_dir, self.animations[name]["file"])
+
+    def decode_animation(self, name: str) -> DecodedAnimation:
+        """Slice one strip and look up its hurtboxes (safe off the main thread)"""
+        path = self.animation_path(name)
+        digest = file_digest(path)
+        frames = load_strip(path, self.frame_width, self.frame_height, self.animations[name]["frames"])
+        hitboxes = get_hitbox_cache().frames_for(path, self.frame_width, self.frame_height, frames, digest)
+        return frames, hitboxes, digest
+
+
+class CharacterAssets:
+    """Decoded animation frames for one character, shared by every sprite using it"""
+
+    def __init__(self, manifest: CharacterManifest):
+        self.manifest = manifest
+        self.animations: Dict[str, List[TexturePair]] = {}
+        # Per-frame hurtbox polygons and AABBs, parallel to self.animations
+        self.hitboxes: Dict[str, List[FrameHitbox]] = {}
+        # Content digest of the strip each animation was decoded from
+        self.digests: Dict[str, bytes] = {}
+        # Packed alpha masks per display scale, built on demand for pixel hit mode
+        self._masks: Dict[float, dict] = {}
+        self.decode()
+
+    def pixel_masks(self, scale: float) -> dict:
+        """Alpha bitmasks of every frame at a display scale (built once per scale)"""
+        masks = self._masks.get(scale)
+        if masks is None:
+            masks = build_masks(self.animations, scale)
+            self._masks[scale] = masks
+        return masks
+
+    @property
+    def resident_bytes(self) -> int:
+        """RGBA bytes of the decoded frames (mirrored frames share their image)"""
+        return sum(pair[C.RIGHT_FACING].width * pair[C.RIGHT_FACING].height * 4
+                   for frames in self.animations.values() for pair in frames)
+
+    def decode(self):
+        """Decode every animation strip listed in the manifest"""
+        self.replace(self.manifest, {name: self.manifest.decode_animation(name)
+                                     for name in self.manifest.animations})
+        get_hitbox_cache().save_if_dirty()
+
+    def replace(self, manifest: CharacterManifest, decoded: Dict[str, DecodedAnimation]):
+        """
+        Swap in a manifest and freshly decoded animations. The dicts are updated
+        in place, so every sprite sharing these assets sees the new frames.
+        """
+        self.manifest = manifest
+        for name, (frames, hitboxes, digest) in decoded.items():
+            self.animations[name] = frames
+            self.hitboxes[name] = hitboxes
+            self.digests[name] = digest
+        for name in [n for n in self.animations if n not in manifest.animations]:
+            del self.animations[name], self.hitboxes[name], self.digests[name]
+        self._masks.clear()
+
+
+class Roster:
+    """
+    Index of every playable character.
+
+    Only manifests are read on construction. Textures are decoded on the first
+    load() of a character and cached, so both sides of a mirror match share them.
+    Decoded characters are tracked by the asset registry, which may unload()
+    one that the current view hasn't used.
+    """
+
+    def __init__(self, root: str = C.CHARACTER_ROOT, registry: Optional[AssetRegistry] = None):
+        self.root = root
+        self.registry = registry or get_asset_registry()
+        self.manifests: Dict[str, CharacterManifest] = {}
+        self._loaded: Dict[str, CharacterAssets] = {}
+        self._scan()
+
+    def _scan(self):
+        """Read every manifest under the roster root"""
+        if not os.path.isdir(self.root):
+            return
+        for pack in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, pack, C.CHARACTER_MANIFEST)
+            if os.path.isfile(path):
+                manifest = CharacterManifest.from_file(path)
+                self.manifests[manifest.char_id] = manifest
+
+    @property
+    def ids(self) -> List[str]:
+        """Character ids in display order"""
+        return list(self.manifests)
+
+    @property
+    def loaded_ids(self) -> List[str]:
+        """Ids of characters whose textures are currently decoded"""
+        return list(self._loaded)
+
+    def manifest(self, char_id: str) -> CharacterManifest:
+        """Get a character's manifest without decoding anything"""
+        return self.manifests[char_id]
+
+    def assets(self, char_id: str) -> Optional[CharacterAssets]:
+        """Decoded assets for a character, or None if it isn't loaded"""
+        return self._loaded.get(char_id)
+
+    def load(self, char_id: str) -> CharacterAssets:
+        """Get decoded assets for a character, decoding them on first use"""
+        assets = self._loaded.get(char_id)
+        if assets is None:
+            metrics.ASSET_CACHE_MISSES.inc()
+            assets = CharacterAssets(self.manifests[char_id])
+            self._loaded[char_id] = assets
+            self._track(char_id, assets)
+        else:
+            metrics.ASSET_CACHE_HITS.inc()
+            self.registry.touch("character:" + char_id)
+        return assets
+
+    def reload(self, char_id: str) -> CharacterAssets:
+        """Re-read a character's manifest and re-decode its strips in place"""
+        manifest = CharacterManifest.from_file(self.manifests[char_id].path)
+        self.manifests[char_id] = manifest
+        assets = self._loaded.get(char_id)
+        if assets is None:
+            return self.load(char_id)
+        assets.manifest = manifest
+        assets.decode()
+        self._track(char_id, assets)
+        return assets
+
+    def apply_reload(self, manifest: CharacterManifest, decoded: Dict[str, DecodedAnimation]):
+        """Install a re-read manifest and any re-decoded strips (see hot_reload.py)"""
+        self.manifests[manifest.char_id] = manifest
+        assets = self._loaded.get(manifest.char_id)
+        if assets is None:
+            return
+        assets.replace(manifest, decoded)
+        self._track(manifest.char_id, assets)
+        get_hitbox_cache().save_if_dirty()
+
+    def unload(self, char_id: str):
+        """Drop decoded textures for a character, keeping its manifest"""
+        if self._loaded.pop(char_id, None) is not None:
+            self.registry.forget("character:" + char_id)
+
+    def _track(self, char_id: str, assets: CharacterAssets):
+        """Report a character's decoded size (its frames sit in the atlas too)"""
+        size = assets.resident_bytes
+        self.registry.track("character:" + char_id, KIND_TEXTURE, size, size,
+                            release=lambda: self.unload(char_id))
+
+
+_roster: Optional[Roster] = None
+
+
+def get_roster() -> Roster:
+    """Shared roster, created on first use"""
+    global _roster
+    if _roster is None:
+        _roster = Roster()
+    return _roster
@@ -0,0 +1,318 @@
+"""
+Scripted gameplay scenarios that record frame-time traces.
+
+Micro-benchmarks miss what only shows up in a running game: GC pauses, text
+re-layout, framebuffer reallocation after a resize. A scenario instead drives
+the real views through the app context in an invisible window, with scripted
+key presses, and times every frame. The frame time runs from event dispatch
+through update, draw and flip to glFinish. GC pauses are timed with
+gc.callbacks and charged to the frame they happen in.
+
+Scenario files live in SCENARIO_DIR:
+    {
+      "name": "match_attacks",
+      "frames": 1800,
+      "actions": [
+        {"at": 0, "do": "match", "characters": ["huntress", "hero_knight"]},
+        {"at": 0, "press": "KEY_RIGHT_P1"},
+        {"every": 10, "from": 30, "until": 900, "tap": "KEY_ATTACK_P1"},
+        {"every": 60, "resize": [[1920, 1080], [800, 600]]}
+      ]
+    }
+Timing is "at" a frame, or "every" n > 0 frames in [from, until). Operations:
+- press, release or tap (press, then release a frame later) a key. Keys are
+  named by a constants KEY_* or an arcade.key attribute.
+- do: menu, select, match (optional "characters") or rematch.
+- resize the window to [w, h].
+- scale the canvas render scale.
+A list of sizes or scales is cycled through, one entry per occurrence. A
+headless window can't change size, so resize then only dispatches on_resize.
+
+The trace is saved compactly to TRACE_DIR/<name>.trace:
+    header  b"VFTR", u16 version, u32 frames
+    frames  u32 frame time in microseconds, repeated
+    gc      u32 GC pause in microseconds per frame, repeated
+Its p50/p95/p99, worst frame and worst GC pause are compared with the stored
+baseline. A statistic regresses when it grows by more than SCENARIO_TOLERANCE
+and by more than SCENARIO_NOISE_MS.
+
+Run every scenario from the repository root (--update-baseline to accept):
+    PYTHONPATH=arcade_fighter python -m src.scenario [name ...]
+"""
+import argparse
+import gc
+import glob
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+import arcade
+from . import constants as C
+
+_MAGIC = b"VFTR"
+_VERSION = 1
+TRACE_HEADER = struct.Struct("<4sHI")
+
+OPERATIONS = ("press", "release", "tap", "do", "resize", "scale")
+COMMANDS = ("menu", "select", "match", "rematch")
+STATS = ("p50", "p95", "p99", "worst", "gc_worst")
+
+
+def key_code(name: str) -> int:
+    """KEY_* constant or arcade.key name to a key code"""
+    code = getattr(C, name, None) if name.startswith("KEY_") else getattr(arcade.key, name, None)
+    if not isinstance(code, int):
+        raise ValueError(f"unknown key {name!r}")
+    return code
+
+
+class FrameTrace:
+    """Per-frame times and GC pauses, in microseconds"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.frame_us = array("I")
+        self.gc_us = array("I")
+
+    def __len__(self) -> int:
+        return len(self.frame_us)
+
+    def add(self, frame_ns: int, gc_ns: int = 0):
+        self.frame_us.append(frame_ns // 1000)
+        self.gc_us.append(gc_ns // 1000)
+
+    def percentile(self, fraction: float) -> float:
+        """Frame time in ms that this fraction of frames stayed within (nearest rank)"""
+        if not self.frame_us:
+            return 0.0
+        ordered = sorted(self.frame_us)
+        rank = max(0, min(len(ordered) - 1, int(fraction * len(ordered) + 0.5) - 1))
+        return ordered[rank] / 1000
+
+    def stats(self) -> Dict[str, float]:
+        worst = max(range(len(self.frame_us)), key=self.frame_us.__getitem__, default=0)
+        return {
+            "frames": len(self),
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "worst": self.frame_us[worst] / 1000 if self.frame_us else 0.0,
+            "worst_frame": worst,
+            "gc_total": sum(self.gc_us) / 1000,
+            "gc_worst": max(self.gc_us, default=0) / 1000,
+            "gc_frames": sum(1 for us in self.gc_us if us),
+        }
+
+    def save(self, path: str):
+        frames, pauses = array("I", self.frame_us), array("I", self.gc_us)
+        if sys.byteorder != "little":
+            frames.byteswap()
+            pauses.byteswap()
+        with open(path, "wb") as f:
+            f.write(TRACE_HEADER.pack(_MAGIC, _VERSION, len(frames)))
+            f.write(frames.tobytes())
+            f.write(pauses.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "FrameTrace":
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, count = TRACE_HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a frame trace")
+        trace = cls(os.path.splitext(os.path.basename(path))[0])
+        start = TRACE_HEADER.size
+        trace.frame_us.frombytes(data[start:start + 4 * count])
+        trace.gc_us.frombytes(data[start + 4 * count:start + 8 * count])
+        if sys.byteorder != "little":
+            trace.frame_us.byteswap()
+            trace.gc_us.byteswap()
+        return trace
+
+
+def compare(stats: Dict[str, float], baseline: Dict[str, float],
+            tolerance: float = C.SCENARIO_TOLERANCE,
+            noise_ms: float = C.SCENARIO_NOISE_MS) -> List[Tuple[str, float, float, bool]]:
+    """(statistic, baseline ms, current ms, regressed) for each compared statistic"""
+    rows = []
+    for key in STATS:
+        if key not in baseline:
+            continue
+        old, new = baseline[key], stats[key]
+        regressed = new > old * (1 + tolerance) and new - old > noise_ms
+        rows.append((key, old, new, regressed))
+    return rows
+
+
+class Scenario:
+    """A scripted run of the views: frame count plus timed actions"""
+
+    def __init__(self, name: str, frames: int, actions: List[Dict]):
+        self.name = name
+        self.frames = frames
+        self.actions = actions
+        for action in actions:
+            self._validate(action)
+
+    @classmethod
+    def from_file(cls, path: str) -> "Scenario":
+        with open(path) as f:
+            data = json.load(f)
+        name = data.get("name") or os.path.splitext(os.path.basename(path))[0]
+        return cls(name, int(data["frames"]), data["actions"])
+
+    @staticmethod
+    def _validate(action: Dict):
+        operations = [op for op in OPERATIONS if op in action]
+        if len(operations) != 1 or ("at" in action) == ("every" in action):
+            raise ValueError(f"action needs one operation and 'at' or 'every': {action}")
+        if "every" in action and not (isinstance(action["every"], int) and action["every"] > 0):
+            raise ValueError(f"'every' must be a positive number of frames: {action}")
+        for key in ("at", "from", "until"):
+            if key in action and not (isinstance(action[key], int) and action[key] >= 0):
+                raise ValueError(f"{key!r} must be a frame number (0 or more): {action}")
+        op = operations[0]
+        if op in ("press", "release", "tap"):
+            key_code(action[op])
+        elif op == "do" and action[op] not in COMMANDS:
+            raise ValueError(f"unknown command {action[op]!r}")
+
+    def due(self, frame: int):
+        """Actions to run on this frame, each with its occurrence number"""
+        for action in self.actions:
+            if "at" in action:
+                if action["at"] == frame:
+                    yield action, 0
+                continue
+            start, every = action.get("from", 0), action["every"]
+            if start <= frame < action.get("until", self.frames) and (frame - start) % every == 0:
+                yield action, (frame - start) // every
+
+    def run(self, window: arcade.Window, clock=time.perf_counter_ns) -> FrameTrace:
+        """Play the script, one timed frame per tick at a fixed 1/60 s step"""
+        from .views.app_context import get_app_context
+        context = get_app_context(window)
+        trace = FrameTrace(self.name)
+        releases: List[int] = []
+        gc_ns = 0
+        gc_started = 0
+
+        def on_gc(phase, _info):
+            nonlocal gc_ns, gc_started
+            if phase == "start":
+                gc_started = clock()
+            else:
+                gc_ns += clock() - gc_started
+
+        gc.collect()
+        gc.callbacks.append(on_gc)
+        try:
+            for frame in range(self.frames):
+                gc_ns = 0
+                started = clock()
+                for key in releases:
+                    window.dispatch_event("on_key_release", key, 0)
+                releases = []
+                for action, occurrence in self.due(frame):
+                    releases += self._apply(window, context, action, occurrence)
+                window.dispatch_event("on_update", 1 / C.SIM_TICK_RATE)
+                window.dispatch_event("on_draw")
+                window.dispatch_events()
+                window.flip()
+                window.ctx.finish()
+                trace.add(clock() - started, gc_ns)
+        finally:
+            gc.callbacks.remove(on_gc)
+        return trace
+
+    @staticmethod
+    def _apply(window: arcade.Window, context, action: Dict, occurrence: int) -> List[int]:
+        """Run one action; returns keys to release on the next frame"""
+        def pick(value):
+            return value[occurrence % len(value)] if isinstance(value, list) else value
+
+        if "do" in action:
+            command = action["do"]
+            if command == "menu":
+                context.show_menu()
+            elif command == "select":
+                context.show_select()
+            elif command == "match":
+                context.start_match(*action.get("characters", ()))
+            else:
+                context.rematch()
+        elif "resize" in action:
+            size = action["resize"]
+            width, height = pick(size) if isinstance(size[0], list) else size
+            window.set_size(width, height)
+            if window.get_size() != (width, height):  # headless windows keep their size
+                window.dispatch_event("on_resize", width, height)
+        elif "scale" in action:
+            from .views.virtual_screen import get_virtual_screen
+            get_virtual_screen(window).set_scale(pick(action["scale"]))
+        else:
+            op = "press" if "press" in action else "release" if "release" in action else "tap"
+            key = key_code(action[op])
+            if op == "release":
+                window.dispatch_event("on_key_release", key, 0)
+            else:
+                window.dispatch_event("on_key_press", key, 0)
+                if op == "tap":
+                    return [key]
+        return []
+
+
+def load_baseline(path: str = C.SCENARIO_BASELINE) -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run scripted scenarios and compare frame-time traces")
+    parser.add_argument("names", nargs="*", help=f"scenario names in {C.SCENARIO_DIR} (default: all)")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    args = parser.parse_args(argv)
+
+    paths = sorted(glob.glob(os.path.join(C.SCENARIO_DIR, "*.json")))
+    if args.names:
+        paths = [p for p in paths if os.path.splitext(os.path.basename(p))[0] in args.names]
+    scenarios = [Scenario.from_file(path) for path in paths]
+    baseline = load_baseline()
+    os.makedirs(C.TRACE_DIR, exist_ok=True)
+
+    window = arcade.Window(C.WINDOW_WIDTH, C.WINDOW_HEIGHT, f"{C.SCREEN_TITLE} - Scenarios", visible=False)
+    regressions = 0
+    try:
+        for scenario in scenarios:
+            trace = scenario.run(window)
+            trace.save(os.path.join(C.TRACE_DIR, scenario.name + ".trace"))
+            stats = trace.stats()
+            print(f"{scenario.name}: {stats['frames']} frames, p50 {stats['p50']:.2f} ms, "
+                  f"p95 {stats['p95']:.2f}, p99 {stats['p99']:.2f}, worst {stats['worst']:.2f} "
+                  f"(frame {stats['worst_frame']}), GC {stats['gc_total']:.2f} ms "
+                  f"in {stats['gc_frames']} frames, worst {stats['gc_worst']:.2f}")
+            for key, old, new, regressed in compare(stats, baseline.get(scenario.name, {})):
+                change = (new - old) / old * 100 if old else 0.0
+                print(f"    {key:<9} {old:8.2f} -> {new:8.2f} ms  {change:+6.1f}%"
+                      + ("  REGRESSION" if regressed else ""))
+                regressions += regressed
+            if args.update_baseline:
+                baseline[scenario.name] = stats
+    finally:
+        window.close()
+
+    if args.update_baseline:
+        with open(C.SCENARIO_BASELINE, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline written to {C.SCENARIO_BASELINE}")
+    elif regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Sound effects through a fixed pool of reusable players.
+
+preload() decodes every effect into a static in-memory buffer at match start,
+so play() never touches the disk or a decoder. The pool holds C.SFX_VOICES
+pyglet players, all created up front. A voice keeps its last effect queued
+with looping on, and update() pauses it once the effect has had its length.
+Replaying the same effect is then just a seek to zero. pyglet never reaches
+end of stream, which is where it would free the driver-side player.
+
+play() takes an idle voice, preferring one already holding the effect. If the
+effect is at its voice limit, or every voice is busy, the oldest suitable voice
+is stolen and restarted. Spamming attacks therefore never allocates. Effects
+marked to duck lower the music through the on_duck hook while they play.
+"""
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import arcade
+import pyglet.media
+from . import constants as C
+from . import metrics
+from .assets import KIND_AUDIO, get_asset_registry, sound_bytes
+
+
+class Effect:
+    """A preloaded effect and its mixing rules"""
+    __slots__ = ("name", "sound", "length", "max_voices", "ducks")
+
+    def __init__(self, name: str, sound: arcade.Sound, max_voices: int, ducks: bool):
+        self.name = name
+        self.sound = sound
+        self.length = sound.get_length()
+        self.max_voices = max(1, max_voices)
+        self.ducks = ducks
+
+
+class Voice:
+    """One pooled player; keeps its last effect queued so replays are a seek"""
+    __slots__ = ("player", "effect", "started", "ends")
+
+    def __init__(self):
+        self.player = pyglet.media.Player()
+        self.player.loop = True  # never hit end-of-stream; update() pauses instead
+        self.effect: Optional[Effect] = None
+        self.started = 0.0
+        self.ends = 0.0
+
+    def active(self, now: float) -> bool:
+        return self.effect is not None and now < self.ends
+
+    def start(self, effect: Effect, volume: float, now: float):
+        player = self.player
+        if effect is self.effect:
+            player.seek(0.0)
+        else:
+            player.queue(effect.sound.source)
+            if self.effect is not None:
+                player.next_source()  # same audio format reuses the driver player
+            self.effect = effect
+        player.volume = volume
+        player.play()
+        self.started = now
+        self.ends = now + effect.length
+
+    def stop(self):
+        self.player.pause()
+        self.ends = 0.0
+
+
+class SfxMixer:
+    """Preloaded effects played through a fixed voice pool"""
+
+    def __init__(self, voices: int = C.SFX_VOICES, volume: float = C.SFX_VOLUME,
+                 clock: Callable[[], float] = time.monotonic):
+        self.voices: List[Voice] = [Voice() for _ in range(voices)]
+        self.limit = voices  # voices play() may use; lowered by the quality governor
+        self.effects: Dict[str, Effect] = {}
+        self.volume = volume
+        self.clock = clock
+        # Called with a music gain in [0, 1] whenever ducking changes it
+        self.on_duck: Optional[Callable[[float], None]] = None
+        self.duck_gain = 1.0
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0  # play() calls for effects that were never preloaded
+
+    def preload(self, effects: Dict[str, Tuple[str, int, bool]] = C.SFX_SOUNDS):
+        """Decode effects (name -> (file, max voices, ducks)) that aren't loaded yet"""
+        for name, (path, max_voices, ducks) in effects.items():
+            if name in self.effects:
+                continue
+            metrics.ASSET_CACHE_MISSES.inc()
+            sound = arcade.load_sound(path, streaming=False)
+            self.effects[name] = Effect(name, sound, max_voices, ducks)
+            # Pinned: effects are small and play() must never find one missing
+            get_asset_registry().track("sfx:" + name, KIND_AUDIO, sound_bytes(sound), pinned=True)
+
+    def play(self, name: str, volume: float = 1.0) -> Optional[Voice]:
+        """Start an effect, stealing a voice if needed. Never allocates a player"""
+        effect = self.effects.get(name)
+        if effect is None:
+            self.dropped += 1
+            return None
+        now = self.clock()
+        pool = self.voices[:self.limit]
+        same = [v for v in pool if v.effect is effect and v.active(now)]
+        if len(same) >= effect.max_voices:
+            voice = min(same, key=_age)
+            self.stolen += 1
+        else:
+            idle = [v for v in pool if not v.active(now)]
+            if idle:
+                # Prefer a voice already holding this effect: replaying it is just a seek
+                voice = next((v for v in idle if v.effect is effect), idle[0])
+            else:
+                voice = min(pool, key=_age)
+                self.stolen += 1
+        voice.start(effect, volume * self.volume, now)
+        self.played += 1
+        if effect.ducks:
+            self._set_duck(C.SFX_DUCK_GAIN)
+        return voice
+
+    def update(self, delta_time: float):
+        """Pause finished voices and release the music duck"""
+        now = self.clock()
+        ducking = False
+        for voice in self.voices:
+            if voice.effect is None or voice.ends == 0.0:
+                continue
+            if now >= voice.ends:
+                voice.stop()
+            elif voice.effect.ducks:
+                ducking = True
+        if not ducking and self.duck_gain < 1.0:
+            step = delta_time / C.SFX_DUCK_RELEASE if C.SFX_DUCK_RELEASE > 0 else 1.0
+            self._set_duck(min(1.0, self.duck_gain + step))
+
+    def set_voice_limit(self, voices: int):
+        """Play through only the first `voices` players; the rest are stopped, not freed"""
+        self.limit = max(1, min(len(self.voices), voices))
+        for voice in self.voices[self.limit:]:
+            voice.stop()
+
+    def active_voices(self) -> int:
+        now = self.clock()
+        return sum(1 for voice in self.voices if voice.active(now))
+
+    def stop_all(self):
+        for voice in self.voices:
+            voice.stop()
+        self._set_duck(1.0)
+
+    def _set_duck(self, gain: float):
+        if gain != self.duck_gain:
+            self.duck_gain = gain
+            if self.on_duck:
+                self.on_duck(gain)
+
+
+def _age(voice: Voice) -> float:
+    return voice.started
+
+
+_mixer: Optional[SfxMixer] = None
+
+
+def get_sfx_mixer() -> SfxMixer:
+    """Shared mixer, created on first use"""
+    global _mixer
+    if _mixer is None:
+        _mixer = SfxMixer()
+    return _mixer
@@ -0,0 +1,313 @@
+"""
+Deterministic match simulation.
+
+Everything that decides a match is an int: positions and velocities are in
+1/SUBPIXEL pixel units, timers count whole ticks, and randomness comes from a
+per-match seeded xorshift generator. Two machines that step the same seed with
+the same per-tick inputs reach bit-identical state, which checksum() verifies
+(packing the state as 64-bit ints also fails loudly if a float ever sneaks in).
+"""
+import struct
+import zlib
+from typing import List, Optional, Sequence, Tuple
+from . import constants as C
+from .constants import RIGHT_FACING, STATE_ATTACKING, STATE_DEAD
+from .fighter_state import CAN_MOVE, FighterState
+from .roster import CharacterManifest, Roster, get_roster
+
+# Input bits, one byte per player per tick
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+INPUT_ATTACK = 8
+INPUT_SPECIAL = 16
+INPUT_BITS = 5  # bits actually used, for packing inputs on the wire
+
+SUB = C.SUBPIXEL
+
+Hit = Tuple[int, int, int]  # attacker player, defender player, damage
+
+
+def to_ticks(seconds: float) -> int:
+    """Convert a duration in seconds to a whole number of ticks (at least one)"""
+    return max(1, round(seconds * C.SIM_TICK_RATE))
+
+
+class XorShift32:
+    """Small seeded PRNG whose whole state is one 32-bit int"""
+    __slots__ = ("state",)
+
+    def __init__(self, seed: int):
+        self.state = (seed & 0xFFFFFFFF) or 0x9E3779B9  # zero would lock at zero
+
+    def next(self) -> int:
+        x = self.state
+        x ^= (x << 13) & 0xFFFFFFFF
+        x ^= x >> 17
+        x ^= (x << 5) & 0xFFFFFFFF
+        self.state = x
+        return x
+
+    def randint(self, low: int, high: int) -> int:
+        """Integer in [low, high]"""
+        return low + self.next() % (high - low + 1)
+
+
+class SimFighter(FighterState):
+    """
+    FighterState with integer body position and velocity.
+    x is the body centre, y the feet; both in subpixels. Timers are in ticks.
+    """
+    __slots__ = ("x", "y", "vx", "vy", "prev_input",
+                 "attack_damage", "attack_box", "body_width", "body_height")
+
+    def __init__(self, player_num: int, manifest: CharacterManifest):
+        super().__init__(player_num, len(manifest.attacks))
+        self.attack_duration = to_ticks(C.ATTACK_DURATION)
+        self.attack_cooldown_time = to_ticks(C.ATTACK_COOLDOWN)
+        self.special_cooldown_time = to_ticks(C.SPECIAL_COOLDOWN)
+        self.hit_stun_time = to_ticks(C.HIT_STUN_DURATION)
+        self.apply_manifest(manifest)
+        self.x = self.y = self.vx = self.vy = 0
+        self.prev_input = 0
+
+    def apply_manifest(self, manifest: CharacterManifest):
+        """Frame data from a character manifest, in integer units"""
+        self.attack_count = max(1, len(manifest.attacks))
+        self.attack_damage = int(manifest.attack_damage)
+        box = manifest.attack_hitbox
+        self.attack_box = tuple(int(box[k]) * SUB for k in ("width", "height", "offset_x", "offset_y"))
+        self.body_width = int(manifest.body["width"]) * SUB
+        self.body_height = int(manifest.body["height"]) * SUB
+
+
+class MatchSimulation:
+    """
+    One match between two fighters, advanced with step(inputs).
+
+    Mirrors GameView's rules (physics, push-apart, attacks, projectiles, rounds)
+    without sprites, so it runs headless and identically on every machine.
+    """
+
+    def __init__(self, p1_character: Optional[str] = None, p2_character: Optional[str] = None,
+                 seed: int = 0, roster: Optional[Roster] = None,
+                 rounds_to_win: int = C.ROUNDS_TO_WIN):
+        roster = roster or get_roster()
+        self.seed = seed
+        self.rng = XorShift32(seed)
+        self.fighters = [
+            SimFighter(1, roster.manifest(p1_character or C.DEFAULT_CHARACTER)),
+            SimFighter(2, roster.manifest(p2_character or C.DEFAULT_CHARACTER)),
+        ]
+        self.rounds_to_win = rounds_to_win
+
+        self.width = C.SIM_STAGE_WIDTH * SUB
+        self.floor = C.FLOOR_TOP * SUB
+        self.gravity = round(C.GRAVITY * SUB)
+        self.move_speed = C.PLAYER_MOVEMENT_SPEED * SUB
+        self.jump_speed = C.PLAYER_JUMP_SPEED * SUB
+        self.active_ticks = to_ticks(C.ATTACK_ACTIVE_WINDOW)
+
+        # Projectiles as parallel int lists with a free-slot stack, like ProjectilePool
+        capacity = C.PROJECTILE_POOL_SIZE
+        self._px = [0] * capacity
+        self._py = [0] * capacity
+        self._pvx = [0] * capacity
+        self._pvy = [0] * capacity
+        self._pttl = [0] * capacity
+        self._powner = [0] * capacity
+        self._free = list(range(capacity - 1, -1, -1))
+        self.projectiles: List[int] = []  # live slots in spawn order
+
+        self.frame = 0
+        self.round_number = 1
+        self.rounds_won = [0, 0]
+        self.round_winner = 0  # set only on the tick a round ends
+        self.match_winner = 0
+        self.hits: List[Hit] = []  # hits landed during the last step
+        self.reset_round()
+
+    def reset_round(self):
+        """Put both fighters back on their start marks"""
+        for fighter, x in zip(self.fighters, (self.width // 4, self.width * 3 // 4)):
+            fighter.reset()
+            fighter.x = x
+            fighter.y = self.floor
+            fighter.vx = fighter.vy = 0
+            fighter.is_on_ground = True
+        self.fighters[1].facing = C.LEFT_FACING
+        self._free.extend(reversed(self.projectiles))
+        self.projectiles = []
+
+    def step(self, inputs: Sequence[int]):
+        """Advance one tick with one input byte per player"""
+        self.frame += 1
+        self.round_winner = 0
+        self.hits = []
+        if self.match_winner:
+            return
+        f1, f2 = self.fighters
+        self._apply_input(f1, inputs[0])
+        self._apply_input(f2, inputs[1])
+        self._move(f1)
+        self._move(f2)
+        self._separate(f1, f2)
+        for fighter in self.fighters:
+            if fighter.tick(1, fighter.vx, fighter.vy):
+                fighter.vx = 0
+        self._check_attack(f1, f2)
+        self._check_attack(f2, f1)
+        self._step_projectiles()
+        self._check_round_end()
+
+    def _apply_input(self, fighter: SimFighter, bits: int):
+        """Held bits steer; jump, attack and special trigger on the press"""
+        pressed = bits & ~fighter.prev_input
+        fighter.prev_input = bits
+        if fighter.state == STATE_DEAD:
+            fighter.vx = 0
+            return
+        direction = (1 if bits & INPUT_RIGHT else 0) - (1 if bits & INPUT_LEFT else 0)
+        fighter.vx = direction * self.move_speed if CAN_MOVE[fighter.state] else 0
+        fighter.face(fighter.vx)
+        if pressed & INPUT_JUMP and fighter.start_jump():
+            fighter.vy = self.jump_speed
+        if pressed & INPUT_ATTACK:
+            fighter.start_attack()
+        if pressed & INPUT_SPECIAL and fighter.start_special():
+            self._fire(fighter)
+
+    def _move(self, fighter: SimFighter):
+        """Gravity, integration and floor/wall contact"""
+        fighter.vy -= self.gravity
+        fighter.x += fighter.vx
+        fighter.y += fighter.vy
+        if fighter.y <= self.floor:
+            fighter.y = self.floor
+            fighter.vy = 0
+            fighter.is_on_ground = True
+        else:
+            fighter.is_on_ground = False
+        half = fighter.body_width // 2
+        fighter.x = max(half, min(self.width - half, fighter.x))
+
+    def _separate(self, a: SimFighter, b: SimFighter):
+        """Push overlapping bodies apart, half each"""
+        if a.y >= b.y + b.body_height or b.y >= a.y + a.body_height:
+            return
+        overlap = (a.body_width + b.body_width) // 2 - abs(a.x - b.x)
+        if overlap <= 0:
+            return
+        push = overlap // 2
+        if a.x <= b.x:
+            a.x -= push
+            b.x += overlap - push
+        else:
+            a.x += push
+            b.x -= overlap - push
+
+    def _check_attack(self, attacker: SimFighter, defender: SimFighter):
+        """Same window and box rules as GameView.check_attack, in subpixels"""
+        if attacker.state != STATE_ATTACKING or attacker.has_hit:
+            return
+        if attacker.state_timer <= attacker.attack_duration - self.active_ticks:
+            return
+        width, height, offset_x, offset_y = attacker.attack_box
+        if attacker.facing == RIGHT_FACING:
+            center_x = attacker.x + offset_x
+        else:
+            center_x = attacker.x - offset_x
+        center_y = attacker.y + attacker.body_height // 2 + offset_y
+        left = center_x - width // 2
+        bottom = center_y - height // 2
+        d_left = defender.x - defender.body_width // 2
+        if (left + width < d_left or left > d_left + defender.body_width
+                or bottom + height < defender.y or bottom > defender.y + defender.body_height):
+            return
+        attacker.has_hit = True
+        if defender.apply_damage(attacker.attack_damage):
+            self.hits.append((attacker.player_num, defender.player_num, attacker.attack_damage))
+
+    def _fire(self, fighter: SimFighter):
+        """Fan of arrows with a little seeded jitter, like GameView.fire_special"""
+        direction = 1 if fighter.facing == RIGHT_FACING else -1
+        x = fighter.x + direction * C.PROJECTILE_MUZZLE_OFFSET * SUB
+        y = fighter.y + fighter.body_height // 2
+        vx = direction * C.PROJECTILE_SPEED * SUB
+        count = C.PROJECTILE_VOLLEY_SIZE
+        step = round(C.PROJECTILE_SPREAD * SUB)
+        jitter = C.PROJECTILE_JITTER
+        for n in range(count):
+            if not self._free:
+                return
+            i = self._free.pop()
+            self._px[i] = x
+            self._py[i] = y
+            self._pvx[i] = vx
+            self._pvy[i] = (2 * n - (count - 1)) * step // 2 + self.rng.randint(-jitter, jitter)
+            self._pttl[i] = C.PROJECTILE_LIFETIME
+            self._powner[i] = fighter.player_num
+            self.projectiles.append(i)
+
+    def _step_projectiles(self):
+        """Move arrows and hit the opposing fighter's body"""
+        margin = C.PROJECTILE_CULL_MARGIN * SUB
+        live = []
+        for i in self.projectiles:
+            self._px[i] += self._pvx[i]
+            self._py[i] += self._pvy[i]
+            self._pttl[i] -= 1
+            x, y = self._px[i], self._py[i]
+            if self._pttl[i] <= 0 or x < -margin or x > self.width + margin:
+                self._free.append(i)
+                continue
+            target = self.fighters[2 - self._powner[i]]
+            half = target.body_width // 2
+            if (target.x - half <= x <= target.x + half
+                    and target.y <= y <= target.y + target.body_height):
+                if target.apply_damage(C.PROJECTILE_DAMAGE):
+                    self.hits.append((self._powner[i], target.player_num, C.PROJECTILE_DAMAGE))
+                self._free.append(i)
+                continue
+            live.append(i)
+        self.projectiles = live
+
+    def _check_round_end(self):
+        f1, f2 = self.fighters
+        if f1.hp <= 0:
+            winner = 2
+        elif f2.hp <= 0:
+            winner = 1
+        else:
+            return
+        self.rounds_won[winner - 1] += 1
+        self.round_winner = winner
+        if self.rounds_won[winner - 1] >= self.rounds_to_win:
+            self.match_winner = winner
+        else:
+            self.round_number += 1
+            self.reset_round()
+
+    def projectile_positions(self):
+        """(x, y, facing) of each live arrow in pixels, for drawing"""
+        for i in self.projectiles:
+            facing = RIGHT_FACING if self._pvx[i] > 0 else C.LEFT_FACING
+            yield self._px[i] / SUB, self._py[i] / SUB, facing
+
+    def state_values(self) -> List[int]:
+        """Every value that decides the match, in a fixed order"""
+        values = [self.frame, self.rng.state, self.round_number,
+                  self.rounds_won[0], self.rounds_won[1], self.match_winner]
+        for f in self.fighters:
+            values += (f.x, f.y, f.vx, f.vy, f.hp, f.state, f.facing, f.state_timer,
+                       f.attack_cooldown, f.special_cooldown, f.attack_index,
+                       f.has_hit, f.is_on_ground, f.prev_input)
+        for i in self.projectiles:
+            values += (self._px[i], self._py[i], self._pvx[i], self._pvy[i],
+                       self._pttl[i], self._powner[i])
+        return values
+
+    def checksum(self) -> int:
+        """CRC32 of the packed state; equal on every peer while in sync"""
+        values = self.state_values()
+        return zlib.crc32(struct.pack(f"<{len(values)}q", *values))
@@ -0,0 +1,402 @@
+"""
+Soak testing: long randomized runs of the match rules, without a display.
+
+A soak plays MatchSimulation matches back to back for millions of ticks. Each
+fighter is driven by an input strategy picked per match from a seeded
+XorShift32. The strategies are random button holds plus a few adversarial
+patterns: rushing the opponent into the corner, turtling against the wall,
+and mashing on alternate frames. After every tick the state is checked:
+- hp stays in [0, max_hp], and a dead fighter has 0 hp
+- state is a valid STATE_* value
+- each fighter's centre stays within the stage, [0, SIM_STAGE_WIDTH]
+- no fighter stays in STATE_HIT longer than its hit stun without a new hit
+- every projectile slot is either live or free (no leaked slots)
+
+There are two performance envelopes. Each tick's step time goes into a
+microsecond histogram, and its p99 must stay under SOAK_TICK_BUDGET_US.
+After the first match, the Python heap (allocated blocks, counted after a
+collection) may not grow by more than SOAK_MEMORY_BLOCKS.
+
+A match that breaks an invariant is kept as a SoakCase: characters, seed and
+the input byte of each player for every tick. shrink() then replays the case
+with ticks removed and buttons released. Any edit after which the same
+invariant still breaks is kept, so what remains is a short log that still
+reproduces the failure. These logs are written to SOAK_DIR as JSON.
+
+Soaks are split across processes, one per core by default. From the
+repository root:
+    PYTHONPATH=arcade_fighter python -m src.soak --ticks 10000000
+    PYTHONPATH=arcade_fighter python -m src.soak --replay arcade_fighter/soak/<case>.json
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from . import constants as C
+from .constants import STATE_DEAD, STATE_HIT, STATE_NAMES
+from .roster import get_roster
+from .simulation import (
+    INPUT_ATTACK, INPUT_JUMP, INPUT_LEFT, INPUT_RIGHT, INPUT_SPECIAL, SUB,
+    MatchSimulation, XorShift32
+)
+
+Violation = Tuple[str, str]  # invariant name, details
+Strategy = Callable[[MatchSimulation, int, XorShift32], int]
+
+INPUT_MASK = INPUT_LEFT | INPUT_RIGHT | INPUT_JUMP | INPUT_ATTACK | INPUT_SPECIAL
+_BUTTONS = (INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_ATTACK, INPUT_SPECIAL)
+_HISTOGRAM_US = 10000  # slower ticks share the last bucket
+_CLOSE = 200 * SUB  # distance at which turtling fighters react
+
+
+# --- Input strategies: (sim, fighter index, rng) -> input byte ---
+
+def _toward(sim: MatchSimulation, i: int) -> int:
+    return INPUT_RIGHT if sim.fighters[1 - i].x > sim.fighters[i].x else INPUT_LEFT
+
+
+def random_input(sim: MatchSimulation, i: int, rng: XorShift32) -> int:
+    """Hold the previous buttons, now and then switch to a random set"""
+    if rng.next() & 7:
+        return sim.fighters[i].prev_input
+    return rng.next() & INPUT_MASK
+
+
+def mash_input(sim: MatchSimulation, i: int, rng: XorShift32) -> int:
+    """Attack and special pressed on every other tick, random direction"""
+    bits = INPUT_ATTACK | INPUT_SPECIAL if sim.frame & 1 else 0
+    return bits | (rng.next() & (INPUT_LEFT | INPUT_RIGHT))
+
+
+def rush_input(sim: MatchSimulation, i: int, rng: XorShift32) -> int:
+    """Walk into the opponent and attack whenever in reach, pinning them in the corner"""
+    me, other = sim.fighters[i], sim.fighters[1 - i]
+    width, _, offset_x, _ = me.attack_box
+    bits = _toward(sim, i)
+    if abs(other.x - me.x) <= offset_x + (width + other.body_width) // 2 and sim.frame & 1:
+        bits |= INPUT_ATTACK
+    if rng.next() & 63 == 0:
+        bits |= INPUT_JUMP
+    return bits
+
+
+def turtle_input(sim: MatchSimulation, i: int, rng: XorShift32) -> int:
+    """Back into the wall; jump or shoot when the opponent closes in"""
+    me, other = sim.fighters[i], sim.fighters[1 - i]
+    bits = (INPUT_LEFT | INPUT_RIGHT) ^ _toward(sim, i)
+    if abs(other.x - me.x) < _CLOSE:
+        bits |= INPUT_JUMP if rng.next() & 1 else INPUT_SPECIAL
+    return bits
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "random": random_input,
+    "mash": mash_input,
+    "rush": rush_input,
+    "turtle": turtle_input,
+}
+
+
+# --- Invariants ---
+
+class InvariantChecker:
+    """Checks one match after every step; keeps the hit-stun run lengths"""
+
+    def __init__(self):
+        self.hit_ticks = [0, 0]  # ticks in STATE_HIT since the last hit landed
+
+    def __call__(self, sim: MatchSimulation) -> Optional[Violation]:
+        struck = {defender for _, defender, _ in sim.hits}
+        for i, f in enumerate(sim.fighters):
+            name = f"P{f.player_num}"
+            if not 0 <= f.hp <= f.max_hp:
+                return "hp", f"{name} hp {f.hp} outside [0, {f.max_hp}]"
+            if f.state == STATE_DEAD and f.hp:
+                return "hp", f"{name} dead with {f.hp} hp"
+            if not 0 <= f.state < len(STATE_NAMES):
+                return "state", f"{name} in unknown state {f.state}"
+            if not 0 <= f.x <= sim.width:
+                return "bounds", f"{name} at x {f.x / SUB:.2f} outside [0, {sim.width // SUB}]"
+            if f.state != STATE_HIT or f.player_num in struck:
+                self.hit_ticks[i] = 0
+            else:
+                self.hit_ticks[i] += 1
+                if self.hit_ticks[i] > f.hit_stun_time:
+                    return "stuck_hit", f"{name} in hit stun for {self.hit_ticks[i]} ticks"
+        live, free = len(sim.projectiles), len(sim._free)
+        if live + free != C.PROJECTILE_POOL_SIZE or len(set(sim.projectiles)) != live:
+            return "projectiles", f"{live} live + {free} free slots of {C.PROJECTILE_POOL_SIZE}"
+        return None
+
+
+# --- Reproducible cases ---
+
+class SoakCase:
+    """A match to replay: characters, seed and one input byte per player per tick"""
+
+    def __init__(self, p1_character: str, p2_character: str, seed: int, inputs: bytes = b""):
+        self.p1_character = p1_character
+        self.p2_character = p2_character
+        self.seed = seed
+        self.inputs = bytes(inputs)  # p1, p2, p1, p2, ...
+
+    @property
+    def ticks(self) -> int:
+        return len(self.inputs) // 2
+
+    def with_inputs(self, inputs: bytes) -> "SoakCase":
+        return SoakCase(self.p1_character, self.p2_character, self.seed, inputs)
+
+    def play(self, checker=InvariantChecker) -> Optional[Tuple[int, Violation]]:
+        """Replay the inputs; (tick, violation) for the first broken invariant"""
+        sim = MatchSimulation(self.p1_character, self.p2_character, seed=self.seed)
+        check = checker()
+        inputs = self.inputs
+        for offset in range(0, len(inputs) - 1, 2):
+            sim.step(inputs[offset:offset + 2])
+            violation = check(sim)
+            if violation:
+                return offset // 2, violation
+        return None
+
+    def to_json(self) -> Dict:
+        return {
+            "characters": [self.p1_character, self.p2_character],
+            "seed": self.seed,
+            "inputs": [list(self.inputs[0::2]), list(self.inputs[1::2])],
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "SoakCase":
+        p1, p2 = data["inputs"]
+        inputs = bytes(b for pair in zip(p1, p2) for b in pair)
+        return cls(data["characters"][0], data["characters"][1], data["seed"], inputs)
+
+    def save(self, path: str, violation: Optional[Violation] = None):
+        data = self.to_json()
+        if violation:
+            data["invariant"], data["details"] = violation
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str) -> "SoakCase":
+        with open(path) as f:
+            return cls.from_json(json.load(f))
+
+
+def shrink(case: SoakCase, checker=InvariantChecker, max_runs: int = C.SOAK_SHRINK_RUNS) -> SoakCase:
+    """
+    Smallest input log found that still breaks the same invariant.
+    Drops runs of ticks, then releases runs of buttons (halving the run length
+    each pass), then releases single buttons. Stops after max_runs replays.
+    """
+    found = case.play(checker)
+    if found is None:
+        return case
+    tick, (invariant, _) = found
+    inputs = case.inputs[:2 * (tick + 1)]
+    runs = 0
+
+    def attempt(candidate: bytes) -> bool:
+        nonlocal inputs, runs
+        if runs >= max_runs or candidate == inputs or len(candidate) < 2:
+            return False
+        runs += 1
+        result = case.with_inputs(candidate).play(checker)
+        if result is None or result[1][0] != invariant:
+            return False
+        inputs = candidate[:2 * (result[0] + 1)]  # anything after the failure is noise
+        return True
+
+    def drop(start: int, size: int) -> bytes:
+        return inputs[:2 * start] + inputs[2 * (start + size):]
+
+    def release(start: int, size: int) -> bytes:
+        return inputs[:2 * start] + bytes(2 * size) + inputs[2 * (start + size):]
+
+    for edit in (drop, release):
+        size = max(1, len(inputs) // 4)
+        while size and runs < max_runs:
+            start = 0
+            while start < len(inputs) // 2 and runs < max_runs:
+                # A successful drop shifts the next run into place; otherwise move on
+                if not attempt(edit(start, min(size, len(inputs) // 2 - start))) or edit is release:
+                    start += size
+            size //= 2
+
+    for offset in range(len(inputs)):
+        for button in _BUTTONS:
+            if offset < len(inputs) and inputs[offset] & button:
+                candidate = bytearray(inputs)
+                candidate[offset] &= ~button
+                attempt(bytes(candidate))
+    return case.with_inputs(inputs)
+
+
+# --- Soak runs ---
+
+class SoakResult:
+    """What a soak saw; results of parallel workers add up with merge()"""
+
+    def __init__(self):
+        self.ticks = 0
+        self.matches = 0
+        self.elapsed = 0.0
+        self.histogram = [0] * (_HISTOGRAM_US + 1)  # step time in whole microseconds
+        self.max_tick_ns = 0
+        self.heap_growth = 0  # allocated blocks gained since the first match ended
+        self.failures: List[Tuple[Violation, SoakCase]] = []
+
+    def percentile(self, fraction: float) -> int:
+        """Step time in microseconds that this fraction of ticks stayed within"""
+        target = fraction * self.ticks
+        seen = 0
+        for us, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return us
+        return 0
+
+    def merge(self, other: "SoakResult"):
+        self.ticks += other.ticks
+        self.matches += other.matches
+        self.elapsed = max(self.elapsed, other.elapsed)  # workers run side by side
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        self.max_tick_ns = max(self.max_tick_ns, other.max_tick_ns)
+        self.heap_growth = max(self.heap_growth, other.heap_growth)
+        self.failures += other.failures
+
+    def problems(self, tick_budget_us: int = C.SOAK_TICK_BUDGET_US,
+                 memory_blocks: int = C.SOAK_MEMORY_BLOCKS) -> List[str]:
+        """Broken invariants and envelopes, one line each; empty if the soak passed"""
+        lines = [f"{name}: {details}" for (name, details), _ in self.failures]
+        p99 = self.percentile(0.99)
+        if p99 > tick_budget_us:
+            lines.append(f"time: p99 tick {p99} us over the {tick_budget_us} us budget")
+        if self.heap_growth > memory_blocks:
+            lines.append(f"memory: heap grew by {self.heap_growth} blocks (limit {memory_blocks})")
+        return lines
+
+
+def soak(ticks: int, seed: int = 0, characters: Optional[Sequence[str]] = None,
+         clock=time.perf_counter_ns) -> SoakResult:
+    """Play matches back to back for `ticks` ticks, checking every tick"""
+    characters = list(characters or get_roster().ids)
+    strategies = list(STRATEGIES.values())
+    rng = XorShift32(seed)
+    result = SoakResult()
+    histogram = result.histogram
+    baseline = None
+    started = time.perf_counter()
+
+    while result.ticks < ticks:
+        case = SoakCase(characters[rng.next() % len(characters)],
+                        characters[rng.next() % len(characters)], rng.next())
+        drive = (strategies[rng.next() % len(strategies)], strategies[rng.next() % len(strategies)])
+        sim = MatchSimulation(case.p1_character, case.p2_character, seed=case.seed)
+        check = InvariantChecker()
+        inputs = bytearray()
+        played = 0
+        for _ in range(min(C.SOAK_MATCH_TICKS, ticks - result.ticks)):
+            pair = (drive[0](sim, 0, rng), drive[1](sim, 1, rng))
+            inputs += bytes(pair)
+            begin = clock()
+            sim.step(pair)
+            spent = clock() - begin
+            histogram[min(_HISTOGRAM_US, spent // 1000)] += 1
+            if spent > result.max_tick_ns:
+                result.max_tick_ns = spent
+            played += 1
+            violation = check(sim)
+            if violation:
+                result.failures.append((violation, case.with_inputs(inputs)))
+                break
+            if sim.match_winner:
+                break
+        result.ticks += played
+        result.matches += 1
+
+        del sim, check, inputs
+        gc.collect()
+        blocks = sys.getallocatedblocks()
+        if baseline is None:
+            baseline = blocks  # caches are warm after one match
+        else:
+            result.heap_growth = max(result.heap_growth, blocks - baseline)
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _soak_job(job: Tuple[int, int]) -> SoakResult:
+    """Worker: soak, then shrink the first failure of each invariant"""
+    ticks, seed = job
+    result = soak(ticks, seed)
+    shrunk, seen = [], set()
+    for violation, case in result.failures:
+        if violation[0] not in seen:
+            seen.add(violation[0])
+            shrunk.append((violation, shrink(case)))
+    result.failures = shrunk
+    return result
+
+
+def run_soak(ticks: int, workers: int = C.SOAK_WORKERS, seed: int = 0) -> SoakResult:
+    """Split a soak across worker processes (in this process if workers is 1)"""
+    workers = max(1, min(workers, ticks))
+    jobs = [(ticks // workers + (1 if i < ticks % workers else 0), seed + i) for i in range(workers)]
+    if workers == 1:
+        results = [_soak_job(jobs[0])]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(_soak_job, jobs)
+    total = SoakResult()
+    for result in results:
+        total.merge(result)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Randomized soak test of the match rules")
+    parser.add_argument("--ticks", type=int, default=1_000_000, help="total over all workers")
+    parser.add_argument("--workers", type=int, default=C.SOAK_WORKERS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-us", type=int, default=C.SOAK_TICK_BUDGET_US, help="p99 tick time")
+    parser.add_argument("--replay", help="re-run a saved failing case instead")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        found = SoakCase.load(args.replay).play()
+        if found is None:
+            print("No invariant broken")
+            return
+        tick, (name, details) = found
+        print(f"Tick {tick}: {name}: {details}")
+        raise SystemExit(1)
+
+    result = run_soak(args.ticks, args.workers, args.seed)
+    rate = result.ticks / result.elapsed if result.elapsed else 0.0
+    print(f"{result.ticks} ticks, {result.matches} matches in {result.elapsed:.1f}s "
+          f"({rate:.0f} ticks/s on {max(1, args.workers)} workers)")
+    print(f"Tick time p50 {result.percentile(0.5)} us, p99 {result.percentile(0.99)} us, "
+          f"max {result.max_tick_ns / 1000:.0f} us; heap growth {result.heap_growth} blocks")
+    if result.failures:
+        os.makedirs(C.SOAK_DIR, exist_ok=True)
+    for violation, case in result.failures:
+        path = os.path.join(C.SOAK_DIR, f"{violation[0]}-{case.seed}.json")
+        case.save(path, violation)
+        print(f"{violation[0]}: {violation[1]} ({case.ticks} ticks) -> {path}")
+    problems = result.problems(tick_budget_us=args.budget_us)
+    for line in problems:
+        print("FAIL", line)
+    if problems:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Stages loaded from Tiled maps (JSON .tmj/.json or XML .tmx).
+
+Tile layers give the geometry. A tile's "collision" property decides what it
+is, falling back to the layer's property and then to "solid":
+- solid: blocks from every side
+- ledge: one-way, so fighters land on it from above, jump up through it, and
+  drop through it by holding down
+- none: scenery, drawn only
+A "color" property (Tiled color) sets how the tile is drawn; tile images are
+not used. An object layer may place points named "p1" and "p2" as spawns.
+
+At load time, equal neighbouring tiles are merged greedily into a few large
+rectangles: runs along a row first, then stacked rows of the same run.
+Ledges merge along rows only, so they stay thin. A wide stage has as many
+rectangles as it has distinct surfaces, not as many as it has tiles. The
+merged result is cached in STAGE_CACHE_DIR, so later loads skip parsing and
+merging. The cache key is a SHA-1 of the map file together with the loader
+inputs that are not in it: _VERSION, the default colours and FLOOR_TOP (the
+default spawn height). Bump _VERSION whenever the parsing or merge rules
+change, so stale entries are never read again.
+
+Stage turns the rectangles into solid-colour sprites:
+- solid rectangles go in a spatial-hashed SpriteList, which the physics
+  engines use as walls
+- ledges go in their own spatial-hashed list, searched per fighter each tick
+- scenery goes in a plain list
+None of the lists change after loading, so their GPU buffers are written
+once, and the whole stage draws in three calls whatever its size.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import struct
+import xml.etree.ElementTree as ET
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+import arcade
+from arcade.types import LRBT
+from . import constants as C
+
+KIND_SOLID = 0
+KIND_LEDGE = 1
+KIND_SCENERY = 2
+_KINDS = {"solid": KIND_SOLID, "ledge": KIND_LEDGE, "none": KIND_SCENERY}
+_DEFAULT_COLORS = {
+    KIND_SOLID: tuple(C.STAGE_SOLID_COLOR),
+    KIND_LEDGE: tuple(C.STAGE_LEDGE_COLOR),
+    KIND_SCENERY: tuple(C.STAGE_SCENERY_COLOR),
+}
+
+_GID_MASK = 0x1FFFFFFF  # Tiled stores flip flags in the top bits
+_MAGIC = b"AFST"
+_VERSION = 1  # bump when build_stage/merge_tiles change what a map produces
+_HEADER = struct.Struct("<4sHIIIII")  # magic, version, width, height, tile width, tile height, rects
+_SPAWNS = struct.Struct("<ffff")
+_RECT = struct.Struct("<BiiII4B")  # kind, left, bottom, width, height, rgba
+
+Color = Tuple[int, int, int, int]
+TileKey = Tuple[int, Color]  # kind, colour
+Rect = Tuple[int, int, int, int, int, Color]  # kind, left, bottom, width, height, colour
+Spawn = Tuple[float, float]
+
+
+class StageData:
+    """Merged stage geometry in world pixels (y up), as cached on disk"""
+
+    def __init__(self, width: int, height: int, tile_size: Tuple[int, int],
+                 rects: List[Rect], spawns: Tuple[Spawn, Spawn]):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.rects = rects
+        self.spawns = spawns
+
+    def to_bytes(self) -> bytes:
+        chunks = [_HEADER.pack(_MAGIC, _VERSION, self.width, self.height, *self.tile_size, len(self.rects)),
+                  _SPAWNS.pack(*self.spawns[0], *self.spawns[1])]
+        chunks.extend(_RECT.pack(kind, left, bottom, w, h, *color) for kind, left, bottom, w, h, color in self.rects)
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "StageData":
+        magic, version, width, height, tile_w, tile_h, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("not a stage cache file")
+        x1, y1, x2, y2 = _SPAWNS.unpack_from(data, _HEADER.size)
+        offset = _HEADER.size + _SPAWNS.size
+        rects = []
+        for _ in range(count):
+            kind, left, bottom, w, h, *color = _RECT.unpack_from(data, offset)
+            rects.append((kind, left, bottom, w, h, tuple(color)))
+            offset += _RECT.size
+        return cls(width, height, (tile_w, tile_h), rects, ((x1, y1), (x2, y2)))
+
+
+# --- Parsing ---
+
+def parse_color(value: str) -> Color:
+    """Tiled colour, "#RRGGBB" or "#AARRGGBB", to RGBA"""
+    value = value.lstrip("#")
+    if len(value) == 6:
+        value = "ff" + value
+    a, r, g, b = (int(value[i:i + 2], 16) for i in range(0, 8, 2))
+    return r, g, b, a
+
+
+def _properties(items) -> Dict[str, str]:
+    return {p["name"]: p["value"] for p in items or ()}
+
+
+def decode_layer_data(data, encoding: Optional[str], compression: Optional[str]) -> List[int]:
+    """Tile layer data (JSON list, CSV or base64, optionally compressed) to gids"""
+    if isinstance(data, list):
+        return data
+    if encoding == "csv":
+        return [int(v) for v in data.replace("\n", "").split(",") if v.strip()]
+    raw = base64.b64decode(data.strip())
+    if compression == "zlib":
+        raw = zlib.decompress(raw)
+    elif compression == "gzip":
+        raw = gzip.decompress(raw)
+    elif compression:
+        raise ValueError(f"unsupported layer compression {compression!r}")
+    return list(struct.unpack(f"<{len(raw) // 4}I", raw))
+
+
+def _tmx_properties(element) -> List[Dict]:
+    group = element.find("properties")
+    if group is None:
+        return []
+    return [{"name": p.get("name"), "value": p.get("value", p.text)} for p in group.findall("property")]
+
+
+def tmx_to_json(path: str) -> Dict:
+    """The parts of a .tmx map that stages use, in Tiled's JSON layout"""
+    root = ET.parse(path).getroot()
+    data = {key: int(root.get(key)) for key in ("width", "height", "tilewidth", "tileheight")}
+    data["tilesets"] = [{
+        "firstgid": int(tileset.get("firstgid")),
+        "tiles": [{"id": int(tile.get("id")), "properties": _tmx_properties(tile)}
+                  for tile in tileset.findall("tile")],
+    } for tileset in root.findall("tileset")]
+    data["layers"] = []
+    for layer in root:
+        if layer.tag == "layer":
+            element = layer.find("data")
+            data["layers"].append({
+                "type": "tilelayer", "name": layer.get("name"),
+                "properties": _tmx_properties(layer),
+                "data": decode_layer_data(element.text, element.get("encoding"), element.get("compression")),
+            })
+        elif layer.tag == "objectgroup":
+            data["layers"].append({
+                "type": "objectgroup", "name": layer.get("name"),
+                "objects": [{"name": o.get("name"), "x": float(o.get("x")), "y": float(o.get("y"))}
+                            for o in layer.findall("object")],
+            })
+    return data
+
+
+def merge_tiles(grid: List[List[Optional[TileKey]]]) -> List[Tuple[TileKey, int, int, int, int]]:
+    """
+    Greedy rectangle merge of a tile grid (row 0 at the top).
+    Returns (key, column, row, columns wide, rows high) per rectangle.
+    """
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    used = [[False] * cols for _ in range(rows)]
+    merged = []
+    for r in range(rows):
+        c = 0
+        while c < cols:
+            key = grid[r][c]
+            if key is None or used[r][c]:
+                c += 1
+                continue
+            w = 1
+            while c + w < cols and grid[r][c + w] == key and not used[r][c + w]:
+                w += 1
+            h = 1
+            if key[0] != KIND_LEDGE:
+                while r + h < rows and all(grid[r + h][c + k] == key and not used[r + h][c + k]
+                                           for k in range(w)):
+                    h += 1
+            for dr in range(h):
+                for k in range(w):
+                    used[r + dr][c + k] = True
+            merged.append((key, c, r, w, h))
+            c += w
+    return merged
+
+
+def build_stage(data: Dict) -> StageData:
+    """Merge a Tiled map's tile layers into stage rectangles"""
+    if data.get("infinite"):
+        raise ValueError("infinite Tiled maps are not supported")
+    cols, rows = data["width"], data["height"]
+    tile_w, tile_h = data["tilewidth"], data["tileheight"]
+
+    # gid -> tile properties
+    tile_props: Dict[int, Dict[str, str]] = {}
+    for tileset in data.get("tilesets", ()):
+        if "source" in tileset:
+            raise ValueError("external tilesets are not supported; embed the tileset in the map")
+        for tile in tileset.get("tiles", ()):
+            tile_props[tileset["firstgid"] + tile["id"]] = _properties(tile.get("properties"))
+
+    grid: List[List[Optional[TileKey]]] = [[None] * cols for _ in range(rows)]
+    spawns = [(cols * tile_w * 0.25, C.FLOOR_TOP), (cols * tile_w * 0.75, C.FLOOR_TOP)]
+    for layer in data.get("layers", ()):
+        if layer.get("type") == "objectgroup":
+            for obj in layer.get("objects", ()):
+                if obj.get("name") in ("p1", "p2"):
+                    spawns[int(obj["name"][1]) - 1] = (obj["x"], rows * tile_h - obj["y"])
+            continue
+        if layer.get("type") != "tilelayer" or layer.get("visible") is False:
+            continue
+        layer_kind = _properties(layer.get("properties")).get("collision", "solid")
+        gids = decode_layer_data(layer["data"], layer.get("encoding"), layer.get("compression"))
+        for index, gid in enumerate(gids):
+            gid &= _GID_MASK
+            if not gid:
+                continue
+            props = tile_props.get(gid, {})
+            kind = _KINDS[props.get("collision", layer_kind)]
+            color = parse_color(props["color"]) if "color" in props else _DEFAULT_COLORS[kind]
+            grid[index // cols][index % cols] = (kind, color)
+
+    rects = []
+    for (kind, color), c, r, w, h in merge_tiles(grid):
+        rects.append((kind, c * tile_w, (rows - r - h) * tile_h, w * tile_w, h * tile_h, color))
+    return StageData(cols * tile_w, rows * tile_h, (tile_w, tile_h), rects, tuple(spawns))
+
+
+def stage_path(name: str, directory: str = C.STAGE_DIR) -> str:
+    """Map file of a stage name (.tmj, .json or .tmx)"""
+    for extension in (".tmj", ".json", ".tmx"):
+        path = os.path.join(directory, name + extension)
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError(f"no stage map named {name!r} in {directory}")
+
+
+def cache_key(raw: bytes) -> str:
+    """SHA-1 of a map file plus the loader inputs that shape its merged result"""
+    digest = hashlib.sha1(raw)
+    loader = (_VERSION, sorted(_DEFAULT_COLORS.items()), C.FLOOR_TOP)
+    digest.update(repr(loader).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_stage(path: str, cache_dir: Optional[str] = C.STAGE_CACHE_DIR) -> StageData:
+    """Merged geometry of a map file, from the binary cache when the file is unchanged"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, cache_key(raw) + ".bin")
+        if os.path.isfile(cache_path):
+            with open(cache_path, "rb") as f:
+                try:
+                    return StageData.from_bytes(f.read())
+                except (ValueError, struct.error):
+                    pass  # stale or corrupt: rebuild below
+
+    data = tmx_to_json(path) if path.endswith(".tmx") else json.loads(raw.decode("utf-8"))
+    stage = build_stage(data)
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(stage.to_bytes())
+        os.replace(tmp_path, cache_path)
+    return stage
+
+
+# --- Runtime ---
+
+class Stage:
+    """Sprites and collision lists built from StageData"""
+
+    def __init__(self, data: StageData):
+        self.data = data
+        self.width = data.width
+        self.height = data.height
+        self.spawns = data.spawns
+        self.solid = arcade.SpriteList(use_spatial_hash=True)
+        self.ledges = arcade.SpriteList(use_spatial_hash=True)
+        self.scenery = arcade.SpriteList()
+        lists = {KIND_SOLID: self.solid, KIND_LEDGE: self.ledges, KIND_SCENERY: self.scenery}
+        for kind, left, bottom, w, h, color in data.rects:
+            sprite = arcade.SpriteSolidColor(w, h, color=color)
+            sprite.left = left
+            sprite.bottom = bottom
+            lists[kind].append(sprite)
+
+    def draw(self):
+        self.scenery.draw()
+        self.solid.draw()
+        self.ledges.draw()
+
+    def update_ledges(self, active: arcade.SpriteList, player: arcade.Sprite, feet: float,
+                      dropping: bool = False):
+        """
+        Keep `active`, one fighter's one-way platforms, to the ledges it may land on.
+        Only ledges near the fighter are looked at: the spatial hash is queried
+        over the fighter's width and the band its feet can fall through this
+        tick. A nearby ledge turns on once the feet are above its top and stays
+        on while they are within LEDGE_TOLERANCE of it. Holding down turns every
+        ledge off. Call before the fighter's physics update, with its feet
+        before the move.
+        """
+        nearby = ()
+        if not dropping:
+            dx = abs(player.change_x)
+            reach = abs(player.change_y) + C.GRAVITY + C.LEDGE_TOLERANCE
+            band = LRBT(player.left - dx, player.right + dx, feet - reach, feet + C.LEDGE_TOLERANCE)
+            nearby = arcade.get_sprites_in_rect(band, self.ledges)
+        for ledge in list(active):
+            if ledge not in nearby or feet < ledge.top - C.LEDGE_TOLERANCE:
+                active.remove(ledge)
+        for ledge in nearby:
+            if feet >= ledge.top and ledge not in active:
+                active.append(ledge)
+
+    def bounds(self, scroll_x: float) -> Tuple[float, float]:
+        """Walls for the fighters: the stage edges, or the scrolled view on wider stages"""
+        return max(0.0, scroll_x), min(float(self.width), scroll_x + C.SCREEN_WIDTH)
+
+    def scroll_for(self, xs: Sequence[float]) -> float:
+        """Horizontal scroll that centres the fighters, kept within the stage"""
+        if self.width <= C.SCREEN_WIDTH:
+            return (self.width - C.SCREEN_WIDTH) / 2
+        middle = sum(xs) / len(xs)
+        return min(max(middle - C.SCREEN_WIDTH / 2, 0.0), self.width - C.SCREEN_WIDTH)
@@ -0,0 +1,94 @@
+"""
+Long-lived views shared by every screen transition.
+
+Each view is built the first time it is shown and then kept. Moving between
+the menu, character select, the fight and the game over screen only resets
+state in place. GameView.setup() rebuilds nothing after its first call:
+fighters swap to other roster characters that are already decoded, and the
+sprite lists, physics engines, parallax layers and HUD text are reused. The
+menu keeps its layer cache and built menus, and music carries on when
+already playing. A rematch or a return to the menu therefore decodes nothing.
+
+Views reach the context through get_app_context(); it lives on the window
+like the virtual screen.
+"""
+import time
+from typing import Optional
+import arcade
+
+
+class AppContext:
+    """Owns one instance of each screen and switches between them"""
+
+    def __init__(self, window: arcade.Window, clock=time.perf_counter):
+        self.window = window
+        self.clock = clock
+        self.menu = None
+        self.select = None
+        self.game = None
+        self.game_over = None
+        self.transitions = 0
+        self.last_transition = 0.0  # seconds the last switch took, resets included
+
+    def show_menu(self):
+        from .start_view import StartView
+        started = self.clock()
+        if self.menu is None:
+            self.menu = StartView()
+        self._show(self.menu, started)
+
+    def show_select(self, debug_mode: bool = False):
+        from .select_view import CharacterSelectView
+        started = self.clock()
+        if self.select is None:
+            self.select = CharacterSelectView(debug_mode=debug_mode)
+        else:
+            self.select.reset(debug_mode)
+        self._show(self.select, started)
+
+    def start_match(self, p1_character: Optional[str] = None, p2_character: Optional[str] = None,
+                    seed: Optional[int] = None):
+        """Show the fight, set up in place if it was built before"""
+        from .game_view import GameView
+        started = self.clock()
+        if self.game is None:
+            self.game = GameView(p1_character, p2_character, seed=seed)
+        else:
+            self.game.set_characters(p1_character, p2_character)
+            self.game.seed = seed
+        self.window.show_view(self.game)
+        self.game.setup()
+        self._done(started)
+
+    def rematch(self):
+        """Same fighters again (back to the menu if the fight wasn't started here, e.g. netplay)"""
+        if self.game is None:
+            self.show_menu()
+            return
+        self.start_match(self.game.p1_character, self.game.p2_character)
+
+    def show_game_over(self, winner: int):
+        from .game_over_view import GameOverView
+        started = self.clock()
+        if self.game_over is None:
+            self.game_over = GameOverView(winner=winner)
+        else:
+            self.game_over.set_winner(winner)
+        self._show(self.game_over, started)
+
+    def _show(self, view: arcade.View, started: float):
+        self.window.show_view(view)
+        self._done(started)
+
+    def _done(self, started: float):
+        self.transitions += 1
+        self.last_transition = self.clock() - started
+
+
+def get_app_context(window: Optional[arcade.Window] = None) -> AppContext:
+    """The window's context, created on first use"""
+    window = window or arcade.get_window()
+    context = getattr(window, "app_context", None)
+    if context is None:
+        context = window.app_context = AppContext(window)
+    return context
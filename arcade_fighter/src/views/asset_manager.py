@@ -1,53 +1,47 @@
 import arcade
-import random
-from typing import Optional, List
+from typing import Optional
 from .. import constants as C
+from ..assets import get_asset_registry
+from ..music import get_music_director
+from ..sfx import get_sfx_mixer
+
 
 class AssetManager:
     """Centralized asset loading and management"""
     
     def __init__(self):
-        self.occult_symbol = None
-        self.music_player = None
-        self.current_track = None
-        self.current_volume = C.DEFAULT_VOLUME
-        self._load_occult_symbol()
-        
-    def _load_occult_symbol(self):
-        """Load the occult symbol with fallback"""
+        self.music = get_music_director()
+        self.registry = get_asset_registry()
+        get_sfx_mixer().on_duck = self.music.duck
+
+    @property
+    def occult_symbol(self) -> arcade.Texture:
+        """The occult symbol with fallback (decoded again if it was evicted)"""
         try:
-            self.occult_symbol = arcade.load_texture(
-                "arcade_fighter/assets/images/STATIC/OCCULT/image-from-rawpixel-id-6332972-png.png"
-            )
+            return self.registry.texture(C.OCCULT_SYMBOL_IMAGE)
         except FileNotFoundError:
-            self.occult_symbol = arcade.load_texture(":resources:images/items/star.png")
-
-    def play_random_music(self, music_files: List[str]) -> Optional[str]:
-        """Play a random music track from the provided list"""
-        if self.music_player:
-            self.music_player.stop()
-            
-        if not music_files:
-            return None
-            
-        self.current_track = random.choice(music_files)
-        sound = arcade.load_sound(self.current_track)
-        self.music_player = sound.play(volume=self.current_volume)
-        self.music_player.loop = True
-        return self.current_track
+            return self.registry.texture(":resources:images/items/star.png")
+
+    def load_sound(self, path: str) -> arcade.Sound:
+        """Get a decoded sound, loading it on first use (kept by the asset registry)"""
+        return self.registry.sound(path)
+
+    def play_playlist(self, name: str):
+        """Crossfade to a music playlist (C.MUSIC_PLAYLISTS); tracks decode in the background"""
+        self.music.play(name)
+
+    @property
+    def current_track(self) -> Optional[str]:
+        return self.music.current_track
 
     def adjust_volume(self, change: float):
         """Adjust volume by specified amount (clamped to 0-1)"""
-        self.current_volume = max(0, min(1, self.current_volume + change))
-        if self.music_player:
-            self.music_player.volume = self.current_volume
+        self.music.set_volume(self.music.volume + change)
 
     def pause_music(self):
         """Pause the current music track"""
-        if self.music_player:
-            self.music_player.pause()
+        self.music.pause()
 
     def resume_music(self):
         """Resume paused music"""
-        if self.music_player and not self.music_player.playing:
-            self.music_player.play()
\ No newline at end of file
+        self.music.resume()
@@ -1,44 +1,58 @@
 import arcade
 from .. import constants as C
+from ..assets import get_asset_registry
+from .app_context import get_app_context
+from .virtual_screen import get_virtual_screen
 
 class GameOverView(arcade.View):
     """ View to show when game is over """
 
     def __init__(self, winner=None):
-        """ This is run once when we switch to this view"""
+        """ This is run once; the app context reuses the view for every match """
         super().__init__()
-        self.winner = winner # Store who won
-
-        # Reset the viewport, necessary if scaling was used in the game view
-        self.window.viewport = (0, 0, C.SCREEN_WIDTH, C.SCREEN_HEIGHT)
+        self.screen = get_virtual_screen(self.window)
+
+        # Laid out once; only the winner line changes between matches
+        self.winner_text = arcade.Text("", C.SCREEN_WIDTH / 2, C.SCREEN_HEIGHT / 2 + 50,
+                                       arcade.color.WHITE, font_size=50, anchor_x="center")
+        self.hint_texts = [
+            arcade.Text("Press R for a Rematch", C.SCREEN_WIDTH / 2, C.SCREEN_HEIGHT / 2 - 50,
+                        arcade.color.WHITE, font_size=20, anchor_x="center"),
+            arcade.Text("Press ENTER for the Menu", C.SCREEN_WIDTH / 2, C.SCREEN_HEIGHT / 2 - 90,
+                        arcade.color.WHITE, font_size=20, anchor_x="center"),
+            arcade.Text("Press ESCAPE to Quit", C.SCREEN_WIDTH / 2, C.SCREEN_HEIGHT / 2 - 130,
+                        arcade.color.WHITE, font_size=18, anchor_x="center"),
+        ]
+        self.set_winner(winner)
+
+    def set_winner(self, winner):
+        """ Store who won """
+        self.winner = winner
+        self.winner_text.text = f"Player {winner} Wins!" if winner else "Game Over!"
 
     def on_show_view(self):
         """ Called when switching to this view"""
         arcade.set_background_color(arcade.color.BLACK)
+        get_asset_registry().enter_view("game_over")
 
     def on_draw(self):
         """ Draw this view """
-        self.clear()
-
-        # Display winner information
-        winner_text = f"Player {self.winner} Wins!" if self.winner else "Game Over!"
-        arcade.draw_text(winner_text, C.SCREEN_WIDTH / 2, C.SCREEN_HEIGHT / 2 + 50,
-                         arcade.color.WHITE, font_size=50, anchor_x="center")
+        with self.screen.activate():
+            self.draw_text()
+        self.screen.present()
 
-        arcade.draw_text("Press ENTER to Play Again", C.SCREEN_WIDTH / 2, C.SCREEN_HEIGHT / 2 - 50,
-                         arcade.color.WHITE, font_size=20, anchor_x="center")
-        arcade.draw_text("Press ESCAPE to Quit", C.SCREEN_WIDTH / 2, C.SCREEN_HEIGHT / 2 - 100,
-                         arcade.color.WHITE, font_size=18, anchor_x="center")
+    def draw_text(self):
+        self.screen.clear()
+        self.winner_text.draw()
+        for text in self.hint_texts:
+            text.draw()
 
     def on_key_press(self, key, _modifiers):
-        """ If the user presses the Enter key, restart the game. """
-        if key == arcade.key.ENTER:
-            print("Restarting game...") # Debug print
-            # We need to import GameView here or pass it somehow if we want
-            # to directly go back to game. Going to StartView is simpler.
-            from .start_view import StartView # Import here
-            start_view = StartView()
-            self.window.show_view(start_view)
+        """ R replays the same fighters, ENTER goes back to the menu """
+        if key == arcade.key.R:
+            get_app_context(self.window).rematch()
+        elif key == arcade.key.ENTER:
+            get_app_context(self.window).show_menu()
         elif key == arcade.key.ESCAPE:
             print("Quitting game...") # Debug print
-            arcade.exit()
\ No newline at end of file
+            arcade.exit()
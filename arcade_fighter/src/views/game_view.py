@@ -1,21 +1,64 @@
 
 import arcade
+import random
+from typing import Optional
 from .. import constants as C
 from ..character import Character
+from ..assets import get_asset_registry
+from ..hot_reload import get_hot_reloader
+from ..music import get_music_director
+from ..quality import QualityLevel, get_quality_governor
+from ..sfx import get_sfx_mixer
+from ..projectiles import ProjectilePool
+from ..stage import Stage, load_stage, stage_path
+from ..net.spectator import capture_state, get_spectator_server
+from ..replay import get_replay_recorder
+from ..simulation import (
+    INPUT_ATTACK, INPUT_JUMP, INPUT_LEFT, INPUT_RIGHT, INPUT_SPECIAL, MatchSimulation
+)
+from ..pixel_mask import masks_overlap, sprite_mask_origin
+from .. import sweep
+from .. import event_log
+from .. import metrics
+from .parallax import ParallaxBackground
+from .app_context import get_app_context
+from .virtual_screen import get_virtual_screen
+from ..event_log import (
+    EV_HIT, EV_MATCH_END, EV_RELOAD, EV_ROUND_END, EV_ROUND_RESET, EV_SETUP
+)
 # Import GameOverView later for transitions
 # from .game_over_view import GameOverView
 
+# Keys sampled into per-tick input bits in deterministic mode
+INPUT_KEYS = {
+    1: ((C.KEY_LEFT_P1, INPUT_LEFT), (C.KEY_RIGHT_P1, INPUT_RIGHT), (C.KEY_JUMP_P1, INPUT_JUMP),
+        (C.KEY_ATTACK_P1, INPUT_ATTACK), (C.KEY_SPECIAL_P1, INPUT_SPECIAL)),
+    2: ((C.KEY_LEFT_P2, INPUT_LEFT), (C.KEY_RIGHT_P2, INPUT_RIGHT), (C.KEY_JUMP_P2, INPUT_JUMP),
+        (C.KEY_ATTACK_P2, INPUT_ATTACK), (C.KEY_SPECIAL_P2, INPUT_SPECIAL)),
+}
+
 class GameView(arcade.View):
     """ Main application class where the fighting happens. """
 
-    def __init__(self):
-        """ Initializer """
+    def __init__(self, p1_character: str = None, p2_character: str = None,
+                 seed: Optional[int] = None, netplay=None):
+        """ Initializer. Character ids come from the roster (see CharacterSelectView).
+        seed fixes the match PRNG in deterministic mode (random per match if None).
+        netplay is a LockstepSession; its simulation is used and advanced by it. """
         # Call the parent class initializer
         super().__init__()
 
+        # Roster picks; only these characters get their textures decoded
+        self.p1_character = p1_character or C.DEFAULT_CHARACTER
+        self.p2_character = p2_character or C.DEFAULT_CHARACTER
+
         # Variables that will hold sprite lists
         self.player_list = None
+        self.stage = None # Tile-map stage; its merged solid tiles are platform_list
         self.platform_list = None # For floor, etc.
+        self.ledge_lists = [] # Per-fighter one-way ledges its physics engine currently lands on
+        self.scroll_x = 0.0 # Left edge of the view on stages wider than the canvas
+        self.projectiles = None # Pooled projectiles for special moves
 
         # Player sprites
         self.player1_sprite = None
@@ -29,6 +72,23 @@ class GameView(arcade.View):
         self.round_number = 1
         self.player1_rounds_won = 0
         self.player2_rounds_won = 0
+        self.tick = 0 # Frames simulated, used to timestamp logged events
+        self.seed = seed
+        self.netplay = netplay
+        self.simulation = None # MatchSimulation in deterministic mode
+        self.spectators = None # SpectatorServer when streaming is enabled
+        self.recorder = None # ReplayRecorder when ARCADE_RECORD is set
+        self.hot_reload = None # HotReloader once watching or after the first F5
+        self.sfx = None # SfxMixer, effects preloaded in setup()
+        self.sfx_state = [(True, 0), (True, 0)] # (on ground, special cooldown) last tick
+        self.held_keys = set()
+        self.quality = None # QualityGovernor; its listener resizes layers and pools
+        self.parallax = None # Stage layers, trimmed at lower quality levels
+        self.hud = {} # Cached HUD text objects, refreshed every level.hud_refresh seconds
+        self.debug_hud = []
+        self.hud_timer = 0.0
+        self.show_quality_hud = False
+        self.screen = get_virtual_screen(self.window) # Canvas drawn into, then upscaled
         # Add more state as needed (timers, scores, etc.)
 
         # Set background color
@@ -52,7 +112,8 @@ class GameView(arcade.View):
         # Create only Player 1
         self.player1_sprite = Character(
             player_num=1, 
-            scale=C.CHARACTER_SCALING
+            scale=C.CHARACTER_SCALING,
+            character_id=self.p1_character
         )
         self.player1_sprite.center_x = C.SCREEN_WIDTH / 2
         self.player1_sprite.bottom = 64
@@ -66,76 +127,122 @@ class GameView(arcade.View):
         )
         
     def setup(self):
-        """ Set up the game here. Call this function to restart the game. """
-        print("Setting up GameView...") # Debug print
+        """ Set up the game here. Call this function to restart the game.
+        The stage, sprites and physics are built on the first call only; later
+        calls (rematches, R) reset them in place without decoding anything. """
+        event_log.emit(EV_SETUP)
+        if self.player_list is None:
+            self.build()
+        else:
+            self.player1_sprite.set_character(self.p1_character)
+            self.player2_sprite.set_character(self.p2_character)
+        self.reset_match()
+
+    def build(self):
+        """ Create the stage, fighters and physics engines (once per view) """
         # Initialize sprite lists
         self.player_list = arcade.SpriteList()
-        self.platform_list = arcade.SpriteList(use_spatial_hash=True) # Spatial hash for static platforms
+        self.projectiles = ProjectilePool()
+
+        # --- Stage Setup ---
+        # Deterministic mode simulates a flat floor, so it gets the matching stage
+        name = C.STAGE_SIM_NAME if C.DETERMINISTIC_MODE or self.netplay else C.STAGE_NAME
+        self.stage = Stage(load_stage(stage_path(name)))
+        self.platform_list = self.stage.solid # Spatial hash for static platforms
+        self.ledge_lists = [arcade.SpriteList(use_spatial_hash=True) for _ in range(2)]
+        self.projectiles.stage_width = self.stage.width
 
         # --- Background Setup ---
-        self.background = arcade.load_texture(
-            "arcade_fighter/assets/LEVELS/Glacial-mountains/background_glacial_mountains.png"
-        )
+        self.parallax = ParallaxBackground()
 
-                # --- Player Setup --- (Phase 3)
-        # Player 1
-        self.player1_sprite = Character(player_num=1, scale=C.CHARACTER_SCALING)
-        self.player1_sprite.center_x = C.SCREEN_WIDTH * 0.25
-        self.player1_sprite.bottom = 64 # Start on the floor (floor top is y=64)
+        # --- Player Setup --- (Phase 3)
+        self.player1_sprite = Character(player_num=1, scale=C.CHARACTER_SCALING,
+                                        character_id=self.p1_character)
+        self.player2_sprite = Character(player_num=2, scale=C.CHARACTER_SCALING,
+                                        character_id=self.p2_character)
         self.player_list.append(self.player1_sprite)
-
-        # Player 2
-        self.player2_sprite = Character(player_num=2, scale=C.CHARACTER_SCALING)
-        self.player2_sprite.center_x = C.SCREEN_WIDTH * 0.75
-        self.player2_sprite.bottom = 64 # Start on the floor
         self.player_list.append(self.player2_sprite)
-# --- Floor Setup ---
-        # Create the ground
-        # TODO: Use actual coordinates and potentially a texture
-        floor = arcade.SpriteSolidColor(int(C.SCREEN_WIDTH * 1.5), 64, arcade.color.DARK_SPRING_GREEN)
-        floor.center_x = C.SCREEN_WIDTH / 2
-        floor.center_y = 32 # Bottom half of the sprite is the ground level
-        self.platform_list.append(floor)
-
-                # --- Physics Engine Setup --- (Phase 5)
-        if self.player1_sprite:
-            self.physics_engine_p1 = arcade.PhysicsEnginePlatformer(
-                self.player1_sprite, self.platform_list, gravity_constant=C.GRAVITY
-            )
-        if self.player2_sprite:
-            self.physics_engine_p2 = arcade.PhysicsEnginePlatformer(
-                self.player2_sprite, self.platform_list, gravity_constant=C.GRAVITY
-            )
-        # if self.player2_sprite:
-        #     self.physics_engine_p2 = arcade.PhysicsEnginePlatformer(
-        #         self.player2_sprite, self.platform_list, gravity_constant=C.GRAVITY
-        #     )
 
-        # Reset scores/rounds if needed for a full restart
+        # --- Physics Engine Setup --- (Phase 5)
+        # Solid tiles are static walls; each fighter's ledges change with its height
+        self.physics_engine_p1 = arcade.PhysicsEnginePlatformer(
+            self.player1_sprite, gravity_constant=C.GRAVITY,
+            walls=[self.platform_list, self.ledge_lists[0]]
+        )
+        self.physics_engine_p2 = arcade.PhysicsEnginePlatformer(
+            self.player2_sprite, gravity_constant=C.GRAVITY,
+            walls=[self.platform_list, self.ledge_lists[1]]
+        )
+
+        if C.HOT_RELOAD_ENABLED:
+            self.hot_reload = get_hot_reloader()
+
+        # Decode effects now so nothing is loaded mid-fight
+        self.sfx = get_sfx_mixer()
+        self.sfx.preload()
+
+        self.setup_hud()
+        self.quality = get_quality_governor()
+
+    def reset_match(self):
+        """ Start a fresh match on the existing stage and sprites """
+        self.projectiles.clear()
+        self.held_keys.clear()
         self.round_number = 1
         self.player1_rounds_won = 0
         self.player2_rounds_won = 0
+        self.reset_round()
+
+        if C.HIT_PRECISION_PIXEL:
+            self.prepare_pixel_masks()
+
+        # Deterministic mode: MatchSimulation owns gameplay state, sprites only show it
+        self.simulation = None
+        if C.DETERMINISTIC_MODE or self.netplay:
+            self.start_simulation()
+
+        self.sfx_state = [(True, 0), (True, 0)]
+        self.hud_timer = 0.0
+        self.quality.remove_listener(self.apply_quality)
+        self.quality.on_change(self.apply_quality)
+
+        match_info = {"characters": [self.p1_character, self.p2_character], "width": C.SCREEN_WIDTH}
+        self.spectators = get_spectator_server()
+        if self.spectators:
+            self.spectators.set_match(match_info)
+        self.recorder = get_replay_recorder()
+        if self.recorder:
+            self.recorder.start_match(match_info)
+
+    def set_characters(self, p1_character: str = None, p2_character: str = None):
+        """ Pick the fighters for the next setup() (swapped in place if already built) """
+        self.p1_character = p1_character or C.DEFAULT_CHARACTER
+        self.p2_character = p2_character or C.DEFAULT_CHARACTER
 
     def on_show_view(self):
         """ Called when switching to this view"""
         arcade.set_background_color(arcade.csscolor.CORNFLOWER_BLUE)
-        self.update_viewport()
+        # Menu textures become evictable; setup() then loads the fight's assets
+        get_asset_registry().enter_view("game")
+        get_music_director().play("fight")
         # Potentially call setup() here if you want a fresh game every time
         # self.setup()
 
-    def on_resize(self, width: int, height: int):
-        """Handle window resize events"""
-        super().on_resize(width, height)
-        self.update_viewport()
-        
-    def update_viewport(self):
-        """Update viewport and UI positions based on current resolution"""
-        self.window.viewport = (0, 0, C.SCREEN_WIDTH, C.SCREEN_HEIGHT)
-        # Update any resolution-dependent positions
-        if hasattr(self, 'player1_sprite') and self.player1_sprite:
-            self.player1_sprite.center_x = C.SCREEN_WIDTH * 0.25
-        if hasattr(self, 'player2_sprite') and self.player2_sprite:
-            self.player2_sprite.center_x = C.SCREEN_WIDTH * 0.75
+    def on_hide_view(self):
+        """ Stop following quality changes once the fight is left; save its replay """
+        if self.quality:
+            self.quality.remove_listener(self.apply_quality)
+        if self.recorder:
+            self.recorder.save()
+
+    def apply_quality(self, level: QualityLevel):
+        """ Quality governor listener """
+        if self.parallax:
+            self.parallax.set_layer_count(level.parallax_layers)
+        if self.sfx:
+            self.sfx.set_voice_limit(level.sfx_voices)
+        self.hud_timer = 0.0 # refresh at the new rate straight away
+        self.screen.set_scale(level.render_scale)
 
     def debug_draw(self):
         """Draw debug overlays"""
@@ -160,18 +267,29 @@ class GameView(arcade.View):
             
         if C.DEBUG_SHOW_ANIM_STATES and self.player1_sprite:
             arcade.draw_text(
-                f"State: {self.player1_sprite.state}",
+                f"State: {C.STATE_NAMES[self.player1_sprite.state]}",
                 self.player1_sprite.left,
                 self.player1_sprite.top + 20,
                 arcade.color.WHITE,
                 12
             )
             
-    def draw_debug_hud(self):
-        """Draw debug information overlay"""
-        if not C.DEBUG_MODE:
-            return
-            
+    def setup_hud(self):
+        """ Create the HUD text objects once; update_hud() only changes their strings """
+        top = C.SCREEN_HEIGHT - C.HEALTHBAR_OFFSET_Y
+        self.hud = {
+            "p1": arcade.Text("Player 1", C.HEALTHBAR_PLAYER1_X, top - 25,
+                              arcade.color.WHITE, C.UI_FONT_SIZE),
+            "p2": arcade.Text("Player 2", C.HEALTHBAR_PLAYER2_X, top - 25,
+                              arcade.color.WHITE, C.UI_FONT_SIZE),
+            "round": arcade.Text("", C.SCREEN_WIDTH / 2, top - 10,
+                                 arcade.color.WHITE, C.UI_FONT_SIZE, anchor_x="center"),
+            "placeholder": arcade.Text("Game View - Placeholder", C.SCREEN_WIDTH / 2,
+                                       C.SCREEN_HEIGHT / 2, arcade.color.WHITE,
+                                       font_size=30, anchor_x="center"),
+            "quality": arcade.Text("", 10, 10, arcade.color.YELLOW, 12),
+            "assets": arcade.Text("", 10, 28, arcade.color.YELLOW, 12),
+        }
         # Debug controls info
         debug_text = [
             "DEBUG MODE ACTIVATED",
@@ -179,34 +297,60 @@ class GameView(arcade.View):
             "F2: Toggle Hitboxes",
             "F3: Toggle Vectors",
             "F4: Toggle Anim States",
-            "F5: Reload Assets"
+            "F5: Reload Assets",
+            "F6: Pixel Hits",
+            "F7: Quality HUD (Shift: step level)",
+            "F8: Asset report (console)"
         ]
-        
-        for i, text in enumerate(debug_text):
-            arcade.draw_text(
-                text,
-                10, C.SCREEN_HEIGHT - 30 - (i * 20),
-                arcade.color.RED if i == 0 else arcade.color.WHITE,
-                12
-            )
+        self.debug_hud = [
+            arcade.Text(text, 10, C.SCREEN_HEIGHT - 30 - (i * 20),
+                        arcade.color.RED if i == 0 else arcade.color.WHITE, 12)
+            for i, text in enumerate(debug_text)
+        ]
+        self.hud_timer = 0.0
+
+    def update_hud(self, delta_time):
+        """ Refresh HUD strings at the quality level's rate """
+        self.hud_timer -= delta_time
+        if self.hud_timer > 0 or not self.hud:
+            return
+        self.hud_timer = self.quality.level.hud_refresh if self.quality else 0.0
+        self.hud["round"].text = f"Round: {self.round_number}"
+        self.debug_hud[6].text = f"F6: Pixel Hits ({'ON' if C.HIT_PRECISION_PIXEL else 'OFF'})"
+        if self.show_quality_hud and self.quality:
+            self.hud["quality"].text = self.quality.describe()
+            self.hud["assets"].text = get_asset_registry().describe()
+
+    def draw_debug_hud(self):
+        """Draw debug information overlay"""
+        if not C.DEBUG_MODE:
+            return
+        for text in self.debug_hud:
+            text.draw()
             
     def on_draw(self):
         """ Render the screen. """
-        # Clear the screen
-        self.clear()
-        
-        # Draw debug HUD
-        self.draw_debug_hud()
-        
-        if C.DEBUG_MODE:
-            self.debug_draw()
+        metrics.FRAMES_RENDERED.inc()
+        with self.screen.activate():
+            self.draw_scene()
+        self.screen.present()
+
+    def draw_scene(self):
+        """ Draw the match in canvas coordinates """
+        # Clear the canvas
+        self.screen.clear()
 
         # Draw game elements
-        if hasattr(self, 'background'):
-            arcade.draw_lrbt_rectangle_textured(0, 0, C.SCREEN_WIDTH, C.SCREEN_HEIGHT, self.background)
+        if self.parallax:
+            self.parallax.draw()
 
-        self.platform_list.draw()
-        self.player_list.draw()
+        with self.screen.scrolled(self.scroll_x):
+            self.stage.draw()
+            self.player_list.draw()
+            if self.projectiles:
+                self.projectiles.draw()
+            if C.DEBUG_MODE:
+                self.debug_draw()
 
                 # Draw UI elements (Phase 7)
         # --- Health Bars ---
@@ -227,8 +371,7 @@ class GameView(arcade.View):
                                               bottom=C.SCREEN_HEIGHT - C.HEALTHBAR_OFFSET_Y - C.HEALTHBAR_HEIGHT/2,
                                               color=C.HEALTH_COLOR)
             # Player 1 Text
-            arcade.draw_text("Player 1", C.HEALTHBAR_PLAYER1_X, C.SCREEN_HEIGHT - C.HEALTHBAR_OFFSET_Y - 25, 
-                             arcade.color.WHITE, C.UI_FONT_SIZE)
+            self.hud["p1"].draw()
 
         if self.player2_sprite:
             health_width_p2 = C.HEALTHBAR_WIDTH * (self.player2_sprite.hp / self.player2_sprite.max_hp)
@@ -246,20 +389,46 @@ class GameView(arcade.View):
                                               bottom=C.SCREEN_HEIGHT - C.HEALTHBAR_OFFSET_Y - C.HEALTHBAR_HEIGHT/2,
                                               color=C.HEALTH_COLOR)
             # Player 2 Text
-            arcade.draw_text("Player 2", C.HEALTHBAR_PLAYER2_X, C.SCREEN_HEIGHT - C.HEALTHBAR_OFFSET_Y - 25, 
-                             arcade.color.WHITE, C.UI_FONT_SIZE)
+            self.hud["p2"].draw()
 
         # --- Round Indicator ---
-        arcade.draw_text(f"Round: {self.round_number}", C.SCREEN_WIDTH / 2, C.SCREEN_HEIGHT - C.HEALTHBAR_OFFSET_Y - 10,
-                         arcade.color.WHITE, C.UI_FONT_SIZE, anchor_x="center")
+        self.hud["round"].draw()
         # TODO: Add round win indicators later
-        arcade.draw_text("Game View - Placeholder", C.SCREEN_WIDTH / 2, C.SCREEN_HEIGHT / 2,
-                         arcade.color.WHITE, font_size=30, anchor_x="center")
+        self.hud["placeholder"].draw()
+
+        # Debug overlays go on top of the stage
+        self.draw_debug_hud()
+        if self.show_quality_hud:
+            self.hud["quality"].draw()
+            self.hud["assets"].draw()
 
 
     def on_update(self, delta_time):
         """ Movement and game logic """
-                # Update physics and ground state
+        self.tick += 1
+        event_log.get_event_log().tick = self.tick
+        metrics.TICKS_SIMULATED.inc()
+        metrics.FRAME_TIME.observe(delta_time)
+        if self.quality:
+            self.quality.observe(delta_time)
+        if self.parallax:
+            self.parallax.update(delta_time)
+        self.update_hud(delta_time)
+        if self.hot_reload:
+            self.apply_reloads()
+        if self.simulation:
+            self.update_simulation(delta_time)
+            self.play_sound_effects(delta_time)
+            self.publish_state()
+            return
+        # Body positions before this tick's movement, for the swept collision step
+        starts = [(player.center_x, player.feet) for player in self.player_list]
+
+        # One-way ledges under each fighter (DOWN drops through them)
+        for player, ledges, down in zip(self.player_list, self.ledge_lists, (C.KEY_DOWN_P1, C.KEY_DOWN_P2)):
+            self.stage.update_ledges(ledges, player, player.feet, down in self.held_keys)
+
+        # Update physics and ground state
         # Update player ground state
         if self.player1_sprite:
             self.player1_sprite.is_on_ground = self.physics_engine_p1.can_jump()
@@ -271,46 +440,29 @@ class GameView(arcade.View):
             self.physics_engine_p2.update()
 
         # Update sprites (calls Character.on_update)
-        self.player_list.update()
+        # Movement is already applied by the physics engines, so the default
+        # Sprite.update (which moves by change_x/change_y again) is not used.
+        for player in self.player_list:
+            player.on_update(delta_time)
         # Update animations (calls Character.update_animation)
         self.player_list.update_animation(delta_time)
 
 
         # --- Collision Checks (Phase 5) ---
-        # Boundary Checks
-        for player in self.player_list:
-            if player.left < 0:
-                player.left = 0
-            elif player.right > C.SCREEN_WIDTH:
-                player.right = C.SCREEN_WIDTH
-            # Add top/bottom checks if needed
-
-        # Character-Character Collision
-        if self.player1_sprite and self.player2_sprite:
-            if arcade.check_for_collision(self.player1_sprite, self.player2_sprite):
-                # Simple push-apart logic
-                overlap_x = (self.player1_sprite.width / 2 + self.player2_sprite.width / 2) - abs(self.player1_sprite.center_x - self.player2_sprite.center_x)
-                push_amount = overlap_x / 2
-
-                if self.player1_sprite.center_x < self.player2_sprite.center_x:
-                    # Player 1 is left, Player 2 is right
-                    self.player1_sprite.center_x -= push_amount
-                    self.player2_sprite.center_x += push_amount
-                else:
-                    # Player 1 is right, Player 2 is left
-                    self.player1_sprite.center_x += push_amount
-                    self.player2_sprite.center_x -= push_amount
-
-                # Prevent sticking if moving towards each other
-                # Optional: Adjust velocities as well, or just rely on position correction
+        # Body boxes swept against each other and the stage walls over the tick
+        self.resolve_bodies(starts)
+        self.update_scroll()
 
 
         # --- Attack Checks (Phase 6) ---
         self.check_attacks()
+        self.update_projectiles()
 
 
         # --- Check Win/Loss Conditions (Phase 8) ---
         self.check_round_end()
+        self.play_sound_effects(delta_time)
+        self.publish_state()
 
         # TODO: Add game logic:
         # - Check for attacks/collisions (Phase 6)
@@ -320,14 +472,146 @@ class GameView(arcade.View):
         # - Handle AI if applicable (Phase 9)
 
                 
+    def play_sound_effects(self, delta_time):
+        """ Jump, land and special sounds from fighter state changes this tick """
+        sfx = self.sfx
+        if not sfx:
+            return
+        for n, player in enumerate((self.player1_sprite, self.player2_sprite)):
+            fighter = player.fighter
+            was_on_ground, special_cooldown = self.sfx_state[n]
+            if was_on_ground and not fighter.is_on_ground:
+                sfx.play("jump")
+            elif fighter.is_on_ground and not was_on_ground:
+                sfx.play("land")
+            if fighter.special_cooldown > special_cooldown:
+                sfx.play("special")
+            self.sfx_state[n] = (fighter.is_on_ground, fighter.special_cooldown)
+        sfx.update(delta_time)
+
+    def publish_state(self):
+        """ Hand this tick's state to the spectator stream (encoded off-thread) and the replay """
+        if self.spectators or self.recorder:
+            values = capture_state(self)
+            if self.spectators:
+                self.spectators.publish(values)
+            if self.recorder:
+                self.recorder.record(values)
+
+    def start_simulation(self):
+        """ Create the match simulation and let both sprites read its fighter state """
+        if self.netplay:
+            self.simulation = self.netplay.sim
+        else:
+            seed = self.seed if self.seed is not None else random.getrandbits(32)
+            self.simulation = MatchSimulation(self.p1_character, self.p2_character, seed=seed)
+        self.player1_sprite.fighter, self.player2_sprite.fighter = self.simulation.fighters
+        self.sync_from_simulation()
+
+    def input_bits(self, player_num: int) -> int:
+        """ Pack the held keys of one player into simulation input bits """
+        bits = 0
+        for key, bit in INPUT_KEYS[player_num]:
+            if key in self.held_keys:
+                bits |= bit
+        return bits
+
+    def update_simulation(self, delta_time):
+        """ Step the simulation (locally, or as far as netplay allows), then mirror it on screen """
+        sim = self.simulation
+        if self.netplay:
+            # The local player always uses the player 1 keys
+            self.netplay.update(self.input_bits(1))
+            self.netplay.advance(self.after_step)
+        else:
+            sim.step((self.input_bits(1), self.input_bits(2)))
+            self.after_step(sim)
+        # Velocities first: update_animation turns the fighter toward change_x,
+        # which must agree with the simulation. Positions after, since a new
+        # frame moves the hurtbox the sprite is placed by.
+        for sprite, fighter in zip((self.player1_sprite, self.player2_sprite), sim.fighters):
+            sprite.change_x = fighter.vx / C.SUBPIXEL
+            sprite.change_y = fighter.vy / C.SUBPIXEL
+        self.player_list.update_animation(delta_time)
+        self.sync_from_simulation()
+
+    def after_step(self, sim: MatchSimulation):
+        """ Log and count what happened in one simulation tick """
+        for attacker, defender, damage in sim.hits:
+            event_log.emit(EV_HIT, attacker, defender, damage)
+            metrics.HITS_LANDED.inc()
+            if self.sfx:
+                self.sfx.play("hit")
+        if sim.round_winner:
+            if self.sfx:
+                self.sfx.play("ko")
+            self.player1_rounds_won, self.player2_rounds_won = sim.rounds_won
+            event_log.emit(EV_ROUND_END, sim.round_winner, self.round_number)
+            metrics.ROUNDS_COMPLETED.inc()
+            self.round_number = sim.round_number
+            if sim.match_winner:
+                self.end_match(sim.match_winner)
+
+    def sync_from_simulation(self):
+        """ Place sprites and projectiles from subpixel simulation state """
+        sim = self.simulation
+        scale_x = C.SCREEN_WIDTH / C.SIM_STAGE_WIDTH
+        for sprite, fighter in zip((self.player1_sprite, self.player2_sprite), sim.fighters):
+            sprite.center_x = fighter.x / C.SUBPIXEL * scale_x
+            sprite.bottom = fighter.y / C.SUBPIXEL
+        self.projectiles.show((x * scale_x, y, facing) for x, y, facing in sim.projectile_positions())
+
+    def prepare_pixel_masks(self):
+        """ Build both fighters' alpha masks up front so the first hit doesn't stall """
+        for player in self.player_list:
+            player.assets.pixel_masks(player.scale_x)
+
+    def fire_special(self, player: Character):
+        """ Spawn a fanned volley of projectiles in front of a player """
+        direction = 1 if player.facing_direction == C.RIGHT_FACING else -1
+        x = player.center_x + direction * C.PROJECTILE_MUZZLE_OFFSET
+        y = player.center_y
+        count = C.PROJECTILE_VOLLEY_SIZE
+        for n in range(count):
+            spread = (n - (count - 1) / 2) * C.PROJECTILE_SPREAD
+            self.projectiles.spawn(x, y, direction * C.PROJECTILE_SPEED, spread, player.player_num)
+
+    def update_projectiles(self):
+        """ Step projectiles and apply damage from any that hit a fighter """
+        if not self.projectiles:
+            return
+        self.projectiles.update()
+        for fighter, damage in self.projectiles.collide(self.player_list):
+            metrics.HITS_LANDED.inc()
+            fighter.take_damage(damage)
+            if self.sfx:
+                self.sfx.play("hit")
+
     def reload_assets(self):
-        """Hot-reload character assets"""
-        if self.player1_sprite:
-            self.player1_sprite.reload_textures()
-            print("Assets reloaded")
-            
+        """Check both fighters' files now; changed ones are swapped in by apply_reloads"""
+        self.hot_reload = get_hot_reloader()
+        self.hot_reload.rescan({player.character_id for player in self.player_list})
+
+    def apply_reloads(self):
+        """Refresh sprites (and frame data) of characters the reloader re-decoded"""
+        changed = self.hot_reload.poll()
+        if not changed:
+            return
+        roster = self.player1_sprite.roster
+        for n, player in enumerate((self.player1_sprite, self.player2_sprite)):
+            if player.character_id not in changed:
+                continue
+            player.refresh_assets()
+            # Lockstep peers must agree on frame data, so netplay keeps the old numbers
+            if self.simulation and not self.netplay:
+                self.simulation.fighters[n].apply_manifest(roster.manifest(player.character_id))
+            event_log.emit(EV_RELOAD, player.player_num)
+        if C.HIT_PRECISION_PIXEL:
+            self.prepare_pixel_masks()
+
     def on_key_press(self, key, modifiers):
         """Called when a key is pressed. """
+        self.held_keys.add(key)
         # Debug controls
         if C.DEBUG_MODE:
             if key == arcade.key.F1:
@@ -342,9 +626,30 @@ class GameView(arcade.View):
                 self.reload_assets()
                 return
         
-        # Original controls
+        if key == C.KEY_TOGGLE_QUALITY_HUD:
+            if modifiers & arcade.key.MOD_SHIFT and self.quality:
+                # Pin the next level (wrapping); the governor stops adapting
+                self.quality.adaptive = False
+                self.quality.set_level((self.quality.index + 1) % len(self.quality.levels))
+            else:
+                self.show_quality_hud = not self.show_quality_hud
+            self.hud_timer = 0.0
+            return
+
+        if key == C.KEY_ASSET_REPORT:
+            print(get_asset_registry().report())
+            return
+
+        if key == C.KEY_TOGGLE_PIXEL_HITS:
+            C.HIT_PRECISION_PIXEL = not C.HIT_PRECISION_PIXEL
+            if C.HIT_PRECISION_PIXEL:
+                self.prepare_pixel_masks()
+            self.hud_timer = 0.0
+            return
+
+        # Original controls (deterministic mode samples held_keys each tick instead)
         # --- Player 1 Controls ---
-        if self.player1_sprite:
+        if self.player1_sprite and not self.simulation:
             if key == C.KEY_JUMP_P1 and self.physics_engine_p1.can_jump():
                 # TODO: Check physics engine can_jump() here later
                 self.player1_sprite.jump()
@@ -354,12 +659,14 @@ class GameView(arcade.View):
                 self.player1_sprite.move(1)
             elif key == C.KEY_ATTACK_P1:
                 self.player1_sprite.attack()
+            elif key == C.KEY_SPECIAL_P1 and self.player1_sprite.special():
+                self.fire_special(self.player1_sprite)
             # Add Down/Crouch later if needed
             # elif key == C.KEY_DOWN_P1:
             #     pass
 
         # --- Player 2 Controls ---
-        if self.player2_sprite:
+        if self.player2_sprite and not self.simulation:
             if key == C.KEY_JUMP_P2 and self.physics_engine_p2.can_jump():
                 # TODO: Check physics engine can_jump() here later
                 self.player2_sprite.jump()
@@ -369,6 +676,8 @@ class GameView(arcade.View):
                 self.player2_sprite.move(1)
             elif key == C.KEY_ATTACK_P2:
                 self.player2_sprite.attack()
+            elif key == C.KEY_SPECIAL_P2 and self.player2_sprite.special():
+                self.fire_special(self.player2_sprite)
             # Add Down/Crouch later if needed
             # elif key == C.KEY_DOWN_P2:
             #     pass
@@ -382,15 +691,16 @@ class GameView(arcade.View):
 
     def on_key_release(self, key, modifiers):
         """Called when the user releases a key. """
+        self.held_keys.discard(key)
         # --- Player 1 Movement Stop ---
-        if self.player1_sprite:
+        if self.player1_sprite and not self.simulation:
             if key == C.KEY_LEFT_P1 and self.player1_sprite.change_x < 0:
                 self.player1_sprite.stop_moving()
             elif key == C.KEY_RIGHT_P1 and self.player1_sprite.change_x > 0:
                 self.player1_sprite.stop_moving()
 
         # --- Player 2 Movement Stop ---
-        if self.player2_sprite:
+        if self.player2_sprite and not self.simulation:
             if key == C.KEY_LEFT_P2 and self.player2_sprite.change_x < 0:
                 self.player2_sprite.stop_moving()
             elif key == C.KEY_RIGHT_P2 and self.player2_sprite.change_x > 0:
@@ -401,94 +711,103 @@ class GameView(arcade.View):
         if not self.player1_sprite or not self.player2_sprite:
             return
 
-        # Check Player 1 attacking Player 2
-        if self.player1_sprite.state == C.STATE_ATTACKING and self.player1_sprite.state_timer > (self.player1_sprite.attack_duration - 0.1):
-            # Simple hitbox in front of the player
-            hitbox_width = 60
-            hitbox_height = self.player1_sprite.height
-            hitbox_offset_x = 40 # How far in front
-            
-            if self.player1_sprite.facing_direction == C.RIGHT_FACING:
-                hitbox_center_x = self.player1_sprite.center_x + hitbox_offset_x
-            else: # LEFT_FACING
-                hitbox_center_x = self.player1_sprite.center_x - hitbox_offset_x
-            hitbox_center_y = self.player1_sprite.center_y
+        self.check_attack(self.player1_sprite, self.player2_sprite)
+        self.check_attack(self.player2_sprite, self.player1_sprite)
+
+    def check_attack(self, attacker: Character, defender: Character):
+        """ Resolve one attacker's active hitbox against a defender """
+        # Only the start of an attack can hit, and only once per attack
+        if attacker.state != C.STATE_ATTACKING or attacker.has_hit:
+            return
+        if attacker.state_timer <= attacker.attack_duration - C.ATTACK_ACTIVE_WINDOW:
+            return
+
+        # Simple hitbox in front of the player, sized by the character manifest
+        box = attacker.attack_hitbox
+        if attacker.facing_direction == C.RIGHT_FACING:
+            hitbox_center_x = attacker.center_x + box['offset_x']
+        else: # LEFT_FACING
+            hitbox_center_x = attacker.center_x - box['offset_x']
+        hitbox_center_y = attacker.center_y + box['offset_y']
+        left = hitbox_center_x - box['width'] / 2
+        right = hitbox_center_x + box['width'] / 2
+        bottom = hitbox_center_y - box['height'] / 2
+        top = hitbox_center_y + box['height'] / 2
+
+        # Cheap AABB reject against the defender's hurtbox
+        if right < defender.left or left > defender.right or top < defender.bottom or bottom > defender.top:
+            return
 
-            # Use pre-created hitbox if available, otherwise create
+        if C.HIT_PRECISION_PIXEL:
+            hit = self.pixel_hit(attacker, defender, (left, bottom, right, top))
+        else:
+            # Use pre-created hitbox sprite for the polygon test
             if not hasattr(self, '_attack_hitbox'):
-                self._attack_hitbox = arcade.SpriteSolidColor(60, 100, (0, 0, 0, 0))
-            
-            self._attack_hitbox.width = hitbox_width
-            self._attack_hitbox.height = hitbox_height
+                self._attack_hitbox = arcade.SpriteSolidColor(60, 100, color=(0, 0, 0, 0))
+            self._attack_hitbox.width = box['width']
+            self._attack_hitbox.height = box['height']
             self._attack_hitbox.center_x = hitbox_center_x
             self._attack_hitbox.center_y = hitbox_center_y
-            attack_hitbox = self._attack_hitbox
-            
-            if arcade.check_for_collision(attack_hitbox, self.player2_sprite):
-                # Hit detected!
-                # Prevent multiple hits per single attack animation/state
-                # We can check if the attack timer is near its start
-                if self.player1_sprite.state_timer > (self.player1_sprite.attack_duration - 0.1): # Allow hit near start of attack
-                     print(f"HIT! Player 1 attacks Player 2")
-                     self.player2_sprite.take_damage(self.player1_sprite.attack_damage)
-                     # Optional: Reset state timer slightly to prevent immediate re-hit
-                     # self.player1_sprite.state_timer = self.player1_sprite.attack_duration - 0.15 
-
-
-        # Check Player 2 attacking Player 1 (similar logic)
-        if self.player2_sprite.state == C.STATE_ATTACKING and self.player2_sprite.state_timer > (self.player2_sprite.attack_duration - 0.1):
-            hitbox_width = 60
-            hitbox_height = self.player2_sprite.height
-            hitbox_offset_x = 40
-            
-            if self.player2_sprite.facing_direction == C.RIGHT_FACING:
-                hitbox_center_x = self.player2_sprite.center_x + hitbox_offset_x
-            else: # LEFT_FACING
-                hitbox_center_x = self.player2_sprite.center_x - hitbox_offset_x
-            hitbox_center_y = self.player2_sprite.center_y
-
-            attack_hitbox = arcade.SpriteSolidColor(hitbox_width, hitbox_height, (0, 0, 0, 0)) # Transparent hitbox
-            attack_hitbox.center_x = hitbox_center_x
-            attack_hitbox.center_y = hitbox_center_y
-            
-            if arcade.check_for_collision(attack_hitbox, self.player1_sprite) and not self.player2_sprite.has_hit:
-                if self.player2_sprite.state_timer > (self.player2_sprite.attack_duration - 0.1):
-                     print(f"HIT! Player 2 attacks Player 1")
-                     self.player1_sprite.take_damage(self.player2_sprite.attack_damage)
-                     # Optional: Reset state timer slightly
-                     # self.player2_sprite.state_timer = self.player2_sprite.attack_duration - 0.15
+            hit = arcade.check_for_collision(self._attack_hitbox, defender)
+
+        if hit:
+            event_log.emit(EV_HIT, attacker.player_num, defender.player_num, attacker.attack_damage)
+            metrics.HITS_LANDED.inc()
+            attacker.has_hit = True
+            defender.take_damage(attacker.attack_damage)
+            if self.sfx:
+                self.sfx.play("hit")
+
+    def pixel_hit(self, attacker: Character, defender: Character, window) -> bool:
+        """ Pixel-accurate confirm: attacker's frame alpha vs defender's, inside the attack box """
+        attack_mask = attacker.current_mask()
+        hurt_mask = defender.current_mask()
+        ax, ay = sprite_mask_origin(attacker, attack_mask)
+        dx, dy = sprite_mask_origin(defender, hurt_mask)
+        window = tuple(round(v) for v in window)
+        return masks_overlap(attack_mask, ax, ay, hurt_mask, dx, dy, window)
+
+    def end_match(self, match_winner: int):
+        """ Record the result and move to the game over screen """
+        event_log.emit(EV_MATCH_END, match_winner, self.player1_rounds_won, self.player2_rounds_won)
+        metrics.MATCHES_COMPLETED.inc()
+        get_app_context(self.window).show_game_over(match_winner)
+
+    def resolve_bodies(self, starts):
+        """ Continuous collision: stop the bodies at first contact and at the walls (see sweep.py) """
+        p1, p2 = self.player1_sprite, self.player2_sprite
+        p1.center_x, p2.center_x = sweep.resolve(
+            p1.body_sweep(*starts[0]), p2.body_sweep(*starts[1]), *self.stage.bounds(self.scroll_x)
+        )
+
+    def update_scroll(self):
+        """ Centre the view on the fighters; the simulation's fixed arena is never scrolled """
+        if self.stage and not (C.DETERMINISTIC_MODE or self.netplay):
+            self.scroll_x = self.stage.scroll_for([player.center_x for player in self.player_list])
 
     def reset_round(self):
         """ Resets player positions and health for the next round. """
-        print(f"Resetting for Round {self.round_number}")
+        event_log.emit(EV_ROUND_RESET, 0, self.round_number)
         # Reset positions and health
         if self.player1_sprite:
-            self.player1_sprite.center_x = C.SCREEN_WIDTH * 0.25
-            self.player1_sprite.bottom = 64
-            self.player1_sprite.hp = self.player1_sprite.max_hp
-            self.player1_sprite.state = C.STATE_IDLE
+            self.player1_sprite.center_x, self.player1_sprite.bottom = self.stage.spawns[0]
+            self.player1_sprite.fighter.reset()
             self.player1_sprite.change_x = 0
             self.player1_sprite.change_y = 0
 
         if self.player2_sprite:
-            self.player2_sprite.center_x = C.SCREEN_WIDTH * 0.75
-            self.player2_sprite.bottom = 64
-            self.player2_sprite.hp = self.player2_sprite.max_hp
-            self.player2_sprite.state = C.STATE_IDLE
+            self.player2_sprite.center_x, self.player2_sprite.bottom = self.stage.spawns[1]
+            self.player2_sprite.fighter.reset()
             self.player2_sprite.change_x = 0
             self.player2_sprite.change_y = 0
         
-        # Re-initialize physics engines with potentially reset sprites
-        # (Might not be strictly necessary if only positions/velocities changed,
-        # but safer to ensure correct state)
-        if self.player1_sprite:
-            self.physics_engine_p1 = arcade.PhysicsEnginePlatformer(
-                self.player1_sprite, self.platform_list, gravity_constant=C.GRAVITY
-            )
-        if self.player2_sprite:
-            self.physics_engine_p2 = arcade.PhysicsEnginePlatformer(
-                self.player2_sprite, self.platform_list, gravity_constant=C.GRAVITY
-            )
+        # The physics engines only keep a jump counter between rounds
+        for engine in (self.physics_engine_p1, self.physics_engine_p2):
+            if engine:
+                engine.jumps_since_ground = 0
+        for ledges in self.ledge_lists:
+            ledges.clear()
+        self.update_scroll()
 
     def check_round_end(self):
         """ Check if a player's HP is 0 or less, handle round/match end. """
@@ -496,20 +815,20 @@ class GameView(arcade.View):
         if self.player1_sprite and self.player1_sprite.hp <= 0:
             round_winner = 2
             self.player2_rounds_won += 1
-            print(f"Round {self.round_number} Winner: Player 2")
+            event_log.emit(EV_ROUND_END, 2, self.round_number)
         elif self.player2_sprite and self.player2_sprite.hp <= 0:
             round_winner = 1
             self.player1_rounds_won += 1
-            print(f"Round {self.round_number} Winner: Player 1")
+            event_log.emit(EV_ROUND_END, 1, self.round_number)
 
         if round_winner:
+            metrics.ROUNDS_COMPLETED.inc()
+            if self.sfx:
+                self.sfx.play("ko")
             # Check if match is over
             if self.player1_rounds_won >= C.ROUNDS_TO_WIN or self.player2_rounds_won >= C.ROUNDS_TO_WIN:
                 match_winner = 1 if self.player1_rounds_won > self.player2_rounds_won else 2
-                print(f"Match Over! Winner: Player {match_winner}")
-                from .game_over_view import GameOverView # Import here
-                game_over_view = GameOverView(winner=match_winner)
-                self.window.show_view(game_over_view)
+                self.end_match(match_winner)
             else:
                 # Start next round
                 self.round_number += 1
@@ -0,0 +1,151 @@
+"""
+Offscreen caching for layers that rarely change.
+
+Each layer is rendered once into its own framebuffer texture and composited
+afterwards as one textured quad. A layer is re-rendered only when its key
+changes (the caller puts whatever the layer depends on into the key) or when
+the target's framebuffer size changes. Layers that only fade, like the menu's
+pulsing symbol, keep their texture and get their alpha as a uniform at
+composite time.
+
+Layers are stored with premultiplied alpha, so a transparent layer composites
+the same way it would have drawn directly. render() runs with a separate alpha
+blend function. Shapes and arcade.Text follow that function. Sprite lists must
+pass `cache.blend` as their blend_function.
+"""
+from typing import Callable, Dict, Hashable, Optional, Tuple
+import arcade
+from arcade.gl import geometry
+from arcade.types import LBWH, LRBT
+
+_VERTEX_SHADER = """
+#version 330
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 uv;
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    uv = in_uv;
+}
+"""
+
+_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D layer;
+uniform float alpha;
+in vec2 uv;
+out vec4 color;
+void main() {
+    color = texture(layer, uv) * alpha;
+}
+"""
+
+
+class TextureQuad:
+    """Draws a texture over the whole current viewport as one quad"""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.program = ctx.program(vertex_shader=_VERTEX_SHADER, fragment_shader=_FRAGMENT_SHADER)
+        self.geometry = geometry.quad_2d_fs()
+
+    def draw(self, texture, alpha: float = 1.0, blend: bool = True):
+        """Composite a premultiplied texture, or copy it as is with blend=False"""
+        ctx = self.ctx
+        previous = ctx.blend_func
+        if blend:
+            ctx.enable(ctx.BLEND)
+            ctx.blend_func = ctx.ONE, ctx.ONE_MINUS_SRC_ALPHA
+        else:
+            ctx.disable(ctx.BLEND)
+        texture.use(0)
+        self.program["alpha"] = max(0.0, min(1.0, alpha))
+        self.geometry.render(self.program)
+        ctx.enable(ctx.BLEND)
+        ctx.blend_func = previous
+
+
+class Layer:
+    """One cached layer: its framebuffer and the key it was rendered with"""
+    __slots__ = ("name", "key", "size", "texture", "fbo", "camera")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.key: Optional[Hashable] = None
+        self.size: Tuple[int, int] = (0, 0)
+        self.texture = None
+        self.fbo = None
+        self.camera: Optional[arcade.camera.Camera2D] = None
+
+
+class LayerCache:
+    """Named offscreen layers re-rendered only when their key changes"""
+
+    def __init__(self, target):
+        # An arcade.Window or a VirtualScreen: anything with ctx, get_size()
+        # (drawing coordinates) and get_framebuffer_size() (texture pixels)
+        self.target = target
+        self.ctx = target.ctx
+        # Colour as usual, alpha accumulated so the texture ends up premultiplied
+        self.blend = (self.ctx.SRC_ALPHA, self.ctx.ONE_MINUS_SRC_ALPHA,
+                      self.ctx.ONE, self.ctx.ONE_MINUS_SRC_ALPHA)
+        self.layers: Dict[str, Layer] = {}
+        self.renders = 0  # total layer re-renders, for tests and the debug overlay
+        self._quad = TextureQuad(self.ctx)
+
+    def draw(self, name: str, render: Callable[[], None], key: Hashable = None,
+             alpha: float = 1.0):
+        """Composite a layer, calling render() into its texture first if it is stale"""
+        layer = self.layers.get(name)
+        if layer is None:
+            layer = self.layers[name] = Layer(name)
+        size = self.target.get_framebuffer_size()
+        if layer.size != size:
+            self._allocate(layer, size)
+        elif layer.key == key:
+            self._composite(layer, alpha)
+            return
+        self._render(layer, render)
+        layer.key = key
+        self._composite(layer, alpha)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Force a re-render of one layer, or of all of them"""
+        if name is None:
+            stale = list(self.layers.values())
+        else:
+            stale = [self.layers[name]] if name in self.layers else []
+        for layer in stale:
+            layer.size = (0, 0)  # reallocated and re-rendered on its next draw
+
+    def release(self):
+        """Drop every layer texture (e.g. when the view is hidden)"""
+        self.layers.clear()
+
+    def _allocate(self, layer: Layer, size: Tuple[int, int]):
+        width, height = self.target.get_size()
+        layer.size = size
+        layer.texture = self.ctx.texture(size, components=4)
+        layer.fbo = self.ctx.framebuffer(color_attachments=[layer.texture])
+        # Draw in target coordinates whatever the framebuffer's pixel size
+        layer.camera = arcade.camera.Camera2D(
+            viewport=LBWH(0, 0, *size),
+            projection=LRBT(-width / 2, width / 2, -height / 2, height / 2),
+            position=(width / 2, height / 2),
+            render_target=layer.fbo,
+        )
+
+    def _render(self, layer: Layer, render: Callable[[], None]):
+        ctx = self.ctx
+        previous = ctx.blend_func
+        with layer.camera.activate():
+            layer.fbo.clear(color=(0, 0, 0, 0))
+            ctx.blend_func = self.blend
+            try:
+                render()
+            finally:
+                ctx.blend_func = previous
+        self.renders += 1
+
+    def _composite(self, layer: Layer, alpha: float):
+        self._quad.draw(layer.texture, alpha)
@@ -0,0 +1,147 @@
+"""
+Retained menus: buttons are built once and drawn in two calls.
+
+A Menu keeps its buttons' geometry between frames. Every face and shadow quad
+goes into one ShapeElementList (one vertex buffer) and every label into one
+pyglet batch, so a menu costs the same to draw whatever its button count.
+Pressing a button rebuilds only the quads. Relabelling touches only that
+label.
+
+Hit testing goes through a grid of C.MENU_HIT_CELL pixel cells, filled at build
+time. Each cell lists the buttons overlapping it, so a click checks at most a
+couple of rectangles. Buttons carry an action ID, and the view binds IDs to
+handlers. Labels can therefore change ("Fullscreen: ON") without touching
+dispatch.
+
+MenuTree builds a menu the first time it is shown. Layouts read
+C.SCREEN_WIDTH/HEIGHT when called, so invalidate() after a resolution change
+drops every built menu and they are laid out again on demand.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import arcade
+import pyglet.graphics
+from arcade.shape_list import ShapeElementList, create_rectangle_filled
+from .. import constants as C
+
+
+class MenuButton:
+    """A button's layout and style; drawing is done by its Menu"""
+    __slots__ = ("action", "text", "center_x", "center_y", "width", "height",
+                 "font_size", "font_color", "face_color", "shadow_color",
+                 "button_height", "pressed")
+
+    def __init__(self, action: str, text: str, center_x: float, center_y: float,
+                 width: float = C.BUTTON_WIDTH, height: float = C.BUTTON_HEIGHT,
+                 font_size: int = 24, font_color=arcade.color.WHITE,
+                 face_color=arcade.color.DARK_BLUE_GRAY, shadow_color=arcade.color.BLACK,
+                 button_height: int = 2):
+        self.action = action
+        self.text = text
+        self.center_x = center_x
+        self.center_y = center_y
+        self.width = width
+        self.height = height
+        self.font_size = font_size
+        self.font_color = font_color
+        self.face_color = face_color
+        self.shadow_color = shadow_color
+        self.button_height = button_height
+        self.pressed = False
+
+    def contains(self, x: float, y: float) -> bool:
+        return (self.center_x - self.width / 2 < x < self.center_x + self.width / 2 and
+                self.center_y - self.height / 2 < y < self.center_y + self.height / 2)
+
+
+class Menu:
+    """One menu's buttons, their batched geometry and hit grid"""
+
+    def __init__(self, buttons: List[MenuButton], cell: int = C.MENU_HIT_CELL):
+        self.buttons = buttons
+        self.cell = cell
+        self.by_action: Dict[str, MenuButton] = {b.action: b for b in buttons}
+        self.version = 0  # bumped whenever what draw() shows changes
+        self.batch = pyglet.graphics.Batch()
+        self.labels: Dict[str, arcade.Text] = {}
+        for button in buttons:
+            self.labels[button.action] = arcade.Text(
+                button.text, button.center_x, button.center_y,
+                button.font_color, button.font_size,
+                align="center", anchor_x="center", anchor_y="center",
+                batch=self.batch
+            )
+        self.grid: Dict[Tuple[int, int], List[MenuButton]] = {}
+        for button in buttons:
+            left, bottom = self._cell(button.center_x - button.width / 2,
+                                      button.center_y - button.height / 2)
+            right, top = self._cell(button.center_x + button.width / 2,
+                                    button.center_y + button.height / 2)
+            for cx in range(left, right + 1):
+                for cy in range(bottom, top + 1):
+                    self.grid.setdefault((cx, cy), []).append(button)
+        self.shapes: Optional[ShapeElementList] = None
+        self._build_quads()
+
+    def draw(self):
+        self.shapes.draw()
+        self.batch.draw()
+
+    def hit(self, x: float, y: float) -> Optional[MenuButton]:
+        """The button under (x, y), if any"""
+        for button in self.grid.get(self._cell(x, y), ()):
+            if button.contains(x, y):
+                return button
+        return None
+
+    def press(self, button: MenuButton):
+        if not button.pressed:
+            button.pressed = True
+            self._build_quads()
+
+    def release(self):
+        if any(button.pressed for button in self.buttons):
+            for button in self.buttons:
+                button.pressed = False
+            self._build_quads()
+
+    def set_label(self, action: str, text: str):
+        button = self.by_action[action]
+        if button.text != text:
+            button.text = text
+            self.labels[action].text = text
+            self.version += 1
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x // self.cell), int(y // self.cell)
+
+    def _build_quads(self):
+        shapes = ShapeElementList()
+        for b in self.buttons:
+            shapes.append(create_rectangle_filled(
+                b.center_x, b.center_y, b.width, b.height, b.face_color))
+            if not b.pressed:
+                shapes.append(create_rectangle_filled(
+                    b.center_x, b.center_y + b.button_height / 2,
+                    b.width, b.button_height, b.shadow_color))
+        self.shapes = shapes
+        self.version += 1
+
+
+class MenuTree:
+    """Menus by name, each laid out on first use"""
+
+    def __init__(self, layouts: Dict[str, Callable[[], List[MenuButton]]]):
+        self.layouts = layouts
+        self.menus: Dict[str, Menu] = {}
+        self.builds = 0
+
+    def get(self, name: str) -> Optional[Menu]:
+        menu = self.menus.get(name)
+        if menu is None and name in self.layouts:
+            menu = self.menus[name] = Menu(self.layouts[name]())
+            self.builds += 1
+        return menu
+
+    def invalidate(self):
+        """Forget every built menu (e.g. after a resolution change)"""
+        self.menus.clear()
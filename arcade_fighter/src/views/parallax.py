@@ -0,0 +1,72 @@
+"""
+Layered stage background with drifting clouds.
+
+Layers from C.PARALLAX_LAYERS are stretched to the screen and drawn back to
+front from one SpriteList. A drifting layer has two side-by-side copies that
+wrap around. set_layer_count() keeps the layers with the lowest priority
+numbers and takes the others out of the list. Dropped layers then cost no
+fill rate, which is what the quality governor is after on weak GPUs.
+"""
+from typing import List, Sequence, Tuple
+import arcade
+from .. import constants as C
+from ..assets import get_asset_registry
+
+
+class ParallaxLayer:
+    __slots__ = ("speed", "priority", "sprites", "offset")
+
+    def __init__(self, texture: arcade.Texture, speed: float, priority: int):
+        self.speed = speed
+        self.priority = priority
+        self.sprites = [arcade.Sprite(texture) for _ in range(2 if speed else 1)]
+        self.offset = 0.0
+
+
+class ParallaxBackground:
+    """Screen-filling stage layers, some of them drifting"""
+
+    def __init__(self, layers: Sequence[Tuple[str, float, int]] = C.PARALLAX_LAYERS,
+                 directory: str = C.PARALLAX_DIR):
+        registry = get_asset_registry()
+        self.layers: List[ParallaxLayer] = [
+            ParallaxLayer(registry.texture(directory + name), speed, priority)
+            for name, speed, priority in layers
+        ]
+        self.sprite_list = arcade.SpriteList()
+        self.layer_count = len(self.layers)
+        self.resize()
+        self.set_layer_count(self.layer_count)
+
+    def resize(self):
+        """Fit every layer to the current screen size"""
+        for layer in self.layers:
+            for sprite in layer.sprites:
+                sprite.width = C.SCREEN_WIDTH
+                sprite.height = C.SCREEN_HEIGHT
+            self._place(layer)
+
+    def set_layer_count(self, count: int):
+        """Draw only the `count` most important layers"""
+        self.layer_count = max(1, min(len(self.layers), count))
+        keep = sorted(layer.priority for layer in self.layers)[self.layer_count - 1]
+        self.sprite_list.clear()
+        for layer in self.layers:
+            if layer.priority <= keep:
+                self.sprite_list.extend(layer.sprites)
+
+    def update(self, delta_time: float):
+        """Drift layers left; speeds are in source pixels, scaled to the screen"""
+        scale = C.SCREEN_WIDTH / self.layers[0].sprites[0].texture.width
+        for layer in self.layers:
+            if layer.speed:
+                layer.offset = (layer.offset + layer.speed * scale * delta_time) % C.SCREEN_WIDTH
+                self._place(layer)
+
+    def draw(self):
+        self.sprite_list.draw(pixelated=True)
+
+    def _place(self, layer: ParallaxLayer):
+        for i, sprite in enumerate(layer.sprites):
+            sprite.center_x = C.SCREEN_WIDTH / 2 - layer.offset + i * C.SCREEN_WIDTH
+            sprite.center_y = C.SCREEN_HEIGHT / 2
@@ -0,0 +1,113 @@
+import arcade
+from .. import constants as C
+from ..assets import get_asset_registry
+from ..roster import get_roster
+from .app_context import get_app_context
+from .virtual_screen import get_virtual_screen
+
+
+class CharacterSelectView(arcade.View):
+    """
+    Character select screen.
+
+    Only roster manifests are used here; textures are decoded when the chosen
+    characters are built in GameView.setup().
+    """
+
+    def __init__(self, debug_mode: bool = False):
+        super().__init__()
+        self.screen = get_virtual_screen(self.window)
+        self.debug_mode = debug_mode
+        self.roster = get_roster()
+        self.choices = self.roster.ids
+        self.cursor = [0, min(1, len(self.choices) - 1)]  # kept between visits
+        self.confirmed = [False, False]
+
+        self.title = arcade.Text(
+            "CHOOSE YOUR FIGHTER",
+            C.SCREEN_WIDTH / 2,
+            C.SCREEN_HEIGHT - 120,
+            C.BONE_WHITE,
+            C.FONT_SIZE_BUTTON,
+            anchor_x="center",
+            font_name=C.FONT_PRIMARY
+        )
+        self.hint = arcade.Text(
+            "P1: A/D + F    P2: LEFT/RIGHT + RCTRL    ESC: Back",
+            C.SCREEN_WIDTH / 2,
+            60,
+            C.BONE_WHITE,
+            C.FONT_SIZE_SMALL,
+            anchor_x="center"
+        )
+        self.name_texts = [
+            arcade.Text("", C.SCREEN_WIDTH * 0.25, C.SCREEN_HEIGHT / 2,
+                        C.BONE_WHITE, C.FONT_SIZE_BUTTON, anchor_x="center"),
+            arcade.Text("", C.SCREEN_WIDTH * 0.75, C.SCREEN_HEIGHT / 2,
+                        C.BONE_WHITE, C.FONT_SIZE_BUTTON, anchor_x="center")
+        ]
+        self._refresh_names()
+
+    def reset(self, debug_mode: bool = False):
+        """Reuse the screen for another pick; cursors stay where they were"""
+        self.debug_mode = debug_mode
+        self.confirmed = [False, False]
+        self._refresh_names()
+
+    def _refresh_names(self):
+        """Update the name labels under each player's cursor"""
+        for player, text in enumerate(self.name_texts):
+            manifest = self.roster.manifest(self.choices[self.cursor[player]])
+            prefix = f"P{player + 1}: "
+            text.text = prefix + manifest.name
+            text.color = C.BLOOD_RED if self.confirmed[player] else C.BONE_WHITE
+
+    def on_show_view(self):
+        """ Called when switching to this view """
+        arcade.set_background_color(C.OBSIDIAN)
+        get_asset_registry().enter_view("select")
+
+    def on_draw(self):
+        """ Draw this view """
+        with self.screen.activate():
+            self.screen.clear()
+            self.title.draw()
+            for text in self.name_texts:
+                text.draw()
+            self.hint.draw()
+        self.screen.present()
+
+    def _step(self, player: int, direction: int):
+        """Move a player's cursor unless they have already confirmed"""
+        if not self.confirmed[player]:
+            self.cursor[player] = (self.cursor[player] + direction) % len(self.choices)
+            self._refresh_names()
+
+    def _confirm(self, player: int):
+        """Lock in a player's pick and start the match once both are locked"""
+        self.confirmed[player] = True
+        self._refresh_names()
+        if all(self.confirmed):
+            self.start_game()
+
+    def on_key_press(self, key, modifiers):
+        """ Handle keyboard input """
+        if key == C.KEY_LEFT_P1:
+            self._step(0, -1)
+        elif key == C.KEY_RIGHT_P1:
+            self._step(0, 1)
+        elif key == C.KEY_ATTACK_P1:
+            self._confirm(0)
+        elif key == C.KEY_LEFT_P2:
+            self._step(1, -1)
+        elif key == C.KEY_RIGHT_P2:
+            self._step(1, 1)
+        elif key == C.KEY_ATTACK_P2:
+            self._confirm(1)
+        elif key == arcade.key.ESCAPE:
+            get_app_context(self.window).show_menu()
+
+    def start_game(self):
+        """ Start the match with the picked characters """
+        C.DEBUG_MODE = self.debug_mode
+        get_app_context(self.window).start_match(self.choices[self.cursor[0]], self.choices[self.cursor[1]])
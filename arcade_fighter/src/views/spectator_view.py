@@ -0,0 +1,95 @@
+import arcade
+from .. import constants as C
+from ..character import Character
+from ..fighter_state import STATE_ANIMATIONS
+from ..net.spectator import FIGHTER_FIELDS, HEADER_FIELDS, PROJECTILE_FIELDS, SpectatorClient
+from ..projectiles import ProjectilePool
+from .virtual_screen import get_virtual_screen
+
+
+class SpectatorView(arcade.View):
+    """
+    Read-only view of a streamed match.
+
+    Sprites are posed straight from the received state (position, facing,
+    animation frame); nothing is simulated locally.
+    The client may also be a ReplayReader, which has the same attributes.
+    """
+
+    def __init__(self, client: SpectatorClient):
+        super().__init__()
+        self.client = client
+        self.match_info = None
+        self.players = []
+        self.player_list = arcade.SpriteList()
+        self.projectiles = None
+        self.screen = get_virtual_screen(self.window)
+        self.status = arcade.Text("Waiting for match...", C.SCREEN_WIDTH / 2, C.SCREEN_HEIGHT - 40,
+                                  arcade.color.WHITE, C.UI_FONT_SIZE, anchor_x="center")
+
+    def on_show_view(self):
+        arcade.set_background_color(arcade.csscolor.CORNFLOWER_BLUE)
+
+    def _build(self, info: dict):
+        """Create sprites for the characters named in the match info"""
+        self.match_info = info
+        self.players = [
+            Character(player_num=n + 1, scale=C.CHARACTER_SCALING, character_id=char_id)
+            for n, char_id in enumerate(info.get("characters", []))
+        ]
+        self.player_list = arcade.SpriteList()
+        for player in self.players:
+            self.player_list.append(player)
+        if self.projectiles is None:
+            self.projectiles = ProjectilePool()
+
+    def on_update(self, delta_time):
+        client = self.client
+        if client.match_info is not self.match_info and client.match_info is not None:
+            self._build(client.match_info)
+        values = client.values
+        if values is None or not self.players:
+            return
+
+        scale_x = C.SCREEN_WIDTH / self.match_info.get("width", C.SCREEN_WIDTH)
+        _tick, round_number, p1_rounds, p2_rounds = values[:HEADER_FIELDS]
+        offset = HEADER_FIELDS
+        for player in self.players:
+            x, bottom, hp, state, facing, attack_index, frame = values[offset:offset + FIGHTER_FIELDS]
+            offset += FIGHTER_FIELDS
+            fighter = player.fighter
+            fighter.hp, fighter.state, fighter.facing, fighter.attack_index = hp, state, facing, attack_index
+            anim_name = STATE_ANIMATIONS[state]
+            if anim_name is None:
+                anim_name = player.attack_animations[attack_index % len(player.attack_animations)]
+            frames = player.animations[anim_name]
+            player.set_frame(anim_name, min(frame, len(frames) - 1))
+            player.center_x = x * scale_x
+            player.bottom = bottom
+
+        count = values[offset]
+        offset += 1
+        arrows = values[offset:offset + count * PROJECTILE_FIELDS]
+        self.projectiles.show(
+            (arrows[i] * scale_x, arrows[i + 1], arrows[i + 2])
+            for i in range(0, len(arrows), PROJECTILE_FIELDS)
+        )
+        self.status.text = f"Round {round_number}   P1 {p1_rounds} - {p2_rounds} P2   HP {self.players[0].hp} / {self.players[1].hp}"
+
+    def on_draw(self):
+        with self.screen.activate():
+            self.draw_scene()
+        self.screen.present()
+
+    def draw_scene(self):
+        """Draw the posed match into the canvas (also used by frame export)"""
+        self.screen.clear()
+        arcade.draw_lrbt_rectangle_filled(0, C.SCREEN_WIDTH, 0, C.FLOOR_TOP, arcade.color.DARK_SPRING_GREEN)
+        self.player_list.draw()
+        if self.projectiles:
+            self.projectiles.draw()
+        self.status.draw()
+
+    def on_key_press(self, key, modifiers):
+        if key == arcade.key.ESCAPE:
+            arcade.exit()
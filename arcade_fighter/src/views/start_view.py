@@ -5,77 +5,13 @@ import math
 from typing import Optional
 from .. import constants as C
 from .button_factory import ButtonFactory
+from .app_context import get_app_context
 from .asset_manager import AssetManager
-
-class TextButton:
-    """ Complete text button implementation """
-    def __init__(self, center_x, center_y, width, height, text, font_size=18,
-                font_color=arcade.color.WHITE, face_color=arcade.color.DARK_BLUE_GRAY,
-                highlight_color=arcade.color.LIGHT_BLUE, shadow_color=arcade.color.BLACK,
-                button_height=2):
-        self.center_x = center_x
-        self.center_y = center_y
-        self.width = width
-        self.height = height
-        self.text = text
-        self.font_size = font_size
-        self.font_color = font_color
-        self.face_color = face_color
-        self.highlight_color = highlight_color
-        self.shadow_color = shadow_color
-        self.button_height = button_height
-        self.pressed = False
-        self._text_obj = None
-        self.create_text()
-
-    def create_text(self):
-        """ Create cached text object """
-        self._text_obj = arcade.Text(
-            self.text, self.center_x, self.center_y,
-            self.font_color, self.font_size,
-            align="center", anchor_x="center", anchor_y="center"
-        )
-
-    def draw(self):
-        """ Draw the button """
-        arcade.draw_lrbt_rectangle_filled(
-            self.center_x - self.width/2, self.center_x + self.width/2,
-            self.center_y - self.height/2, self.center_y + self.height/2,
-            self.face_color)
-
-        if not self.pressed:
-            arcade.draw_lrbt_rectangle_filled(
-                self.center_x - self.width/2, self.center_x + self.width/2,
-                self.center_y, self.center_y + self.button_height,
-                self.shadow_color)
-
-        self._text_obj.draw()
-
-    def on_press(self):
-        self.pressed = True
-
-    def on_release(self):
-        self.pressed = False
-
-    def check_mouse_press(self, x, y):
-        """ Check if mouse click is within button bounds """
-        if (x > self.center_x - self.width/2 and
-            x < self.center_x + self.width/2 and
-            y > self.center_y - self.height/2 and
-            y < self.center_y + self.height/2):
-            self.on_press()
-            return True
-        return False
-
-    def check_mouse_release(self, x, y):
-        """ Check if mouse release is within button bounds """
-        if self.pressed:
-            self.on_release()
-            return (x > self.center_x - self.width/2 and
-                    x < self.center_x + self.width/2 and
-                    y > self.center_y - self.height/2 and
-                    y < self.center_y + self.height/2)
-        return False
+from .layer_cache import LayerCache
+from .menu import MenuTree
+from .virtual_screen import get_virtual_screen
+from ..assets import get_asset_registry
+from ..quality import QualityLevel, get_quality_governor
 
 class StartView(arcade.View):
     """ Optimized main menu view for FHD """
@@ -85,8 +21,15 @@ class StartView(arcade.View):
         self.menu_state = C.MENU_MAIN
         self.buttons = []
         self.asset_manager = AssetManager()
+        self.registry = get_asset_registry()
         self.flicker_timer = 0
         self.symbol_alpha = 0
+        self.screen = get_virtual_screen(self.window)
+        self.layers: Optional[LayerCache] = None  # created when first shown
+        self.quality = get_quality_governor()
+        self.particles = arcade.SpriteList()  # filled by the quality listener
+        self.background = None  # built on first show; later shows only swap its texture
+        self.background_sprites = arcade.SpriteList()
         
         # Create title with custom font
         self.title = arcade.Text(
@@ -99,81 +42,62 @@ class StartView(arcade.View):
             font_name=C.FONT_PRIMARY
         )
         
-        self.setup_menus()
-        
-    def setup_menus(self):
-        """ Create buttons for all menu states """
-        # Main Menu
-        self.main_menu_buttons = [
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 + 50,
-                "New Game",
-                "main"
-            ),
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2,
-                "Options",
-                "main"
-            ),
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 - 50,
-                "Exit",
-                "main"
-            )
-        ]
-        
-        # Options Menu
-        self.options_menu_buttons = [
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 + 100,
-                "Video",
-                "options"
-            ),
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 + 50,
-                "Audio",
-                "options"
-            ),
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2,
-                "Music",
-                "options"
-            ),
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 - 50,
-                "Back",
-                "options"
-            )
-        ]
-        
-        # Video Settings Menu
-        self.video_menu_buttons = [
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 + 150,
-                "SD (800x600)",
-                "video"
-            ),
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 + 100,
-                "HD (1280x720)",
-                "video"
-            ),
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 + 50,
-                "FHD (1920x1080)",
-                "video"
-            ),
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2,
-                "Fullscreen: ON" if C.FULLSCREEN else "Fullscreen: OFF",
-                "video"
-            ),
-            ButtonFactory.create_menu_button(
-                C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 - 50,
-                "Back",
-                "video"
-            )
-        ]
+        self.menus = MenuTree({
+            C.MENU_MAIN: self.layout_main_menu,
+            C.MENU_OPTIONS: self.layout_options_menu,
+            C.MENU_VIDEO: self.layout_video_menu,
+            C.MENU_MODE_SELECT: self.layout_mode_select,
+        })
+        # Button action IDs -> handlers ("audio" and "music" have none yet)
+        self.actions = {
+            "new_game": self.show_game_mode_selection,
+            "options": lambda: self.show_menu(C.MENU_OPTIONS),
+            "exit": arcade.exit,
+            "video": lambda: self.show_menu(C.MENU_VIDEO),
+            "back_main": lambda: self.show_menu(C.MENU_MAIN),
+            "back_options": lambda: self.show_menu(C.MENU_OPTIONS),
+            "res_sd": lambda: self.set_resolution("SD"),
+            "res_hd": lambda: self.set_resolution("HD"),
+            "res_fhd": lambda: self.set_resolution("FHD"),
+            "fullscreen": self.toggle_fullscreen,
+            "mode_standard": lambda: self.start_game(debug_mode=False),
+            "mode_debug": lambda: self.start_game(debug_mode=True),
+        }
+
+    def layout_main_menu(self):
+        return ButtonFactory.create_menu_column([
+            ("new_game", "New Game"),
+            ("options", "Options"),
+            ("exit", "Exit"),
+        ], "main")
+
+    def layout_options_menu(self):
+        return ButtonFactory.create_menu_column([
+            ("video", "Video"),
+            ("audio", "Audio"),
+            ("music", "Music"),
+            ("back_main", "Back"),
+        ], "options")
+
+    def layout_video_menu(self):
+        return ButtonFactory.create_menu_column([
+            ("res_sd", "SD (800x600)"),
+            ("res_hd", "HD (1280x720)"),
+            ("res_fhd", "FHD (1920x1080)"),
+            ("fullscreen", self.fullscreen_label()),
+            ("back_options", "Back"),
+        ], "video")
+
+    def layout_mode_select(self):
+        return ButtonFactory.create_menu_column([
+            ("mode_standard", "Standard Mode", "confirm"),
+            ("mode_debug", "Debug Mode", "debug"),
+            ("back_main", "Back"),
+        ], C.MENU_MODE_SELECT)
+
+    @staticmethod
+    def fullscreen_label():
+        return "Fullscreen: ON" if C.FULLSCREEN else "Fullscreen: OFF"
 
     def create_debug_button(self):
         """Create debug mode toggle button"""
@@ -198,35 +122,42 @@ class StartView(arcade.View):
         
     def on_show_view(self):
         """ Called when switching to this view """
+        # Textures fetched from here on stay resident while the menu shows
+        self.registry.enter_view("menu")
+        if self.layers is None:
+            self.layers = LayerCache(self.screen)
         self.setup_background()
-        self.window.set_fullscreen(C.FULLSCREEN)
+        if hasattr(self, 'symbol'):
+            self.symbol.texture = self.asset_manager.occult_symbol
+        self.quality.remove_listener(self.apply_quality)
+        self.quality.on_change(self.apply_quality)
+        if self.window.fullscreen != C.FULLSCREEN:
+            self.window.set_fullscreen(C.FULLSCREEN)
         self.menu_state = C.MENU_MAIN
         
-        # Start random music if not already playing
-        if not self.asset_manager.music_player or not self.asset_manager.music_player.playing:
-            self.asset_manager.play_random_music(C.MUSIC_FILES)
-            
-        # Resume music if returning to view
-        elif self.asset_manager.music_player and not self.asset_manager.music_player.playing:
-            self.asset_manager.resume_music()
+        # Menu music (crossfades in from the fight playlist when returning)
+        self.asset_manager.play_playlist("menu")
 
     def setup_background(self):
-        """ Setup static background image """
-        self.background_sprites = arcade.SpriteList()
-        import random
-        bg_image = random.choice(C.BACKGROUND_IMAGES)
-        self.background = arcade.Sprite(
-            bg_image,
-            center_x=C.SCREEN_WIDTH/2,
-            center_y=C.SCREEN_HEIGHT/2,
-            image_width=C.SCREEN_WIDTH,
-            image_height=C.SCREEN_HEIGHT
-        )
-        self.background_sprites.append(self.background)
-        
-        # Optimized particle effects
-        self.particles = arcade.SpriteList()
-        for _ in range(30):  # Reduced from 50 to 30
+        """ Pick a background image (decoded once, then served by the asset registry) """
+        texture = self.registry.texture(random.choice(C.BACKGROUND_IMAGES))
+        if self.background is None:
+            self.background = arcade.Sprite(
+                texture,
+                center_x=C.SCREEN_WIDTH/2,
+                center_y=C.SCREEN_HEIGHT/2
+            )
+            self.background_sprites.append(self.background)
+        else:
+            self.background.texture = texture
+        self.background.width = C.SCREEN_WIDTH
+        self.background.height = C.SCREEN_HEIGHT
+
+    def set_particle_count(self, count):
+        """ Add or drop background particles """
+        while len(self.particles) > count:
+            self.particles.pop()
+        while len(self.particles) < count:
             particle = arcade.SpriteCircle(
                 radius=1,  # Fixed size for consistency
                 color=(200, 200, 200, 150)  # Semi-transparent gray
@@ -240,139 +171,129 @@ class StartView(arcade.View):
             particle.alpha = 100
             self.particles.append(particle)
 
+    def apply_quality(self, level: QualityLevel):
+        """ Quality governor listener """
+        self.set_particle_count(level.particles)
+        self.screen.set_scale(level.render_scale)
+
     def on_draw(self):
-        """ Draw this view """
-        self.clear()
-        
-        # Dark background base
+        """ Composite the cached menu layers on the canvas, then upscale it """
+        with self.screen.activate():
+            self.draw_menu()
+        self.screen.present()
+
+    def draw_menu(self):
+        """ Draw the menu in canvas coordinates """
+        self.screen.clear()
+
+        # Obsidian base, background and dark overlay. The symbol's vignette is
+        # folded in here and into the symbol layer's tint, so it costs nothing
+        self.layers.draw("base", self.draw_base_layer,
+                         key=(self.background.texture, self.symbol_alpha > 0))
+
+        # Occult symbol: rendered once, the pulse only changes its alpha
+        if self.symbol_alpha > 0:
+            alpha = min(255, max(0, int(self.symbol_alpha * 2.55)))
+            self.layers.draw("symbol", self.draw_symbol_layer, alpha=alpha / 255)
+
+        # Draw particles
+        self.particles.draw()
+
+        # Title with flicker effect; re-rendered only when its colour changes
+        flicker = random.randint(0, 20) if self.flicker_timer <= 0 else 0
+        self.title.color = (
+            max(100, C.BONE_WHITE[0] - flicker),
+            max(100, C.BONE_WHITE[1] - flicker),
+            max(100, C.BONE_WHITE[2] - flicker)
+        )
+        self.layers.draw("title", self.title.draw, key=tuple(self.title.color))
+
+        # Current menu; re-rendered when it is rebuilt, relabelled or pressed
+        menu = self.menus.get(self.menu_state)
+        if menu is not None:
+            self.layers.draw("menu", menu.draw, key=(menu, menu.version))
+
+    def draw_base_layer(self):
+        """ Dark background base, background image and overlays """
         arcade.draw_lrbt_rectangle_filled(
             0, C.SCREEN_WIDTH, 0, C.SCREEN_HEIGHT, C.OBSIDIAN
         )
-        
-        # Draw background with dark overlay
-        self.background_sprites.draw()
+        self.background_sprites.draw(blend_function=self.layers.blend)
         arcade.draw_lrbt_rectangle_filled(
             0, C.SCREEN_WIDTH, 0, C.SCREEN_HEIGHT, (0, 0, 0, 180)
         )
-        
-        # Draw occult symbol (fading in/out)
         if self.symbol_alpha > 0:
-            # Initialize symbol and sprite list if not exists
-            if not hasattr(self, 'symbol'):
-                self.symbol = arcade.Sprite()
-                self.symbol.texture = self.asset_manager.occult_symbol
-                self.symbol_list = arcade.SpriteList()
-                self.symbol_list.append(self.symbol)
-            
-            # Update symbol properties
-            self.symbol.center_x = C.SCREEN_WIDTH/2
-            self.symbol.center_y = C.SCREEN_HEIGHT/2
-            self.symbol.width = C.SCREEN_WIDTH * C.OCCULT_SYMBOL_SCALE
-            self.symbol.height = C.SCREEN_WIDTH * C.OCCULT_SYMBOL_SCALE
-            self.symbol.alpha = min(255, max(0, int(self.symbol_alpha * 2.55)))
-            
-            # Draw symbol via sprite list
-            self.symbol_list.draw()
-            
-            # Add subtle vignette effect
+            # Subtle vignette while the symbol shows
             arcade.draw_lrbt_rectangle_filled(
                 0, C.SCREEN_WIDTH, 0, C.SCREEN_HEIGHT,
-                (0, 0, 0, 30)
+                (0, 0, 0, C.MENU_VIGNETTE_ALPHA)
             )
-        
-        # Draw particles
-        self.particles.draw()
-        
-        # Draw title with flicker effect
-        flicker = random.randint(0, 20) if self.flicker_timer <= 0 else 0
-        self.title.color = (
-            max(100, C.BONE_WHITE[0] - flicker),
-            max(100, C.BONE_WHITE[1] - flicker),
-            max(100, C.BONE_WHITE[2] - flicker)
-        )
-        self.title.draw()
-        
-        # Draw current menu buttons
-        if self.menu_state == C.MENU_MAIN:
-            for button in self.main_menu_buttons:
-                button.draw()
-        elif self.menu_state == C.MENU_OPTIONS:
-            for button in self.options_menu_buttons:
-                button.draw()
-        elif self.menu_state == C.MENU_VIDEO:
-            for button in self.video_menu_buttons:
-                button.draw()
-        elif self.menu_state == "mode_select":
-            for button in self.mode_select_buttons:
-                button.draw()
+
+    def draw_symbol_layer(self):
+        """ Occult symbol at full opacity; the pulse is applied when compositing """
+        if not hasattr(self, 'symbol'):
+            self.symbol = arcade.Sprite()
+            self.symbol.texture = self.asset_manager.occult_symbol
+            self.symbol_list = arcade.SpriteList()
+            self.symbol_list.append(self.symbol)
+
+        self.symbol.center_x = C.SCREEN_WIDTH/2
+        self.symbol.center_y = C.SCREEN_HEIGHT/2
+        self.symbol.width = C.SCREEN_WIDTH * C.OCCULT_SYMBOL_SCALE
+        self.symbol.height = C.SCREEN_WIDTH * C.OCCULT_SYMBOL_SCALE
+        # Darkened as the vignette drawn over it would have
+        shade = 255 - C.MENU_VIGNETTE_ALPHA
+        self.symbol.color = (shade, shade, shade)
+        self.symbol_list.draw(blend_function=self.layers.blend)
 
     def on_mouse_press(self, x, y, button, modifiers):
-        """ Handle mouse clicks """
-        if self.menu_state == C.MENU_MAIN:
-            for btn in self.main_menu_buttons:
-                if btn.check_mouse_press(x, y):
-                    if btn.text == "New Game":
-                        self.show_game_mode_selection()
-                    elif btn.text == "Options":
-                        self.menu_state = C.MENU_OPTIONS
-                    elif btn.text == "Exit":
-                        arcade.exit()
-        
-        elif self.menu_state == "mode_select":
-            for btn in self.mode_select_buttons:
-                if btn.check_mouse_press(x, y):
-                    if btn.text == "Standard Mode":
-                        self.start_game(debug_mode=False)
-                    elif btn.text == "Debug Mode":
-                        self.start_game(debug_mode=True)
-                    elif btn.text == "Back":
-                        self.menu_state = C.MENU_MAIN
-        
-        elif self.menu_state == C.MENU_OPTIONS:
-            for btn in self.options_menu_buttons:
-                if btn.check_mouse_press(x, y):
-                    if btn.text == "Video":
-                        self.menu_state = C.MENU_VIDEO
-                    elif btn.text == "Back":
-                        self.menu_state = C.MENU_MAIN
-        
-        elif self.menu_state == C.MENU_VIDEO:
-            for btn in self.video_menu_buttons:
-                if btn.check_mouse_press(x, y):
-                    if btn.text.startswith("SD"):
-                        self.set_resolution("SD")
-                    elif btn.text.startswith("HD"):
-                        self.set_resolution("HD")
-                    elif btn.text.startswith("FHD"):
-                        self.set_resolution("FHD")
-                    elif btn.text.startswith("Fullscreen"):
-                        self.toggle_fullscreen()
-                    elif btn.text == "Back":
-                        self.menu_state = C.MENU_OPTIONS
+        """ Press the button under the cursor and run its action """
+        x, y = self.screen.to_virtual(x, y)
+        menu = self.menus.get(self.menu_state)
+        pressed = menu.hit(x, y) if menu is not None else None
+        if pressed is None:
+            return
+        menu.press(pressed)
+        action = self.actions.get(pressed.action)
+        if action:
+            action()
+
+    def on_mouse_release(self, x, y, button, modifiers):
+        menu = self.menus.get(self.menu_state)
+        if menu is not None:
+            menu.release()
+
+    def show_menu(self, name):
+        """ Switch menus; the one being left drops its pressed state """
+        menu = self.menus.menus.get(self.menu_state)
+        if menu is not None:
+            menu.release()
+        self.menu_state = name
 
     def on_key_press(self, key, modifiers):
         """ Handle keyboard input """
-        if key == arcade.key.ENTER and self.menu_state == C.MENU_MAIN:
+        if key == C.KEY_ASSET_REPORT:
+            print(self.registry.report())
+        elif key == arcade.key.ENTER and self.menu_state == C.MENU_MAIN:
             self.start_game()
         elif key == arcade.key.ESCAPE:
             if self.menu_state == C.MENU_OPTIONS:
-                self.menu_state = C.MENU_MAIN
+                self.show_menu(C.MENU_MAIN)
             elif self.menu_state == C.MENU_VIDEO:
-                self.menu_state = C.MENU_OPTIONS
+                self.show_menu(C.MENU_OPTIONS)
 
     def toggle_fullscreen(self):
         """ Toggle fullscreen mode """
         C.FULLSCREEN = not C.FULLSCREEN
         self.window.set_fullscreen(C.FULLSCREEN)
         
-        # Update fullscreen button text
-        for button in self.video_menu_buttons:
-            if button.text.startswith("Fullscreen"):
-                button.text = "Fullscreen: ON" if C.FULLSCREEN else "Fullscreen: OFF"
-                break
+        # Update fullscreen button text (if the video menu has been built)
+        video = self.menus.menus.get(C.MENU_VIDEO)
+        if video is not None:
+            video.set_label("fullscreen", self.fullscreen_label())
 
     def set_resolution(self, res_key):
-        """ Change screen resolution and update all dependent values """
+        """ Change the window size; menus and background stay as built """
         was_fullscreen = C.FULLSCREEN
         if was_fullscreen:
             self.window.set_fullscreen(False)
@@ -381,55 +302,23 @@ class StartView(arcade.View):
         C.set_resolution(res_key)
         
         # Apply window size changes
-        self.window.set_size(C.SCREEN_WIDTH, C.SCREEN_HEIGHT)
+        self.window.set_size(C.WINDOW_WIDTH, C.WINDOW_HEIGHT)
         
         if was_fullscreen:
             self.window.set_fullscreen(True)
-            
-        # Update all UI elements
-        self.setup_menus()
-        self.setup_background()
 
     def show_game_mode_selection(self):
         """Show game mode selection buttons"""
-        self.menu_state = "mode_select"
-        
-        # Create mode selection buttons if they don't exist
-        if not hasattr(self, 'mode_select_buttons'):
-            self.mode_select_buttons = [
-                TextButton(
-                    C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 + 50,
-                    C.BUTTON_WIDTH, C.BUTTON_HEIGHT,
-                    "Standard Mode",
-                    font_size=24,
-                    face_color=arcade.color.DARK_GREEN
-                ),
-                TextButton(
-                    C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2,
-                    C.BUTTON_WIDTH, C.BUTTON_HEIGHT,
-                    "Debug Mode",
-                    font_size=24,
-                    face_color=arcade.color.DARK_RED
-                ),
-                TextButton(
-                    C.SCREEN_WIDTH/2, C.SCREEN_HEIGHT/2 - 50,
-                    C.BUTTON_WIDTH, C.BUTTON_HEIGHT,
-                    "Back",
-                    font_size=24
-                )
-            ]
-    
+        self.show_menu(C.MENU_MODE_SELECT)
+
     def start_game(self, debug_mode=False):
-        """ Start the game """
-        print("Starting GameView...")
-        C.DEBUG_MODE = debug_mode
-        from src.views.game_view import GameView
-        game_view = GameView()
-        self.window.show_view(game_view)
-        game_view.setup()
+        """ Start the game via the character select screen """
+        get_app_context(self.window).show_select(debug_mode)
 
     def on_update(self, delta_time: float):
         """ Animate background elements """
+        self.quality.observe(delta_time)
+
         # Update particles
         self.particles.update()
         
@@ -449,7 +338,10 @@ class StartView(arcade.View):
     def on_mouse_motion(self, x: float, y: float, dx: float, dy: float):
         """ Handle mouse movement """
         pass  # No interactive elements to handle
-                
+
     def on_hide_view(self):
         """Called when leaving this view"""
-        self.asset_manager.pause_music()
\ No newline at end of file
+        # Music keeps playing; the next view picks its playlist and crossfades
+        if self.layers is not None:
+            self.layers.release()
+        self.quality.remove_listener(self.apply_quality)
\ No newline at end of file
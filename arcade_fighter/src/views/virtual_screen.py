@@ -0,0 +1,129 @@
+"""
+Fixed virtual canvas that every view draws into, upscaled in one pass.
+
+Views lay out and draw in C.SCREEN_WIDTH x C.SCREEN_HEIGHT coordinates, the
+canvas of the resolution profile (ARCADE_PROFILE, HD by default). Those values
+never change at runtime. Drawing goes into an offscreen framebuffer of
+canvas size x render scale (the quality level's render_scale). present() then
+copies it to the window as a single letterboxed quad. A bigger or fullscreen
+window costs only that one upscale pass, and resizing the window doesn't
+rebuild any layout.
+
+Per frame:
+    with self.screen.activate():
+        self.screen.clear()
+        ...draw as usual...
+    self.screen.present()
+
+A stage wider than the canvas draws its world (not the HUD) inside
+scrolled(x), which moves the camera over the stage.
+
+Mouse positions arrive in window coordinates, so convert them with
+to_virtual() before hit testing.
+"""
+from contextlib import contextmanager
+from typing import Optional, Tuple
+import arcade
+from arcade.types import LBWH, LRBT
+from .. import constants as C
+from .layer_cache import TextureQuad
+
+
+class VirtualScreen:
+    """Offscreen canvas in layout coordinates"""
+
+    def __init__(self, window: arcade.Window, width: int = C.SCREEN_WIDTH,
+                 height: int = C.SCREEN_HEIGHT, scale: float = 1.0):
+        self.window = window
+        self.ctx = window.ctx
+        self.width = width
+        self.height = height
+        self.scale = 0.0
+        self.texture = None
+        self.fbo = None
+        self.camera: Optional[arcade.camera.Camera2D] = None
+        self.allocations = 0  # framebuffer (re)allocations, for tests
+        self._quad = TextureQuad(self.ctx)
+        self.set_scale(scale)
+
+    # --- Size (LayerCache target protocol) ---
+
+    def get_size(self) -> Tuple[int, int]:
+        """Drawing coordinates"""
+        return self.width, self.height
+
+    def get_framebuffer_size(self) -> Tuple[int, int]:
+        """Pixels actually rendered"""
+        return (max(1, round(self.width * self.scale)),
+                max(1, round(self.height * self.scale)))
+
+    def set_scale(self, scale: float):
+        """Change the internal render resolution (quality governor hook)"""
+        scale = max(C.RENDER_SCALE_MIN, min(1.0, scale))
+        if scale == self.scale:
+            return
+        self.scale = scale
+        size = self.get_framebuffer_size()
+        self.texture = self.ctx.texture(size, components=4,
+                                        filter=(self.ctx.LINEAR, self.ctx.LINEAR))
+        self.fbo = self.ctx.framebuffer(color_attachments=[self.texture])
+        self.camera = arcade.camera.Camera2D(
+            viewport=LBWH(0, 0, *size),
+            projection=LRBT(-self.width / 2, self.width / 2, -self.height / 2, self.height / 2),
+            position=(self.width / 2, self.height / 2),
+            render_target=self.fbo,
+        )
+        self.allocations += 1
+
+    # --- Per frame ---
+
+    @contextmanager
+    def activate(self):
+        """Route drawing into the canvas"""
+        with self.camera.activate():
+            yield self
+
+    @contextmanager
+    def scrolled(self, x: float):
+        """Draw world content with the view scrolled x pixels right (inside activate())"""
+        self.camera.position = (self.width / 2 + x, self.height / 2)
+        self.camera.use()
+        try:
+            yield self
+        finally:
+            self.camera.position = (self.width / 2, self.height / 2)
+            self.camera.use()
+
+    def clear(self, color=None):
+        """Clear the canvas (View.clear() would clear the window instead)"""
+        self.fbo.clear(color=color if color is not None else self.window.background_color)
+
+    def present(self):
+        """Upscale the canvas into the window, letterboxed, with one quad"""
+        screen = self.ctx.screen
+        full = (0, 0, *self.window.get_framebuffer_size())
+        screen.clear(color=C.LETTERBOX_COLOR, viewport=full)
+        screen.use()
+        screen.viewport = self.letterbox(*full[2:])
+        self._quad.draw(self.texture, blend=False)
+        screen.viewport = full
+
+    def letterbox(self, width: float, height: float) -> Tuple[int, int, int, int]:
+        """Largest canvas-shaped rectangle centred in width x height: x, y, w, h"""
+        fit = min(width / self.width, height / self.height)
+        w, h = round(self.width * fit), round(self.height * fit)
+        return (int(width - w) // 2, int(height - h) // 2, w, h)
+
+    def to_virtual(self, x: float, y: float) -> Tuple[float, float]:
+        """Window coordinates (e.g. mouse events) to canvas coordinates"""
+        left, bottom, w, h = self.letterbox(*self.window.get_size())
+        return (x - left) * self.width / w, (y - bottom) * self.height / h
+
+
+def get_virtual_screen(window: Optional[arcade.Window] = None) -> VirtualScreen:
+    """The window's canvas, created on first use"""
+    window = window or arcade.get_window()
+    screen = getattr(window, "virtual_screen", None)
+    if screen is None:
+        screen = window.virtual_screen = VirtualScreen(window)
+    return screen
@@ -0,0 +1,55 @@
+import unittest
+import arcade
+from src import constants as C
+from src import metrics
+from src.roster import get_roster
+from src.views.app_context import get_app_context
+
+class TestAppContext(unittest.TestCase):
+    def setUp(self):
+        self.window = arcade.Window(C.SCREEN_WIDTH, C.SCREEN_HEIGHT, "Test")
+        self.context = get_app_context(self.window)
+
+    def test_rematch_resets_in_place_without_decoding(self):
+        self.context.start_match("evil_wizard", "hero_knight")
+        game = self.context.game
+        fighter, players = game.player1_sprite, game.player_list
+        game.player2_sprite.fighter.hp = 0
+        game.round_number = 3
+        misses = metrics.ASSET_CACHE_MISSES.value
+
+        self.context.show_game_over(1)
+        self.context.rematch()
+
+        self.assertIs(self.context.game, game)
+        self.assertIs(game.player1_sprite, fighter)
+        self.assertIs(game.player_list, players)
+        self.assertEqual(game.round_number, 1)
+        self.assertEqual(game.player2_sprite.fighter.hp, game.player2_sprite.fighter.max_hp)
+        self.assertEqual(metrics.ASSET_CACHE_MISSES.value, misses)
+
+    def test_character_swap_uses_roster(self):
+        self.context.start_match("evil_wizard", "evil_wizard")
+        sprite = self.context.game.player2_sprite
+        self.context.start_match("evil_wizard", "huntress")
+        self.assertIs(self.context.game.player2_sprite, sprite)
+        self.assertEqual(sprite.character_id, "huntress")
+        self.assertIs(sprite.assets, get_roster().load("huntress"))
+
+    def test_views_are_kept(self):
+        self.context.show_menu()
+        menu = self.context.menu
+        self.context.show_select()
+        self.context.select.confirmed = [True, False]
+        self.context.show_menu()
+        self.context.show_select()
+        self.assertIs(self.window.current_view, self.context.select)
+        self.assertIs(self.context.menu, menu)
+        self.assertEqual(self.context.select.confirmed, [False, False])
+        self.assertEqual(self.context.transitions, 4)
+
+    def tearDown(self):
+        self.window.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from src.assets import KIND_AUDIO, KIND_TEXTURE, AssetRegistry
+from src.roster import Roster
+
+MB = 1024 * 1024
+
+class TestAssetRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = AssetRegistry(budget=10 * MB)
+        self.released = []
+
+    def track(self, key, size, **kwargs):
+        self.registry.track(key, KIND_TEXTURE, size * MB, 0,
+                            release=lambda: self.released.append(key), **kwargs)
+
+    def test_counts_cpu_and_gpu_bytes(self):
+        self.registry.track("a", KIND_TEXTURE, 2 * MB, 2 * MB)
+        self.registry.track("b", KIND_AUDIO, 1 * MB)
+        self.registry.track("a", KIND_TEXTURE, 3 * MB, 3 * MB)  # re-decoded bigger
+        self.assertEqual((self.registry.cpu_bytes, self.registry.gpu_bytes), (4 * MB, 3 * MB))
+        self.registry.forget("a")
+        self.assertEqual(self.registry.total_bytes, 1 * MB)
+
+    def test_evicts_least_recently_used_of_earlier_views(self):
+        self.registry.enter_view("menu")
+        self.track("bg1", 4)
+        self.track("bg2", 4)
+        self.registry.touch("bg1")
+        self.registry.enter_view("game")
+        self.track("fighter", 4)  # 12 MB: the older menu asset goes first
+        self.assertEqual(self.released, ["bg2"])
+        self.assertEqual(list(self.registry.assets), ["bg1", "fighter"])
+        self.assertEqual(self.registry.evictions, 1)
+
+    def test_current_view_and_pinned_assets_are_kept(self):
+        self.registry.enter_view("menu")
+        self.track("music", 6, pinned=True)
+        self.registry.enter_view("game")
+        self.track("p1", 3)
+        self.track("p2", 3)  # over budget, but nothing may go
+        self.assertEqual(self.released, [])
+        self.assertEqual(self.registry.over_budget, 1)
+        self.registry.enter_view("menu", keys=["p1"])  # p2 only is evictable now
+        self.assertEqual(self.released, ["p2"])
+
+    def test_report_lists_top_consumers(self):
+        self.registry.enter_view("menu")
+        for key, size in (("small", 1), ("big", 5), ("mid", 2)):
+            self.track(key, size)
+        lines = self.registry.report(count=2).splitlines()
+        self.assertIn("8/10 MB", lines[0])
+        self.assertTrue(lines[1].endswith("big") and lines[2].endswith("mid"))
+
+    def test_roster_characters_are_tracked_and_evicted(self):
+        roster = Roster(registry=self.registry)
+        self.registry.budget = 1  # anything from an earlier view must go
+        self.registry.enter_view("select")
+        roster.load("huntress")
+        self.assertIn("character:huntress", self.registry.assets)
+        self.registry.enter_view("game")
+        self.assertEqual(roster.loaded_ids, [])
+        self.assertEqual(self.registry.total_bytes, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from src.event_log import EV_HIT, EV_JUMP, EventLog, RotatingEventFile, read_events
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "events.bin")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        log = EventLog(self.path, capacity=8, echo=False)
+        log.tick = 42
+        log.emit(EV_HIT, 1, 2, 10)
+        log.tick = 43
+        log.emit(EV_JUMP, 2)
+        log.close()
+        self.assertEqual(list(read_events(self.path)),
+                         [(42, 1, EV_HIT, 2, 10), (43, 2, EV_JUMP, 0, 0)])
+
+    def test_full_buffer_drops_instead_of_blocking(self):
+        log = EventLog(self.path, capacity=4, echo=False)
+        for i in range(6):
+            log.emit(EV_JUMP, 1, i)
+        self.assertEqual(log.dropped, 2)
+        log.flush()
+        # The ring wraps cleanly once space is freed
+        for i in range(3):
+            log.emit(EV_JUMP, 2, i)
+        log.close()
+        self.assertEqual([e[3] for e in read_events(self.path)], [0, 1, 2, 3, 0, 1, 2])
+
+    def test_rotation(self):
+        sink = RotatingEventFile(self.path, max_bytes=64, backup_count=2)
+        for _ in range(4):
+            sink.write(bytes(32))
+        sink.close()
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        self.assertTrue(os.path.exists(self.path + ".2"))
+        self.assertFalse(os.path.exists(self.path + ".3"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from src.fighter_state import FighterState
+from src import constants as C
+
+class TestFighterState(unittest.TestCase):
+    def setUp(self):
+        self.fighter = FighterState(player_num=1, attack_count=2)
+        self.fighter.is_on_ground = True
+
+    def test_walk_and_stop(self):
+        self.fighter.tick(1/60, change_x=5, change_y=0)
+        self.assertEqual(self.fighter.state, C.STATE_WALKING)
+        self.fighter.tick(1/60, change_x=0, change_y=0)
+        self.assertEqual(self.fighter.state, C.STATE_IDLE)
+
+    def test_jump_fall_land(self):
+        self.assertTrue(self.fighter.start_jump())
+        self.fighter.tick(1/60, change_x=0, change_y=10)
+        self.assertEqual(self.fighter.state, C.STATE_JUMPING)
+        self.fighter.tick(1/60, change_x=0, change_y=-1)
+        self.assertEqual(self.fighter.state, C.STATE_FALLING)
+        self.fighter.is_on_ground = True
+        self.fighter.tick(1/60, change_x=0, change_y=0)
+        self.assertEqual(self.fighter.state, C.STATE_IDLE)
+
+    def test_attack_expires_and_cycles(self):
+        self.assertTrue(self.fighter.start_attack())
+        self.assertFalse(self.fighter.start_attack())
+        first_index = self.fighter.attack_index
+        for _ in range(int(C.ATTACK_DURATION * 60) + 1):
+            self.fighter.tick(1/60, change_x=0, change_y=0)
+        self.assertEqual(self.fighter.state, C.STATE_IDLE)
+        self.fighter.attack_cooldown = 0
+        self.fighter.start_attack()
+        self.assertNotEqual(self.fighter.attack_index, first_index)
+
+    def test_hit_locks_movement_until_dead(self):
+        self.fighter.apply_damage(10)
+        self.assertEqual(self.fighter.state, C.STATE_HIT)
+        self.assertFalse(self.fighter.start_jump())
+        self.fighter.apply_damage(self.fighter.hp)
+        self.assertEqual(self.fighter.state, C.STATE_DEAD)
+        self.assertFalse(self.fighter.apply_damage(1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+import arcade
+from PIL import Image
+from src import constants as C
+from src.frame_export import FrameExporter, export_replay
+from src.replay import ReplayRecorder
+
+class TestFrameExporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_frames_written_in_order_through_ring(self):
+        window = arcade.Window(64, 32, "Test")
+        try:
+            ctx = window.ctx
+            texture = ctx.texture((64, 32), components=4)
+            fbo = ctx.framebuffer(color_attachments=[texture])
+            # Fewer pixel buffers than frames: they have to be recycled
+            exporter = FrameExporter(ctx, (64, 32), self.tmp.name, ring=2, pixel_buffers=2, workers=2)
+            for n in range(6):
+                fbo.clear(color=(n * 40, 0, 255 - n * 40, 255))
+                fbo.clear(color=(255, 255, 255, 255), viewport=(0, 16, 64, 16))  # top half white
+                exporter.capture(fbo)
+            exporter.finish()
+        finally:
+            window.close()
+
+        self.assertEqual(exporter.frames_written, 6)
+        self.assertGreater(exporter.throughput(), 0)
+        for n in range(6):
+            image = Image.open(os.path.join(self.tmp.name, f"{n:06d}.png"))
+            self.assertEqual(image.size, (64, 32))
+            self.assertEqual(image.getpixel((10, 5)), (255, 255, 255, 255))  # PNG rows run top-down
+            self.assertEqual(image.getpixel((10, 25)), (n * 40, 0, 255 - n * 40, 255))
+
+    def test_export_replay(self):
+        recorder = ReplayRecorder(self.tmp.name)
+        recorder.start_match({"characters": [C.DEFAULT_CHARACTER] * 2, "width": C.SCREEN_WIDTH})
+        for tick in range(5):
+            recorder.record([tick, 1, 0, 0, 300 + tick * 10, C.FLOOR_TOP, 100, 0, 1, 0, 0,
+                             900, C.FLOOR_TOP, 100, 0, -1, 0, 0, 0])
+        path = recorder.save()
+        out = os.path.join(self.tmp.name, "frames")
+        exporter = export_replay(path, out, workers=2)
+        self.assertEqual(sorted(os.listdir(out)), [f"{n:06d}.png" for n in range(5)])
+        self.assertEqual(exporter.frames_captured, 5)
+        with Image.open(os.path.join(out, "000000.png")) as image:
+            self.assertEqual(image.size, (C.SCREEN_WIDTH, C.SCREEN_HEIGHT))
+
+if __name__ == '__main__':
+    unittest.main()
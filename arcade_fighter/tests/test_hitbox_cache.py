@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from src.hitbox_cache import HitboxCache, mirror
+from src.roster import load_strip
+from src import constants as C
+
+IDLE = "arcade_fighter/assets/CHAR-ANIM/PLAYERS/Martial Hero 2/Sprites/Idle.png"
+
+class TestHitboxCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "hitboxes.bin")
+        self.frames = load_strip(IDLE, 200, 200, 4)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        cache = HitboxCache(self.path)
+        computed = cache.frames_for(IDLE, 200, 200, self.frames)
+        self.assertTrue(cache.dirty)
+        cache.save()
+
+        reloaded = HitboxCache(self.path)
+        self.assertEqual(reloaded.frames_for(IDLE, 200, 200, self.frames), computed)
+        self.assertFalse(reloaded.dirty)
+
+    def test_aabb_tighter_than_frame(self):
+        cache = HitboxCache(self.path)
+        points, aabb = cache.frames_for(IDLE, 200, 200, self.frames)[0]
+        left, bottom, right, top = aabb[C.RIGHT_FACING]
+        self.assertLess(right - left, 200)
+        self.assertLess(top - bottom, 200)
+        self.assertEqual(mirror(points[C.RIGHT_FACING], aabb[C.RIGHT_FACING])[1], aabb[C.LEFT_FACING])
+
+if __name__ == '__main__':
+    unittest.main()
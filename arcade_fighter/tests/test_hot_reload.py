@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from PIL import Image
+from src.character import Character
+from src.hot_reload import HotReloader, InotifyWatcher, PollingWatcher
+from src.roster import Roster
+from src import constants as C
+
+PACK = "arcade_fighter/assets/CHAR-ANIM/PLAYERS/Martial Hero 2"
+
+class ReloadTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pack = os.path.join(self.tmpdir.name, "Martial Hero 2")
+        shutil.copytree(PACK, self.pack)
+        self.roster = Roster(self.tmpdir.name)
+        self.manifest = self.roster.manifest("martial_hero")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def edit_strip(self, name):
+        """Paint a block into the first frame of an animation strip"""
+        path = self.manifest.animation_path(name)
+        image = Image.open(path).convert("RGBA")
+        image.paste((255, 0, 0, 255), (90, 90, 110, 110))
+        image.save(path)
+        return path
+
+    def edit_manifest(self, **changes):
+        with open(self.manifest.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data.update(changes)
+        with open(self.manifest.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+
+    def wait_for_reload(self, reloader, timeout=5.0):
+        end = time.monotonic() + timeout
+        while True:
+            changed = reloader.poll()
+            if changed or time.monotonic() > end:
+                return changed
+            time.sleep(0.02)
+
+class TestHotReloader(ReloadTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reloader = HotReloader(self.roster, watch=False)
+        self.sprite = Character(player_num=1, character_id="martial_hero", roster=self.roster)
+
+    def tearDown(self):
+        self.reloader.stop()
+        super().tearDown()
+
+    def test_only_changed_strip_is_redecoded(self):
+        assets = self.roster.assets("martial_hero")
+        idle, walk = assets.animations["idle"], assets.animations["walk"]
+        old_texture = self.sprite.texture
+
+        self.edit_strip("idle")
+        self.reloader.rescan(["martial_hero"])
+        self.assertEqual(self.wait_for_reload(self.reloader), {"martial_hero"})
+        self.sprite.refresh_assets()
+
+        self.assertIsNot(assets.animations["idle"], idle)
+        self.assertIs(assets.animations["walk"], walk)
+        self.assertIs(self.sprite.animations, assets.animations)
+        self.assertIsNot(self.sprite.texture, old_texture)
+
+    def test_unchanged_content_is_skipped(self):
+        os.utime(self.manifest.animation_path("idle"))
+        self.reloader.rescan(["martial_hero"])
+        self.assertEqual(self.wait_for_reload(self.reloader, timeout=0.5), set())
+        self.assertGreater(self.reloader.unchanged, 0)
+
+    def test_manifest_frame_data_applies_mid_match(self):
+        walk = self.roster.assets("martial_hero").animations["walk"]
+        self.sprite.fighter.attack_index = 1
+        self.edit_manifest(attack_damage=33)
+        self.reloader.rescan(["martial_hero"])
+        self.assertEqual(self.wait_for_reload(self.reloader), {"martial_hero"})
+        self.sprite.refresh_assets()
+        self.assertEqual(self.sprite.attack_damage, 33)
+        self.assertEqual(self.sprite.fighter.attack_index, 1)
+        self.assertIs(self.roster.assets("martial_hero").animations["walk"], walk)
+
+    def test_fps_change_keeps_decoded_frames(self):
+        walk = self.roster.assets("martial_hero").animations["walk"]
+        animations = dict(self.manifest.animations)
+        animations["walk"] = dict(animations["walk"], fps=animations["walk"]["fps"] + 5, loop=False)
+        self.edit_manifest(animations=animations)
+        self.reloader.rescan(["martial_hero"])
+        self.assertEqual(self.wait_for_reload(self.reloader), {"martial_hero"})
+        assets = self.roster.assets("martial_hero")
+        self.assertIs(assets.animations["walk"], walk)
+        self.assertEqual(assets.manifest.animations["walk"]["fps"], animations["walk"]["fps"])
+        self.assertFalse(assets.manifest.animations["walk"]["loop"])
+
+class TestWatchers(ReloadTestCase):
+    def check_watcher(self, watcher):
+        self.assertEqual(watcher.changes(), set())
+        time.sleep(0.01)  # distinct mtime for the polling watcher
+        path = self.edit_strip("idle")
+        self.assertIn(path, watcher.changes())
+        watcher.close()
+
+    def test_polling_watcher(self):
+        self.check_watcher(PollingWatcher(self.tmpdir.name))
+
+    @unittest.skipUnless(os.path.exists("/proc/sys/fs/inotify"), "inotify not available")
+    def test_inotify_watcher(self):
+        self.check_watcher(InotifyWatcher(self.tmpdir.name))
+
+if __name__ == '__main__':
+    unittest.main()
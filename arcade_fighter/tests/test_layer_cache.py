@@ -0,0 +1,54 @@
+import unittest
+import arcade
+from src.views.layer_cache import LayerCache
+
+class TestLayerCache(unittest.TestCase):
+    def setUp(self):
+        self.window = arcade.Window(64, 32, "Test")
+        self.cache = LayerCache(self.window)
+        self.calls = 0
+
+    def tearDown(self):
+        self.window.close()
+
+    def render(self):
+        self.calls += 1
+        arcade.draw_lrbt_rectangle_filled(0, 32, 0, 32, (255, 0, 0, 128))
+
+    def pixel(self, x, y):
+        data = self.window.ctx.screen.read(components=4)
+        i = (y * self.window.get_framebuffer_size()[0] + x) * 4
+        return tuple(data[i:i + 4])
+
+    def test_renders_only_when_key_changes(self):
+        for _ in range(5):
+            self.cache.draw("menu", self.render, key=("main", False))
+        self.assertEqual(self.calls, 1)
+        self.cache.draw("menu", self.render, key=("options", False))
+        self.assertEqual(self.calls, 2)
+        self.cache.invalidate()
+        self.cache.draw("menu", self.render, key=("options", False))
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(self.cache.renders, 3)
+
+    def test_composite_matches_direct_draw(self):
+        self.window.clear(color=(0, 0, 255, 255))
+        self.cache.draw("layer", self.render)
+        cached = self.pixel(8, 8)
+        self.window.clear(color=(0, 0, 255, 255))
+        self.render()
+        direct = self.pixel(8, 8)
+        for a, b in zip(cached[:3], direct[:3]):  # screen alpha is never displayed
+            self.assertAlmostEqual(a, b, delta=1)
+        self.assertEqual(self.pixel(48, 8), (0, 0, 255, 255))  # transparent outside
+
+    def test_alpha_fades_without_rerender(self):
+        self.window.clear(color=(0, 0, 0, 255))
+        self.cache.draw("symbol", self.render, alpha=1.0)
+        self.window.clear(color=(0, 0, 0, 255))
+        self.cache.draw("symbol", self.render, alpha=0.5)
+        self.assertEqual(self.calls, 1)
+        self.assertAlmostEqual(self.pixel(8, 8)[0], 64, delta=1)
+
+if __name__ == '__main__':
+    unittest.main()
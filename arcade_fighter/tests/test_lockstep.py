@@ -0,0 +1,128 @@
+import time
+import unittest
+from collections import deque
+from src.net.lockstep import (
+    LockstepSession, decode_packet, encode_packet, open_socket, pack_inputs, unpack_inputs
+)
+from src.net.relay import LinkConditioner, UdpRelay
+from src.simulation import INPUT_ATTACK, INPUT_LEFT, INPUT_RIGHT, INPUT_SPECIAL, MatchSimulation
+
+TICKS = 180
+
+def local_input(player, tick):
+    """Scripted input so the match actually has hits and volleys in it"""
+    if player == 1:
+        return INPUT_RIGHT if tick % 40 < 30 else INPUT_ATTACK | INPUT_SPECIAL
+    return INPUT_LEFT if tick % 25 < 20 else INPUT_ATTACK
+
+class TestPackets(unittest.TestCase):
+    def test_input_packing(self):
+        inputs = [0, 31, 5, 18, 1, 0, 7, 30]
+        data = pack_inputs(inputs)
+        self.assertEqual(len(data), 5)
+        self.assertEqual(unpack_inputs(data, len(inputs)), inputs)
+
+    def test_packet_round_trip_across_tick_wrap(self):
+        data = encode_packet(65534, 65530, [1, 2, 3], checksum=(65535, 0xDEADBEEF))
+        self.assertLessEqual(len(data), 5 + 2 + 6)
+        first, ack, inputs, checksum = decode_packet(data, reference=65533)
+        self.assertEqual((first, ack, inputs, checksum), (65534, 65530, [1, 2, 3], (65535, 0xDEADBEEF)))
+        # Ticks past 65535 unwrap forward
+        first, _, _, _ = decode_packet(encode_packet(65537, 0, []), reference=65535)
+        self.assertEqual(first, 65537)
+
+class TestLockstep(unittest.TestCase):
+    def setUp(self):
+        self.sockets = [open_socket(0, "127.0.0.1"), open_socket(0, "127.0.0.1")]
+        ports = [s.getsockname()[1] for s in self.sockets]
+        conditioner = LinkConditioner(latency=0.005, jitter=0.003, loss=0.15, seed=3)
+        self.relay = UdpRelay(0, ("127.0.0.1", ports[0]), 0, ("127.0.0.1", ports[1]), conditioner)
+        self.relay.start()
+        left, right = self.relay.ports
+        self.sessions = [
+            LockstepSession(MatchSimulation("huntress", "hero_knight", seed=11), 1,
+                            self.sockets[0], ("127.0.0.1", left)),
+            LockstepSession(MatchSimulation("huntress", "hero_knight", seed=11), 2,
+                            self.sockets[1], ("127.0.0.1", right)),
+        ]
+
+    def tearDown(self):
+        self.relay.stop()
+        for session in self.sessions:
+            session.close()
+
+    def play(self, ticks, corrupt_at=None):
+        start = time.monotonic()
+        while min(s.sim.frame for s in self.sessions) < ticks:
+            self.assertLess(time.monotonic() - start, 20, "lockstep stalled")
+            for session in self.sessions:
+                session.update(local_input(session.local_player, session.local_until + 1))
+                session.advance()
+                if corrupt_at and session.local_player == 2 and session.sim.frame >= corrupt_at:
+                    session.sim.fighters[0].hp -= 1
+                    corrupt_at = None
+            time.sleep(0.001)
+        return time.monotonic() - start
+
+    def test_peers_stay_in_sync_over_lossy_link(self):
+        elapsed = self.play(TICKS)
+        a, b = (s.sim for s in self.sessions)
+        # Compare at the same tick: the faster peer may be a little ahead
+        while a.frame != b.frame:
+            self.play(max(a.frame, b.frame))
+        self.assertEqual(a.state_values(), b.state_values())
+        self.assertIsNone(self.sessions[0].desync_tick)
+        self.assertIsNone(self.sessions[1].desync_tick)
+        self.assertGreater(self.relay.dropped, 0)
+        for session in self.sessions:
+            # Payload bytes per second of simulated play, at 60 ticks/s
+            self.assertLess(session.bytes_sent / session.packets_sent * 60, 1024)
+
+    def test_desync_is_detected(self):
+        self.play(TICKS, corrupt_at=40)
+        self.assertTrue(any(s.desync_tick for s in self.sessions))
+
+class MemorySocket:
+    """In-process datagram socket; `drop` discards outgoing packets while True"""
+
+    def __init__(self):
+        self.inbox = deque()
+        self.other = None
+        self.drop = False
+
+    def setblocking(self, flag):
+        pass
+
+    def sendto(self, data, address):
+        if not self.drop:
+            self.other.inbox.append(data)
+
+    def recvfrom(self, size):
+        if not self.inbox:
+            raise BlockingIOError
+        return self.inbox.popleft(), None
+
+    def close(self):
+        pass
+
+class TestBurstLoss(unittest.TestCase):
+    def test_recovers_when_the_gap_outgrows_the_redundancy_window(self):
+        for delay in (4, 6):
+            a, b = MemorySocket(), MemorySocket()
+            a.other, b.other = b, a
+            sessions = [
+                LockstepSession(MatchSimulation("huntress", "hero_knight", seed=11), 1, a, None,
+                                input_delay=delay),
+                LockstepSession(MatchSimulation("huntress", "hero_knight", seed=11), 2, b, None,
+                                input_delay=delay),
+            ]
+            for iteration in range(200):
+                a.drop = 40 <= iteration < 60  # a burst longer than the 8-input window
+                for session in sessions:
+                    session.update(local_input(session.local_player, session.local_until + 1))
+                    session.advance()
+            frames = [s.sim.frame for s in sessions]
+            self.assertGreater(min(frames), 150, f"stalled at {frames} with delay {delay}")
+
+if __name__ == '__main__':
+    unittest.main()
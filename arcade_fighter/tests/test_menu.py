@@ -0,0 +1,63 @@
+import unittest
+import arcade
+from src.views.button_factory import ButtonFactory
+from src.views.menu import Menu, MenuTree
+from src import constants as C
+
+class TestMenu(unittest.TestCase):
+    def setUp(self):
+        self.window = arcade.Window(C.SCREEN_WIDTH, C.SCREEN_HEIGHT, "Test")
+        self.layouts = 0
+        self.tree = MenuTree({"main": self.layout})
+
+    def tearDown(self):
+        self.window.close()
+
+    def layout(self):
+        self.layouts += 1
+        return ButtonFactory.create_menu_column([
+            ("play", "Play"),
+            ("fullscreen", "Fullscreen: OFF"),
+            ("quit", "Quit"),
+        ])
+
+    def test_menus_are_built_lazily_once(self):
+        self.assertEqual(self.layouts, 0)
+        menu = self.tree.get("main")
+        self.assertIs(self.tree.get("main"), menu)
+        self.assertEqual(self.layouts, 1)
+        self.assertIsNone(self.tree.get("missing"))
+        self.tree.invalidate()
+        self.assertIsNot(self.tree.get("main"), menu)
+        self.assertEqual(self.layouts, 2)
+
+    def test_grid_hit_matches_bounds(self):
+        menu = self.tree.get("main")
+        for button in menu.buttons:
+            self.assertIs(menu.hit(button.center_x, button.center_y), button)
+            self.assertIs(menu.hit(button.center_x + button.width / 2 - 1, button.center_y), button)
+            self.assertIsNone(menu.hit(button.center_x + button.width / 2 + 1, button.center_y))
+        self.assertIsNone(menu.hit(0, 0))
+
+    def test_relabel_keeps_action_and_bumps_version(self):
+        menu = self.tree.get("main")
+        version = menu.version
+        menu.set_label("fullscreen", "Fullscreen: ON")
+        button = menu.by_action["fullscreen"]
+        self.assertEqual(menu.labels["fullscreen"].text, "Fullscreen: ON")
+        self.assertEqual(menu.hit(button.center_x, button.center_y).action, "fullscreen")
+        self.assertGreater(menu.version, version)
+
+    def test_press_rebuilds_quads_only(self):
+        menu = self.tree.get("main")
+        shapes, batch = menu.shapes, menu.batch
+        menu.press(menu.by_action["play"])
+        self.assertIsNot(menu.shapes, shapes)
+        self.assertIs(menu.batch, batch)
+        self.assertEqual(len(menu.shapes), 2 * 3 - 1)  # a pressed button loses its shadow
+        menu.release()
+        self.assertEqual(len(menu.shapes), 2 * 3)
+        menu.draw()
+
+if __name__ == '__main__':
+    unittest.main()
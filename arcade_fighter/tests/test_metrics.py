@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import urllib.request
+from src.metrics import MetricsExporter, MetricsRegistry
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry(prefix="test")
+
+    def test_counter_and_gauge(self):
+        hits = self.registry.counter("hits_total", "Hits")
+        hits.inc()
+        hits.inc(2)
+        self.assertIs(self.registry.counter("hits_total"), hits)
+        self.registry.gauge("bytes").set(512)
+        text = self.registry.render()
+        self.assertIn("# TYPE test_hits_total counter", text)
+        self.assertIn("test_hits_total 3\n", text)
+        self.assertIn("test_bytes 512\n", text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        frame = self.registry.histogram("frame_seconds", bounds=(0.01, 0.02))
+        for value in (0.005, 0.015, 0.015, 0.5):
+            frame.observe(value)
+        text = self.registry.render()
+        self.assertIn('test_frame_seconds_bucket{le="0.01"} 1\n', text)
+        self.assertIn('test_frame_seconds_bucket{le="0.02"} 3\n', text)
+        self.assertIn('test_frame_seconds_bucket{le="+Inf"} 4\n', text)
+        self.assertIn("test_frame_seconds_count 4\n", text)
+
+    def test_kind_mismatch(self):
+        self.registry.counter("x")
+        with self.assertRaises(ValueError):
+            self.registry.gauge("x")
+
+    def test_file_export(self):
+        self.registry.counter("ticks_total").inc(5)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "metrics.prom")
+            MetricsExporter(self.registry, mode="file", path=path).write_file()
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("test_ticks_total 5", f.read())
+
+    def test_http_export(self):
+        self.registry.counter("ticks_total").inc(7)
+        exporter = MetricsExporter(self.registry, mode="http", port=0)
+        exporter.start()
+        try:
+            port = exporter._server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=2) as resp:
+                self.assertIn("test_ticks_total 7", resp.read().decode())
+        finally:
+            exporter.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import time
+import unittest
+from src.music import MusicDirector
+from fakes import FakeClock
+
+PLAYLISTS = {
+    "menu": [":resources:sounds/gameover1.wav", ":resources:sounds/gameover2.wav",
+             ":resources:sounds/gameover3.wav"],
+    "fight": [":resources:sounds/lose1.wav", ":resources:sounds/lose2.wav"],
+    "broken": ["arcade_fighter/assets/MUSIC/missing.wav", ":resources:sounds/upgrade1.wav"],
+}
+
+class TestMusicDirector(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(50.0)
+        self.music = MusicDirector(PLAYLISTS, crossfade=0.1, seed=1, clock=self.clock)
+
+    def tearDown(self):
+        self.music.stop()
+
+    def wait_until(self, condition, timeout=5.0):
+        """Run updates (without advancing the fake clock) until the worker delivers"""
+        end = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), end, "timed out")
+            self.music.update()
+            time.sleep(0.01)
+
+    def test_first_track_starts_then_next_is_prefetched(self):
+        self.music.play("menu")
+        self.wait_until(lambda: self.music.current is not None)
+        self.assertIn(self.music.current_track, PLAYLISTS["menu"])
+        self.wait_until(lambda: self.music.next is not None)
+        self.assertNotEqual(self.music.next.path, self.music.current_track)
+        self.assertEqual(self.music.resident, 2)
+
+    def test_crossfade_at_track_end(self):
+        self.music.play("menu")
+        self.wait_until(lambda: self.music.next is not None)
+        first, second = self.music.current, self.music.next
+        self.clock.now += first.length - 0.05
+        self.music.update()
+        self.assertIs(self.music.fading, first)
+        self.assertIs(self.music.current, second)
+        self.assertIsNone(self.music.next)  # nothing prefetched mid-fade
+
+        self.clock.now += 0.05  # halfway: equal-power curves cross at ~0.707
+        self.music.update()
+        incoming, outgoing = self.music.players[self.music.active], self.music.players[1 - self.music.active]
+        self.assertAlmostEqual(incoming.volume, outgoing.volume, places=3)
+
+        self.clock.now += 0.1
+        self.music.update()
+        self.assertIsNone(self.music.fading)
+        self.assertLessEqual(self.music.resident, 2)
+
+    def test_playlist_switch_crossfades_immediately(self):
+        self.music.play("menu")
+        self.wait_until(lambda: self.music.next is not None)
+        self.music.play("fight")
+        self.assertIsNone(self.music.next)  # the menu prefetch is dropped
+        self.wait_until(lambda: self.music.fading is not None)
+        self.assertIn(self.music.current_track, PLAYLISTS["fight"])
+        self.assertLessEqual(self.music.resident, 2)
+
+    def test_undecodable_track_is_skipped(self):
+        # Always pick the first candidate, so the missing file is tried first
+        candidates = []
+        def first(tracks):
+            candidates.append(list(tracks))
+            return tracks[0]
+        self.music.rng.choice = first
+        missing, playable = PLAYLISTS["broken"]
+        self.music.play("broken")
+        self.wait_until(lambda: self.music.current is not None)
+        self.assertEqual(self.music.current_track, playable)
+        self.assertEqual(self.music.failed, {missing})
+        # Let the track end and loop a few times: the failed path is never picked again
+        for _ in range(3):
+            self.clock.now += self.music.current.length
+            self.music.update()
+        self.assertEqual(candidates, [[missing, playable], [playable]])
+        self.assertEqual(self.music.current_track, playable)
+
+if __name__ == '__main__':
+    unittest.main()
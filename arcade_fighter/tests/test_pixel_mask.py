@@ -0,0 +1,36 @@
+import unittest
+from PIL import Image
+from src.pixel_mask import PixelMask, masks_overlap
+
+def block_image(width, height, box):
+    """RGBA image with an opaque rectangle (left, top, right, bottom in image pixels)"""
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    image.paste((255, 255, 255, 255), box)
+    return image
+
+class TestPixelMask(unittest.TestCase):
+    def setUp(self):
+        # 10x10 frame whose left half is opaque
+        self.mask = PixelMask.from_image(block_image(10, 10, (0, 0, 5, 10)))
+
+    def test_packing(self):
+        self.assertEqual(self.mask.rows[0], 0b1111100000)
+        self.assertEqual(self.mask.mirrored().rows[0], 0b0000011111)
+
+    def test_overlap_uses_pixels_not_bounds(self):
+        # Frames overlap by 3 columns but only transparent pixels of `a` are involved
+        self.assertFalse(masks_overlap(self.mask, 0, 10, self.mask, 7, 10))
+        self.assertTrue(masks_overlap(self.mask, 0, 10, self.mask, 3, 10))
+        self.assertFalse(masks_overlap(self.mask, 0, 10, self.mask, 0, 30))
+
+    def test_window_clips_overlap(self):
+        self.assertTrue(masks_overlap(self.mask, 0, 10, self.mask, 3, 10, window=(0, 0, 10, 10)))
+        self.assertFalse(masks_overlap(self.mask, 0, 10, self.mask, 3, 10, window=(6, 0, 10, 10)))
+
+    def test_scaled_mask(self):
+        scaled = PixelMask.from_image(block_image(10, 10, (0, 0, 5, 10)), scale=2)
+        self.assertEqual((scaled.width, scaled.height), (20, 20))
+        self.assertEqual(bin(scaled.rows[0]).count("1"), 10)
+
+if __name__ == '__main__':
+    unittest.main()
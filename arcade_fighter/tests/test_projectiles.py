@@ -0,0 +1,43 @@
+import unittest
+import arcade
+from src.projectiles import ProjectilePool
+from src import constants as C
+
+def make_fighter(player_num, center_x, center_y=100):
+    fighter = arcade.SpriteSolidColor(40, 80, color=arcade.color.WHITE)
+    fighter.center_x = center_x
+    fighter.center_y = center_y
+    fighter.player_num = player_num
+    return fighter
+
+class TestProjectilePool(unittest.TestCase):
+    def setUp(self):
+        self.pool = ProjectilePool(capacity=8)
+
+    def test_spawn_and_exhaustion(self):
+        for _ in range(8):
+            self.assertNotEqual(self.pool.spawn(0, 0, 1, 0, owner=1), -1)
+        self.assertEqual(self.pool.spawn(0, 0, 1, 0, owner=1), -1)
+        self.assertEqual(self.pool.active_count, 8)
+
+    def test_lifetime_expiry_returns_slot(self):
+        self.pool.spawn(100, 100, 1, 0, owner=1, lifetime=2)
+        self.pool.update()
+        self.assertEqual(self.pool.active_count, 1)
+        self.pool.update()
+        self.assertEqual(self.pool.active_count, 0)
+        self.assertNotEqual(self.pool.spawn(0, 0, 1, 0, owner=1), -1)
+
+    def test_collide_skips_owner_and_distant_fighters(self):
+        shooter = make_fighter(1, 100)
+        target = make_fighter(2, 300)
+        far_away = make_fighter(3, 300, center_y=600)
+        self.pool.spawn(100, 100, 0, 0, owner=1)
+        self.pool.spawn(300, 100, 0, 0, owner=1)
+        hits = self.pool.collide([shooter, target, far_away])
+        self.assertEqual(hits, [(target, C.PROJECTILE_DAMAGE)])
+        self.pool.update()
+        self.assertEqual(self.pool.active_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from src.quality import LEVELS, QualityGovernor
+from src import constants as C
+from fakes import FakeClock
+
+class TestQualityGovernor(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(10.0)
+        self.governor = QualityGovernor(clock=self.clock)
+        self.seen = []
+        self.governor.on_change(lambda level: self.seen.append(level.name))
+        self.budget = 1.0 / C.QUALITY_TARGET_FPS
+
+    def run_frames(self, frame_time, count):
+        for _ in range(count):
+            self.clock.now += frame_time
+            self.governor.observe(frame_time)
+
+    def test_starts_high_and_notifies_immediately(self):
+        self.assertEqual(self.governor.level, LEVELS[-1])
+        self.assertEqual(self.seen, ["high"])
+
+    def test_slow_frames_step_down_once_per_cooldown(self):
+        slow = self.budget * 2
+        while self.governor.changes == 0:
+            self.run_frames(slow, 1)
+        self.assertEqual(self.seen, ["high", "medium"])
+        # Still slow, but the cooldown holds the level
+        self.run_frames(slow, int(C.QUALITY_COOLDOWN / slow) - 1)
+        self.assertEqual(self.seen, ["high", "medium"])
+        self.run_frames(slow, C.QUALITY_WINDOW)
+        self.assertEqual(self.seen, ["high", "medium", "low"])
+        self.run_frames(slow, 500)
+        self.assertEqual(self.governor.index, 0)  # nothing below the lowest level
+
+    def test_occasional_spikes_are_ignored(self):
+        self.clock.now += C.QUALITY_COOLDOWN
+        for _ in range(20):
+            self.run_frames(self.budget, 19)
+            self.run_frames(self.budget * 4, 1)  # 5% of frames: under the p90
+        self.assertEqual(self.governor.changes, 0)
+
+    def test_steps_up_only_after_sustained_headroom(self):
+        self.governor.set_level(0)
+        fast = self.budget * 0.5
+        self.run_frames(fast, int((C.QUALITY_COOLDOWN + C.QUALITY_UPGRADE_HOLD) / fast) - 10)
+        self.assertEqual(self.governor.index, 0)
+        self.run_frames(fast, C.QUALITY_WINDOW)
+        self.assertEqual(self.governor.index, 1)
+        # Frames near the budget: neither up nor down
+        self.run_frames(self.budget, 2000)
+        self.assertEqual(self.governor.index, 1)
+
+    def test_pinned_governor_never_moves(self):
+        pinned = QualityGovernor(start=1, adaptive=False, clock=self.clock)
+        for _ in range(500):
+            self.clock.now += 0.1
+            pinned.observe(0.1)
+        self.assertEqual(pinned.level.name, "medium")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+from src.replay import ReplayReader, ReplayRecorder
+
+def frames(count):
+    """Fake capture_state ticks: two fighters and a varying number of arrows"""
+    for tick in range(count):
+        arrows = tick % 3
+        values = [tick, 1, 0, 0, 320 + tick * 5, 64, 100 - tick, 1, 0, 0, tick % 6]
+        values += [960, 64, 100, 0, -1, 0, 2, arrows]
+        for n in range(arrows):
+            values += [400 + n * 12, 120 - n, 1]
+        yield values
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.recorder = ReplayRecorder(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        info = {"characters": ["a", "b"], "width": 1280}
+        self.recorder.start_match(info)
+        expected = list(frames(50))
+        for values in expected:
+            self.recorder.record(values)
+        path = self.recorder.save()
+        self.assertEqual(os.path.dirname(path), self.tmp.name)
+
+        reader = ReplayReader(path)
+        played = []
+        while reader.advance():
+            played.append(reader.values)
+        self.assertEqual(reader.match_info, info)
+        self.assertEqual(played, expected)
+        self.assertEqual(reader.frame, 50)
+
+    def test_nothing_recorded_saves_nothing(self):
+        self.recorder.record([1, 2, 3])  # before start_match: ignored
+        self.recorder.start_match({})
+        self.assertIsNone(self.recorder.save())
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.tmp.name, "events.bin")
+        with open(path, "wb") as f:
+            f.write(b"EVLG\x01\x00\x10\x00")
+        with self.assertRaises(ValueError):
+            ReplayReader(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+from src.roster import Roster
+from src.character import Character
+from src import constants as C
+
+class TestRoster(unittest.TestCase):
+    def setUp(self):
+        self.roster = Roster()
+
+    def test_manifests_only_at_startup(self):
+        self.assertIn(C.DEFAULT_CHARACTER, self.roster.ids)
+        self.assertGreaterEqual(len(self.roster.ids), 5)
+        self.assertEqual(self.roster.loaded_ids, [])
+
+    def test_frames_sliced_from_manifest(self):
+        manifest = self.roster.manifest("huntress")
+        assets = self.roster.load("huntress")
+        idle = assets.animations["idle"]
+        self.assertEqual(len(idle), manifest.animations["idle"]["frames"])
+        self.assertEqual(idle[0][C.RIGHT_FACING].width, manifest.frame_width)
+
+    def test_mirror_match_shares_textures(self):
+        p1 = Character(player_num=1, character_id="hero_knight", roster=self.roster)
+        p2 = Character(player_num=2, character_id="hero_knight", roster=self.roster)
+        self.assertIs(p1.animations, p2.animations)
+        self.assertEqual(self.roster.loaded_ids, ["hero_knight"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import glob
+import os
+import tempfile
+import unittest
+import arcade
+from src import constants as C
+from src.scenario import FrameTrace, Scenario, compare
+from src.views.game_view import GameView
+
+class TestFrameTrace(unittest.TestCase):
+    def make_trace(self):
+        trace = FrameTrace("synthetic")
+        for frame in range(100):
+            trace.add((frame + 1) * 100_000, 2_000_000 if frame == 50 else 0)
+        return trace
+
+    def test_percentiles_and_worst(self):
+        stats = self.make_trace().stats()
+        self.assertEqual((stats["p50"], stats["p95"], stats["p99"]), (5.0, 9.5, 9.9))
+        self.assertEqual((stats["worst"], stats["worst_frame"]), (10.0, 99))
+        self.assertEqual((stats["gc_worst"], stats["gc_frames"]), (2.0, 1))
+
+    def test_saved_trace_round_trips(self):
+        trace = self.make_trace()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "synthetic.trace")
+            trace.save(path)
+            self.assertEqual(os.path.getsize(path), 10 + 8 * 100)
+            loaded = FrameTrace.load(path)
+        self.assertEqual((loaded.frame_us, loaded.gc_us), (trace.frame_us, trace.gc_us))
+
+    def test_compare_ignores_noise(self):
+        baseline = {"p50": 5.0, "p95": 9.0, "p99": 10.0, "worst": 12.0, "gc_worst": 0.2}
+        current = {"p50": 5.2, "p95": 12.0, "p99": 10.1, "worst": 12.0, "gc_worst": 0.6}
+        regressed = {key for key, _, _, bad in compare(current, baseline, 0.15, 0.5) if bad}
+        self.assertEqual(regressed, {"p95"})
+
+class TestScenario(unittest.TestCase):
+    def test_shipped_scenarios_are_valid(self):
+        paths = glob.glob(os.path.join(C.SCENARIO_DIR, "*.json"))
+        self.assertGreaterEqual(len(paths), 4)
+        for path in paths:
+            self.assertGreater(Scenario.from_file(path).frames, 0)
+        for action in ({"at": 0, "tap": "NO_SUCH_KEY"}, {"every": 0, "tap": "KEY_ATTACK_P1"},
+                       {"every": -2, "tap": "KEY_ATTACK_P1"},
+                       {"every": 2, "from": -1, "tap": "KEY_ATTACK_P1"},
+                       {"every": 2, "until": -5, "tap": "KEY_ATTACK_P1"}):
+            with self.assertRaises(ValueError):
+                Scenario("bad", 10, [action])
+
+    def test_runs_views_and_records_every_frame(self):
+        window = arcade.Window(C.SCREEN_WIDTH, C.SCREEN_HEIGHT, "Test", visible=False)
+        try:
+            scenario = Scenario("short", 12, [
+                {"at": 0, "do": "menu"},
+                {"at": 3, "do": "match", "characters": ["huntress", "hero_knight"]},
+                {"every": 2, "from": 4, "tap": "KEY_ATTACK_P1"},
+                {"at": 8, "do": "rematch"},
+                {"at": 9, "press": "KEY_RIGHT_P1"},
+                {"at": 10, "resize": [800, 600]},
+            ])
+            trace = scenario.run(window)
+            view = window.current_view
+        finally:
+            window.close()
+        self.assertEqual(len(trace), 12)
+        self.assertTrue(all(trace.frame_us))
+        self.assertIsInstance(view, GameView)
+        self.assertIn(C.KEY_RIGHT_P1, view.held_keys)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import unittest
+from src.net.server import (
+    INPUT, PKT_INPUT, PKT_REJECT, PKT_STATE, PKT_STATS, STATE, MatchWorker, encode_join, shard_for
+)
+
+class FakeTransport:
+    def __init__(self):
+        self.sent = []
+
+    def sendto(self, data, addr):
+        self.sent.append((data, addr))
+
+    def kinds(self):
+        return [data[0] for data, _ in self.sent]
+
+def make_worker(**options):
+    worker = MatchWorker(**options)
+    worker.connection_made(FakeTransport())
+    return worker
+
+def join_match(worker, match_id):
+    worker.datagram_received(encode_join(match_id, 1, "huntress"), ("127.0.0.1", 5001))
+    worker.datagram_received(encode_join(match_id, 2, "hero_knight"), ("127.0.0.1", 5002))
+
+class TestSharding(unittest.TestCase):
+    def test_every_match_has_one_worker(self):
+        for match_id in range(50):
+            self.assertEqual(shard_for(match_id, 4), match_id % 4)
+
+    def test_worker_ignores_other_shards(self):
+        worker = make_worker(index=1, workers=2)
+        join_match(worker, 4)
+        self.assertEqual(worker.matches, {})
+
+class TestMatchWorker(unittest.TestCase):
+    def test_match_starts_when_both_players_join(self):
+        worker = make_worker()
+        worker.datagram_received(encode_join(7, 1, "huntress"), ("127.0.0.1", 5001))
+        self.assertIsNone(worker.matches[7].sim)
+        worker.datagram_received(encode_join(7, 2, "hero_knight"), ("127.0.0.1", 5002))
+        self.assertIsNotNone(worker.matches[7].sim)
+
+    def test_batch_tick_sends_state_to_both_players(self):
+        worker = make_worker()
+        join_match(worker, 3)
+        worker.datagram_received(INPUT.pack(PKT_INPUT, 3, 1, 2), ("127.0.0.1", 5001))
+        worker.tick_batch(3)
+        sent = worker.transport.sent
+        self.assertEqual([addr[1] for _, addr in sent], [5001, 5002])
+        fields = STATE.unpack(sent[0][0])
+        self.assertEqual(fields[0], PKT_STATE)
+        self.assertEqual(fields[1], 3)
+        self.assertEqual(fields[2], 3)  # simulation frame
+        self.assertEqual(worker.matches[3].inputs, [2, 0])
+
+    def test_admission_control(self):
+        worker = make_worker(max_matches=1)
+        join_match(worker, 1)
+        join_match(worker, 2)
+        self.assertEqual(list(worker.matches), [1])
+        self.assertIn(PKT_REJECT, worker.transport.kinds())
+
+        # No headroom left also rejects, even under the match cap
+        worker = make_worker(max_matches=10)
+        worker.busy = worker.period
+        join_match(worker, 1)
+        self.assertEqual(worker.matches, {})
+        self.assertEqual(worker.rejected, 2)
+
+    def test_unknown_character_is_rejected(self):
+        worker = make_worker()
+        worker.datagram_received(encode_join(9, 1, "no_such_fighter"), ("127.0.0.1", 5001))
+        self.assertEqual(worker.matches, {})
+        self.assertEqual(worker.transport.kinds(), [PKT_REJECT])
+        # The match can still be joined properly afterwards
+        join_match(worker, 9)
+        self.assertIsNotNone(worker.matches[9].sim)
+
+    def test_stats_reply(self):
+        worker = make_worker()
+        join_match(worker, 5)
+        worker.datagram_received(bytes((PKT_STATS,)), ("127.0.0.1", 6000))
+        data, addr = worker.transport.sent[-1]
+        stats = json.loads(data[1:].decode("utf-8"))
+        self.assertEqual(stats["matches"], 1)
+        self.assertEqual(addr, ("127.0.0.1", 6000))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from src.sfx import SfxMixer
+from src import constants as C
+from fakes import FakeClock
+
+EFFECTS = {
+    "hit": (":resources:sounds/hit3.wav", 3, False),
+    "jump": (":resources:sounds/jump1.wav", 2, False),
+    "ko": (":resources:sounds/explosion2.wav", 1, True),
+}
+
+class TestSfxMixer(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(100.0)
+        self.mixer = SfxMixer(voices=4, clock=self.clock)
+        self.mixer.preload(EFFECTS)
+        self.pool = list(self.mixer.voices)
+
+    def tearDown(self):
+        self.mixer.stop_all()
+
+    def test_voice_limit_steals_oldest(self):
+        voices = []
+        for _ in range(8):
+            voices.append(self.mixer.play("hit"))
+            self.clock.now += 0.001
+        self.assertEqual(self.mixer.active_voices(), 3)
+        self.assertEqual(self.mixer.stolen, 5)
+        # Round-robin over the same three voices, oldest first
+        self.assertEqual(voices[3:6], voices[0:3])
+        self.assertEqual(self.mixer.voices, self.pool)
+
+    def test_full_pool_steals_oldest_voice(self):
+        first = self.mixer.play("hit")
+        self.clock.now += 0.001
+        self.mixer.play("hit")
+        self.clock.now += 0.001
+        self.mixer.play("jump")
+        self.clock.now += 0.001
+        self.mixer.play("jump")
+        self.clock.now += 0.001
+        self.assertIs(self.mixer.play("ko"), first)
+        self.assertEqual(self.mixer.stolen, 1)
+
+    def test_finished_voice_is_reused_for_same_effect(self):
+        voice = self.mixer.play("jump")
+        self.mixer.play("hit")
+        self.clock.now += 5.0
+        self.mixer.update(1 / 60)
+        self.assertEqual(self.mixer.active_voices(), 0)
+        self.assertIs(self.mixer.play("jump"), voice)
+
+    def test_ducking_hook(self):
+        gains = []
+        self.mixer.on_duck = gains.append
+        self.mixer.play("ko")
+        self.assertEqual(gains, [C.SFX_DUCK_GAIN])
+        self.mixer.update(1 / 60)
+        self.assertEqual(len(gains), 1)  # held while the effect plays
+        self.clock.now += 5.0
+        for _ in range(60):
+            self.mixer.update(1 / 60)
+        self.assertEqual(gains[-1], 1.0)
+
+    def test_voice_limit_keeps_pool(self):
+        self.mixer.play("ko")
+        self.mixer.set_voice_limit(2)
+        for _ in range(4):
+            self.mixer.play("hit")
+            self.clock.now += 0.001
+        self.assertEqual(self.mixer.active_voices(), 2)
+        self.assertEqual(self.mixer.voices, self.pool)
+
+    def test_unknown_effect_is_dropped(self):
+        self.assertIsNone(self.mixer.play("missing"))
+        self.assertEqual(self.mixer.dropped, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from src.simulation import INPUT_ATTACK, INPUT_JUMP, INPUT_RIGHT
+from src.soak import SoakCase, run_soak, shrink, soak
+
+def p1_hurt_checker():
+    """Stand-in invariant that breaks as soon as player 1 takes damage"""
+    def check(sim):
+        fighter = sim.fighters[0]
+        return ("hurt", "P1 took damage") if fighter.hp < fighter.max_hp else None
+    return check
+
+class TestSoak(unittest.TestCase):
+    def test_soak_is_reproducible(self):
+        first = soak(3000, seed=5)
+        second = soak(3000, seed=5)
+        self.assertEqual(first.ticks, 3000)
+        self.assertEqual((first.matches, first.failures), (second.matches, []))
+        self.assertEqual(first.problems(tick_budget_us=10**6), [])
+        self.assertEqual(sum(first.histogram), 3000)
+
+    def test_parallel_workers_add_up(self):
+        result = run_soak(2001, workers=2, seed=1)
+        self.assertEqual(result.ticks, 2001)
+        self.assertGreaterEqual(result.matches, 2)
+
+class TestShrink(unittest.TestCase):
+    def test_shrinks_to_the_attack_that_matters(self):
+        # P1 walks up to P2, who swings at the air first and then in range
+        inputs = bytearray()
+        for tick in range(300):
+            inputs += bytes((INPUT_RIGHT, INPUT_ATTACK if tick & 16 else 0))
+        for tick in range(300):
+            inputs += bytes((INPUT_JUMP if tick & 32 else 0, INPUT_ATTACK if tick & 1 else 0))
+        case = SoakCase("evil_wizard", "hero_knight", 3, bytes(inputs))
+        tick, (name, _) = case.play(p1_hurt_checker)
+        self.assertEqual(name, "hurt")
+
+        small = shrink(case, p1_hurt_checker)
+        self.assertLess(small.ticks, tick + 1)
+        self.assertEqual(small.play(p1_hurt_checker)[0], small.ticks - 1)
+        self.assertIn(INPUT_ATTACK, small.inputs[1::2])
+        self.assertLessEqual(set(small.inputs[1::2]), {0, INPUT_ATTACK})
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "case.json")
+            small.save(path, ("hurt", "P1 took damage"))
+            loaded = SoakCase.load(path)
+        self.assertEqual((loaded.inputs, loaded.seed), (small.inputs, 3))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import time
+import unittest
+from src.net.spectator import (
+    MSG_DELTA, MSG_KEY, SpectatorClient, SpectatorServer, _Spectator,
+    apply_message, encode_delta, encode_key
+)
+
+def frames(count):
+    """Fake match ticks: a moving fighter and a varying number of arrows"""
+    for tick in range(count):
+        arrows = tick % 4
+        values = [tick, 1, 0, 0, 320 + tick * 5, 64, 100 - tick, 1, 0, 0, tick % 6]
+        values += [960, 64, 100, 0, 1, 0, 2, arrows]
+        for n in range(arrows):
+            values += [400 + n * 12, 120 - n, 0]
+        yield values
+
+class FakeTransport:
+    def __init__(self):
+        self.buffered = 0
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+class FakeWriter:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.messages = []
+
+    def write(self, data):
+        self.messages.append(data[2:])  # strip the length prefix
+
+    def kinds(self):
+        return [m[0] for m in self.messages]
+
+class FakeSpectator(_Spectator):
+    def __init__(self):
+        super().__init__(FakeWriter())
+
+    def decoded(self):
+        state = None
+        for message in self.writer.messages:
+            state = apply_message(state, message)
+        return state
+
+class TestEncoding(unittest.TestCase):
+    def test_key_and_delta_round_trip(self):
+        state = None
+        previous = []
+        for values in frames(12):
+            message = encode_delta(previous, values) if previous else encode_key(values)
+            state = apply_message(state, message)
+            self.assertEqual(state, values)
+            previous = values
+
+    def test_delta_is_small(self):
+        a, b = list(frames(2))
+        self.assertLess(len(encode_delta(a, b)), len(encode_key(b)) // 2)
+
+    def test_delta_needs_a_keyframe(self):
+        a, b = list(frames(2))
+        self.assertIsNone(apply_message(None, encode_delta(a, b)))
+
+class TestSpectatorServer(unittest.TestCase):
+    def setUp(self):
+        self.server = SpectatorServer(host="127.0.0.1", port=0)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def wait_for(self, condition, timeout=5.0):
+        end = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), end, "timed out")
+            time.sleep(0.01)
+
+    def test_fan_out_encodes_once_per_tick(self):
+        clients = [SpectatorClient("127.0.0.1", self.server.port) for _ in range(40)]
+        for client in clients:
+            client.start()
+        self.wait_for(lambda: len(self.server.clients) == len(clients))
+        self.server.set_match({"characters": ["huntress", "hero_knight"], "width": 1280})
+        published = list(frames(30))
+        for values in published:
+            self.server.publish(values)
+        self.wait_for(lambda: all(c.values == published[-1] for c in clients))
+        self.assertEqual(self.server.frames_encoded, len(published))
+        self.assertEqual(clients[0].match_info["characters"], ["huntress", "hero_knight"])
+
+    def test_slow_client_is_skipped_then_resynced(self):
+        server = SpectatorServer()  # not started: drive the broadcast step directly
+        fast, slow = FakeSpectator(), FakeSpectator()
+        server.clients = {fast, slow}
+        published = list(frames(6))
+        slow.writer.transport.buffered = server.high_water + 1
+        for values in published[:3]:
+            server._broadcast(values)
+        self.assertEqual(server.frames_skipped, 3)
+        self.assertTrue(slow.stale)
+
+        # Once drained, the slow client gets a keyframe and then deltas again
+        slow.writer.transport.buffered = 0
+        for values in published[3:]:
+            server._broadcast(values)
+        self.assertEqual(fast.decoded(), published[-1])
+        self.assertEqual(slow.decoded(), published[-1])
+        self.assertEqual(slow.writer.kinds(), [MSG_KEY, MSG_DELTA, MSG_DELTA])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import base64
+import json
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+import arcade
+from src import constants as C
+from src.stage import (
+    KIND_LEDGE, KIND_SOLID, Stage, StageData, build_stage, cache_key, decode_layer_data, load_stage,
+    merge_tiles, stage_path
+)
+
+# 6x4 tiles: a floor, a 2x2 block on it and a one-way ledge (gid 2)
+GIDS = [0, 0, 0, 0, 0, 0,
+        0, 2, 2, 2, 0, 0,
+        0, 0, 0, 0, 1, 1,
+        1, 1, 1, 1, 1, 1]
+
+def tiled_json():
+    return {
+        "width": 6, "height": 4, "tilewidth": 32, "tileheight": 32,
+        "tilesets": [{"firstgid": 1, "tiles": [
+            {"id": 1, "properties": [{"name": "collision", "type": "string", "value": "ledge"}]}]}],
+        "layers": [
+            {"type": "tilelayer", "name": "ground", "data": GIDS},
+            {"type": "objectgroup", "name": "spawns", "objects": [
+                {"name": "p1", "x": 40, "y": 96}, {"name": "p2", "x": 150, "y": 96}]},
+        ],
+    }
+
+TMX = """<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.10" orientation="orthogonal" width="6" height="4" tilewidth="32" tileheight="32" infinite="0">
+ <tileset firstgid="1" name="blocks" tilewidth="32" tileheight="32" tilecount="2" columns="2">
+  <tile id="1"><properties><property name="collision" value="ledge"/></properties></tile>
+ </tileset>
+ <layer id="1" name="ground" width="6" height="4">
+  <data encoding="csv">
+{csv}
+  </data>
+ </layer>
+ <objectgroup id="2" name="spawns">
+  <object id="1" name="p1" x="40" y="96"><point/></object>
+  <object id="2" name="p2" x="150" y="96"><point/></object>
+ </objectgroup>
+</map>
+"""
+
+class TestMerge(unittest.TestCase):
+    def test_tiles_merge_into_few_rectangles(self):
+        stage = build_stage(tiled_json())
+        solid = sorted(r[1:5] for r in stage.rects if r[0] == KIND_SOLID)
+        ledges = [r[1:5] for r in stage.rects if r[0] == KIND_LEDGE]
+        self.assertEqual(solid, [(0, 0, 128, 32), (128, 0, 64, 64)])
+        self.assertEqual(ledges, [(32, 64, 96, 32)])
+        self.assertEqual(stage.spawns, ((40, 32), (150, 32)))
+
+    def test_ledges_merge_along_rows_only(self):
+        ledge, solid = (KIND_LEDGE, (0, 0, 0, 255)), (KIND_SOLID, (0, 0, 0, 255))
+        self.assertEqual(len(merge_tiles([[ledge, ledge], [ledge, ledge]])), 2)
+        self.assertEqual(len(merge_tiles([[solid, solid], [solid, solid]])), 1)
+
+    def test_shipped_stages_load(self):
+        widths = {name: load_stage(stage_path(name), cache_dir=None).width
+                  for name in ("arena", "flat", "cliffs")}
+        self.assertEqual(widths, {"arena": 1280, "flat": 1280, "cliffs": 3840})
+        cliffs = load_stage(stage_path("cliffs"), cache_dir=None)
+        self.assertLess(len(cliffs.rects), 40)  # from over 500 tiles
+
+class TestFormats(unittest.TestCase):
+    def test_tmx_matches_json(self):
+        csv = ",\n".join(",".join(str(g) for g in GIDS[r * 6:r * 6 + 6]) for r in range(4))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "small.tmx")
+            with open(path, "w") as f:
+                f.write(TMX.replace("{csv}", csv))
+            from_tmx = load_stage(path, cache_dir=None)
+        from_json = build_stage(tiled_json())
+        self.assertEqual(sorted(from_tmx.rects), sorted(from_json.rects))
+        self.assertEqual(from_tmx.spawns, from_json.spawns)
+
+    def test_base64_layer_data(self):
+        raw = struct.pack("<6I", 1, 0, 2, 0x80000001, 0, 3)
+        self.assertEqual(decode_layer_data(base64.b64encode(zlib.compress(raw)).decode(), "base64", "zlib"),
+                         [1, 0, 2, 0x80000001, 0, 3])
+
+    def test_cache_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "small.json")
+            with open(path, "w") as f:
+                json.dump(tiled_json(), f)
+            cache = os.path.join(directory, "cache")
+            first = load_stage(path, cache)
+            files = os.listdir(cache)
+            self.assertEqual(len(files), 1)
+            with open(os.path.join(cache, files[0]), "rb") as f:
+                cached = StageData.from_bytes(f.read())
+            second = load_stage(path, cache)
+        for stage in (cached, second):
+            self.assertEqual(stage.rects, first.rects)
+            self.assertEqual((stage.width, stage.height, stage.spawns), (first.width, first.height, first.spawns))
+
+    def test_cache_key_follows_loader_inputs(self):
+        raw = json.dumps(tiled_json()).encode("utf-8")
+        key = cache_key(raw)
+        self.assertEqual(cache_key(raw), key)
+        floor_top = C.FLOOR_TOP
+        C.FLOOR_TOP = floor_top + 32  # default spawns move, so cached ones are stale
+        try:
+            self.assertNotEqual(cache_key(raw), key)
+        finally:
+            C.FLOOR_TOP = floor_top
+
+class TestStage(unittest.TestCase):
+    def setUp(self):
+        self.stage = Stage(build_stage(tiled_json()))
+        self.active = arcade.SpriteList(use_spatial_hash=True)
+
+    def fighter(self, x, change_y=0.0):
+        """A 20 px wide body over the ledge (x 32..128, top 96) at x"""
+        body = arcade.SpriteSolidColor(20, 40)
+        body.center_x = x
+        body.change_y = change_y
+        return body
+
+    def test_one_way_ledges(self):
+        stage, active = self.stage, self.active
+        body = self.fighter(80)
+        stage.update_ledges(active, body, feet=32)  # below the ledge: jumps up through it
+        self.assertEqual(len(active), 0)
+        stage.update_ledges(active, body, feet=100)  # above: lands on it
+        self.assertEqual(len(active), 1)
+        stage.update_ledges(active, body, feet=96 - C.LEDGE_TOLERANCE)  # standing, hurtbox dipped
+        self.assertEqual(len(active), 1)
+        stage.update_ledges(active, body, feet=96, dropping=True)  # holding down
+        self.assertEqual(len(active), 0)
+        stage.update_ledges(active, body, feet=95)  # falling through doesn't catch it again
+        self.assertEqual(len(active), 0)
+
+    def test_only_ledges_near_the_fighter_turn_on(self):
+        stage, active = self.stage, self.active
+        stage.update_ledges(active, self.fighter(170), feet=100)  # beside the ledge
+        self.assertEqual(len(active), 0)
+        stage.update_ledges(active, self.fighter(80), feet=200)  # high above, falling slowly
+        self.assertEqual(len(active), 0)
+        stage.update_ledges(active, self.fighter(80, change_y=-110), feet=200)  # falls past it this tick
+        self.assertEqual(len(active), 1)
+        stage.update_ledges(active, self.fighter(170), feet=96)  # walked off the end
+        self.assertEqual(len(active), 0)
+
+    def test_scroll_follows_fighters_within_the_stage(self):
+        wide = Stage(StageData(C.SCREEN_WIDTH * 3, 736, (32, 32), [], ((0, 64), (0, 64))))
+        self.assertEqual(wide.scroll_for([100, 300]), 0)
+        self.assertEqual(wide.scroll_for([C.SCREEN_WIDTH * 1.5] * 2), C.SCREEN_WIDTH)
+        self.assertEqual(wide.scroll_for([C.SCREEN_WIDTH * 3] * 2), C.SCREEN_WIDTH * 2)
+        self.assertEqual(wide.bounds(C.SCREEN_WIDTH), (C.SCREEN_WIDTH, C.SCREEN_WIDTH * 2))
+        self.assertEqual(self.stage.bounds(self.stage.scroll_for([0, 0])), (0, 192))
+
+if __name__ == '__main__':
+    unittest.main()
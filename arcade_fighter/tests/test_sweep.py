@@ -0,0 +1,41 @@
+import unittest
+from src.sweep import SweptBox, resolve, time_of_impact
+
+def box(x0, x1, y0=0, y1=None, half_width=30, height=100):
+    return SweptBox(x0, y0, x1, y0 if y1 is None else y1, half_width, height)
+
+class TestTimeOfImpact(unittest.TestCase):
+    def test_contact_time_along_the_path(self):
+        self.assertAlmostEqual(time_of_impact(box(0, 100), box(100, 100)), 0.4)
+        self.assertIsNone(time_of_impact(box(0, 30), box(100, 100)))
+        self.assertIsNone(time_of_impact(box(0, 100), box(100, 100, y0=200)))  # above it
+        self.assertEqual(time_of_impact(box(0, 0), box(50, 50)), 0.0)  # already overlapping
+
+class TestResolve(unittest.TestCase):
+    def test_fast_dash_does_not_tunnel(self):
+        # 400 px in one tick would jump clean over a 60 px body
+        xa, xb = resolve(box(100, 500), box(300, 300), 0, 1280)
+        self.assertLess(xa, xb)
+        self.assertAlmostEqual(xb - xa, 60)
+
+    def test_walking_into_a_standing_fighter_pushes_at_half_speed(self):
+        xa, xb = resolve(box(200, 210), box(260, 260), 0, 1280)
+        self.assertEqual((xa, xb), (205, 265))
+
+    def test_jump_passes_over(self):
+        xa, xb = resolve(box(100, 400, y0=150), box(300, 300), 0, 1280)
+        self.assertEqual((xa, xb), (400, 300))
+
+    def test_cornered_fighter_stays_flush_with_the_wall(self):
+        xa, xb = 1190.0, 1250.0
+        for _ in range(30):
+            xa, xb = resolve(box(xa, xa + 8), box(xb, xb), 0, 1280)
+            self.assertEqual(xb, 1250)
+            self.assertEqual(xa, 1190)
+
+    def test_starting_overlap_is_pushed_apart_inside_the_stage(self):
+        xa, xb = resolve(box(20, 20), box(40, 40), 0, 1280)
+        self.assertEqual((xa, xb), (30, 90))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import arcade
+from src.views.virtual_screen import VirtualScreen
+
+class TestVirtualScreen(unittest.TestCase):
+    def setUp(self):
+        # 4:3 window around a 16:9 canvas: bars above and below
+        self.window = arcade.Window(320, 240, "Test")
+        self.screen = VirtualScreen(self.window, 640, 360)
+
+    def tearDown(self):
+        self.window.close()
+
+    def pixel(self, x, y):
+        data = self.window.ctx.screen.read(components=4)
+        i = (y * self.window.get_framebuffer_size()[0] + x) * 4
+        return tuple(data[i:i + 3])
+
+    def test_letterbox_and_mouse_mapping(self):
+        self.assertEqual(self.screen.letterbox(320, 240), (0, 30, 320, 180))
+        self.assertEqual(self.screen.to_virtual(160, 120), (320.0, 180.0))
+        self.assertEqual(self.screen.to_virtual(0, 30), (0.0, 0.0))
+
+    def test_present_upscales_canvas(self):
+        with self.screen.activate():
+            self.screen.clear(color=(0, 0, 255))
+            arcade.draw_lrbt_rectangle_filled(0, 320, 0, 360, (255, 0, 0))
+        self.screen.present()
+        self.assertEqual(self.pixel(40, 120), (255, 0, 0))  # left half of the canvas
+        self.assertEqual(self.pixel(280, 120), (0, 0, 255))
+        self.assertEqual(self.pixel(160, 10), (0, 0, 0))  # letterbox bar
+
+    def test_render_scale_reallocates_only_on_change(self):
+        self.assertEqual(self.screen.get_framebuffer_size(), (640, 360))
+        self.screen.set_scale(0.5)
+        self.screen.set_scale(0.5)
+        self.assertEqual(self.screen.get_framebuffer_size(), (320, 180))
+        self.assertEqual(self.screen.get_size(), (640, 360))  # layout space is unchanged
+        self.assertEqual(self.screen.allocations, 2)
+
+if __name__ == '__main__':
+    unittest.main()